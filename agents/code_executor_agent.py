@@ -1,17 +1,69 @@
+import time
+
 from autogen_agentchat.agents import CodeExecutorAgent
+from autogen_core import CancellationToken
+from autogen_core.code_executor import CodeBlock, CodeExecutor, CodeResult
+
+from agents.preflight import PYTHON_LANGUAGES, check_code, stats as preflight_stats
+from config.constant import PREFLIGHT_FORBIDDEN_IMPORTS
 from config.docker_executor import get_docker_executor
+from monitoring import metrics
+
+
+class PreflightCodeExecutor(CodeExecutor):
+    """Code executor that checks python blocks before delegating to another executor"""
+
+    def __init__(self, executor, forbidden=PREFLIGHT_FORBIDDEN_IMPORTS):
+        self.executor = executor
+        self.forbidden = forbidden
+
+    async def execute_code_blocks(self, code_blocks: list[CodeBlock],
+                                  cancellation_token: CancellationToken) -> CodeResult:
+        for block in code_blocks:
+            if block.language.lower() not in PYTHON_LANGUAGES:
+                continue
+            result = check_code(block.code, self.forbidden)
+            preflight_stats.record_check(result)
+            if not result.ok:
+                metrics.executions.inc(result='rejected')
+                return CodeResult(exit_code=1, output=result.report())
+
+        started = time.perf_counter()
+        result = await self.executor.execute_code_blocks(code_blocks, cancellation_token)
+        elapsed = time.perf_counter() - started
+        preflight_stats.record_execution(elapsed)
+        metrics.executions.inc(result='passed' if result.exit_code == 0 else 'failed')
+        metrics.execution_seconds.observe(elapsed)
+        return result
+
+    async def restart(self) -> None:
+        await self.executor.restart()
+
+    async def start(self) -> None:
+        await self.executor.start()
+
+    async def stop(self) -> None:
+        await self.executor.stop()
+
+    def __getattr__(self, name):
+        if name == 'executor':
+            raise AttributeError(name)
+        return getattr(self.executor, name)
 
 
-def get_code_executor_agent():
+def get_code_executor_agent(docker=None):
     """
     Function to get the code executor agent.
     This agent is responsible for executing code.
     It will work with the problem solver agent to execute the code.
+    Python blocks are statically checked first, so code that can't run
+    is answered without a round trip through the Docker container.
+    An already created (e.g. prewarmed) executor can be passed in.
     """
-    docker = get_docker_executor()
+    docker = docker or get_docker_executor()
     code_executor_agent = CodeExecutorAgent(
         name='CodeExecutorAgent',
-        code_executor=docker
+        code_executor=PreflightCodeExecutor(docker)
     )
 
     return code_executor_agent,docker
@@ -0,0 +1,276 @@
+"""
+Pre-flight static check of code before it reaches the sandbox
+
+A block with a syntax error still costs a Docker execution before the
+problem solver sees the traceback, and one importing a network client would
+run. check_code() catches both on the host by compiling the block, which
+takes well under a millisecond. PreflightCodeExecutor
+(agents/code_executor_agent.py) wraps the Docker executor: blocks that fail
+are answered straight away with the same kind of result a failed run
+produces, and the rest are passed through unchanged.
+
+Imports in PREFLIGHT_FORBIDDEN_IMPORTS are blocked as a policy: they would
+work in the sandbox, but generated code isn't meant to use the network.
+Beyond that, only what is certain to fail in the sandbox is rejected. A
+syntax error counts only when the sandbox python is known not to be newer
+than the host's (newer versions accept more syntax, e.g. PEP 701 f-strings).
+A name that doesn't resolve with symtable is rejected when a top-level
+statement reads it unconditionally; elsewhere the block may never reach it,
+so it is only a warning. Names aren't looked for at all when the block uses
+exec/eval, the namespace functions or a star import.
+
+Each block is checked on its own, as the executor runs each one as a
+separate script. Process-wide counters (checks, rejections, time spent
+checking, sandbox time saved) are kept in `stats`.
+"""
+
+import ast
+import builtins
+import re
+import symtable
+import sys
+import threading
+import time
+
+from config.constant import DOCKER_IMAGE, PREFLIGHT_FORBIDDEN_IMPORTS
+
+PYTHON_LANGUAGES = ('python', 'py', 'python3', 'py3', '')
+
+# Calls that create or read names symtable can't see
+DYNAMIC_NAME_CALLS = frozenset({'exec', 'eval', 'globals', 'locals', 'vars', '__import__'})
+
+# Expressions whose parts may not be evaluated at all
+CONDITIONAL_NODES = (ast.Lambda, ast.IfExp, ast.BoolOp, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+# Calls after which the rest of a script doesn't run
+SCRIPT_EXITS = frozenset({'exit', 'quit', 'sys.exit', 'os._exit'})
+
+# Names every module has without defining them
+MODULE_NAMES = frozenset(dir(builtins)) | {
+    '__name__', '__file__', '__doc__', '__builtins__', '__spec__', '__loader__', '__package__',
+}
+
+
+def image_python_version(image):
+    """(major, minor) of a python:X.Y image tag, None when the tag doesn't say"""
+    match = re.search(r'python:(\d+)\.(\d+)', image)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def host_parses_like_sandbox(image=DOCKER_IMAGE):
+    """Whether a syntax error on the host is also one in the sandbox"""
+    version = image_python_version(image)
+    return version is not None and version <= sys.version_info[:2]
+
+
+class PreflightResult:
+    """Outcome of checking one block; only errors stop it from running"""
+
+    __slots__ = ('errors', 'warnings', 'elapsed')
+
+    def __init__(self, errors, elapsed, warnings=()):
+        self.errors = errors
+        self.warnings = list(warnings)
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def report(self):
+        return "Pre-flight check failed (the code was not executed):\n" + '\n'.join(
+            f"  line {line}: {message}" if line else f"  {message}" for line, message in self.errors
+        )
+
+
+def _is_forbidden(module, forbidden):
+    return any(module == entry or module.startswith(entry + '.') for entry in forbidden)
+
+
+def _forbidden_imports(tree, forbidden):
+    errors = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules = [node.module]
+        else:
+            continue
+        for module in modules:
+            if _is_forbidden(module, forbidden):
+                errors.append((node.lineno, f"import of '{module}' is blocked by the sandbox policy (no network access)"))
+    return errors
+
+
+def _module_bindings(table):
+    """Names bound at module level, including `global` assignments inside functions"""
+    bound = {
+        symbol.get_name() for symbol in table.get_symbols()
+        if symbol.is_assigned() or symbol.is_imported() or symbol.is_namespace()
+    }
+    pending = list(table.get_children())
+    while pending:
+        child = pending.pop()
+        for symbol in child.get_symbols():
+            if symbol.is_declared_global() and symbol.is_assigned():
+                bound.add(symbol.get_name())
+        pending.extend(child.get_children())
+    return bound
+
+
+def _unresolved_names(table, bound):
+    """Names referenced in any scope that resolve to an unbound global"""
+    unresolved = set()
+    pending = [table]
+    while pending:
+        scope = pending.pop()
+        for symbol in scope.get_symbols():
+            if not symbol.is_referenced() or symbol.get_name() in bound:
+                continue
+            if scope.get_type() == 'module' and not symbol.is_assigned() and not symbol.is_imported():
+                unresolved.add(symbol.get_name())
+            elif scope.get_type() != 'module' and symbol.is_global():
+                unresolved.add(symbol.get_name())
+        pending.extend(scope.get_children())
+    return unresolved
+
+
+def _uses_dynamic_names(tree):
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and any(alias.name == '*' for alias in node.names):
+            return True  # Anything could come from a star import
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in DYNAMIC_NAME_CALLS:
+            return True
+    return False
+
+
+def _unconditional_reads(tree):
+    """Names read by top-level statements (only the header of compound ones), outside parts that may be skipped"""
+    reads = []
+    for statement in tree.body:
+        if isinstance(statement, (ast.Expr, ast.Assign, ast.AugAssign, ast.Delete, ast.Raise, ast.Assert)):
+            pending = [statement]
+        elif isinstance(statement, ast.AnnAssign):
+            # The annotation isn't evaluated under `from __future__ import annotations`
+            pending = [statement.value] if statement.value else []
+        elif isinstance(statement, (ast.If, ast.While)):
+            pending = [statement.test]  # Only the header; the body may not run
+        elif isinstance(statement, (ast.For, ast.AsyncFor)):
+            pending = [statement.iter]
+        elif isinstance(statement, (ast.With, ast.AsyncWith)):
+            pending = [item.context_expr for item in statement.items]
+        else:
+            continue
+        while pending:
+            node = pending.pop()
+            if isinstance(node, CONDITIONAL_NODES):
+                continue
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+                reads.append(node)
+            pending.extend(ast.iter_child_nodes(node))
+        if _stops_script(statement):
+            break  # Nothing after it runs
+    return reads
+
+
+def _stops_script(statement):
+    if isinstance(statement, ast.Raise):
+        return True
+    call = statement.value if isinstance(statement, ast.Expr) else None
+    if not isinstance(call, ast.Call):
+        return False
+    return ast.unparse(call.func) in SCRIPT_EXITS
+
+
+def _undefined_names(code, tree):
+    """Errors for names that are certain to raise NameError, warnings for the rest"""
+    if _uses_dynamic_names(tree):
+        return [], []
+
+    table = symtable.symtable(code, '<preflight>', 'exec')
+    bound = _module_bindings(table) | MODULE_NAMES
+    unresolved = _unresolved_names(table, bound)
+    if not unresolved:
+        return [], []
+
+    # Report the first use of each name
+    lines = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id in unresolved:
+            lines[node.id] = min(lines.get(node.id, node.lineno), node.lineno)
+    certain = {}
+    for node in _unconditional_reads(tree):
+        if node.id in unresolved:
+            certain[node.id] = min(certain.get(node.id, node.lineno), node.lineno)
+
+    errors = sorted((line, f"NameError: name '{name}' is not defined") for name, line in certain.items())
+    warnings = sorted(
+        (lines.get(name, 0), f"name '{name}' may not be defined") for name in unresolved if name not in certain
+    )
+    return errors, warnings
+
+
+def check_code(code, forbidden=PREFLIGHT_FORBIDDEN_IMPORTS, image=DOCKER_IMAGE):
+    """Compile, look for forbidden imports and resolve names in one python block"""
+    started = time.perf_counter()
+    warnings = []
+    try:
+        tree = ast.parse(code)
+        compile(tree, '<preflight>', 'exec')
+    except SyntaxError as e:
+        error = (e.lineno, f"SyntaxError: {e.msg}")
+        if host_parses_like_sandbox(image):
+            errors = [error]
+        else:
+            # The sandbox python may accept it; let it decide
+            errors, warnings = [], [error]
+    except ValueError as e:
+        errors = [(None, f"ValueError: {e}")]
+    else:
+        errors, warnings = _undefined_names(code, tree)
+        errors = sorted(_forbidden_imports(tree, forbidden) + errors)
+    return PreflightResult(errors, time.perf_counter() - started, warnings)
+
+
+class PreflightStats:
+    """Process-wide pre-flight counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.checked = 0
+        self.rejected = 0
+        self.warned = 0
+        self.check_seconds = 0.0
+        self.executions = 0
+        self.execution_seconds = 0.0
+
+    def record_check(self, result):
+        with self._lock:
+            self.checked += 1
+            self.rejected += 0 if result.ok else 1
+            self.warned += 1 if result.ok and result.warnings else 0
+            self.check_seconds += result.elapsed
+
+    def record_execution(self, seconds):
+        with self._lock:
+            self.executions += 1
+            self.execution_seconds += seconds
+
+    def to_dict(self):
+        with self._lock:
+            avg_execution = self.execution_seconds / self.executions if self.executions else 0.0
+            return {
+                'checked': self.checked,
+                'rejected': self.rejected,
+                'warned': self.warned,
+                'hit_rate': self.rejected / self.checked if self.checked else 0.0,
+                'avg_check_ms': 1000 * self.check_seconds / self.checked if self.checked else 0.0,
+                # Each rejection skipped one sandbox run of average length
+                'saved_seconds': round(self.rejected * avg_execution, 2),
+            }
+
+
+stats = PreflightStats()
@@ -1,19 +1,27 @@
 from autogen_agentchat.agents import AssistantAgent
 from config.settings import get_model_client
 
+# Created on the first solve, then shared so its HTTP connections are reused
+_model_client = None
 
-model_client = get_model_client()
 
-def get_problem_solver_agent():
+def get_shared_model_client():
+    global _model_client
+    if _model_client is None:
+        _model_client = get_model_client()
+    return _model_client
+
+def get_problem_solver_agent(model_client=None):
     """
     Function to get the problem solver agent.
     This agent is responsible for solving DSA problems.
     It will work with the code executor agent to execute the code.
+    A different model client (e.g. the benchmarks' replay client) can be passed in.
     """
     problem_solver_agent = AssistantAgent(
             name="DSA_Problem_Solver_Agent",
             description="An agent that solves DSA problems",
-            model_client=model_client,
+            model_client=model_client or get_shared_model_client(),
             system_message="""
                 You are a problem solver agent that is an expert in solving DSA problems.
                 You will be working with code executor agent to execute code.
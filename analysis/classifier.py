@@ -0,0 +1,222 @@
+"""
+Multi-label problem classifier
+
+The taxonomy in config/taxonomy.py is compiled once into a single regular
+expression over every problem phrase, factored as a prefix trie so the
+regex engine walks shared prefixes ('binary search', 'binary tree', ...)
+once instead of trying each phrase in turn. Code identifiers are matched by
+a dictionary lookup per identifier token. One pass over the problem and one
+over the code give every category hit, so classification cost doesn't grow
+with the size of the taxonomy.
+
+Usage:
+    python -m analysis.classifier reclassify [solutions_dir] [--workers N]
+"""
+
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from config.constant import SOLUTIONS_DIR
+from config.taxonomy import (
+    TAXONOMY, DESCRIPTIVE_WORDS, KEYWORD_WEIGHT, IDENTIFIER_WEIGHT, CATEGORY_THRESHOLD, MAX_CATEGORIES
+)
+from storage.library_io import ordered_map
+
+DEFAULT_CATEGORY = 'Other'
+
+# Libraries smaller than this are reclassified in-process
+PARALLEL_MIN_SOLUTIONS = 2000
+RECLASSIFY_BATCH_SIZE = 500
+
+# Word separators inside a phrase ('binary search', 'binary-search', 'binary_search')
+SEPARATOR = r"[\s_-]+"
+# Inflections accepted after a phrase: sort/sorts/sorting/sorted, merge/merged
+INFLECTIONS = ('s', 'es', 'ing', 'ed', 'd')
+
+IDENTIFIER_REGEX = re.compile(r"[A-Za-z_]\w*")
+
+
+def normalize_phrase(text):
+    return ' '.join(re.split(SEPARATOR, text.strip().lower()))
+
+
+def _trie_pattern(node):
+    """Regex for a character trie; '' marks the end of a phrase"""
+    branches = []
+    optional = '' in node
+    for char in sorted(c for c in node if c):
+        token = SEPARATOR if char == ' ' else re.escape(char)
+        branches.append(token + _trie_pattern(node[char]))
+
+    if not branches:
+        return ''
+    if len(branches) == 1 and not optional:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    return pattern + "?" if optional else pattern
+
+
+def _phrases_pattern(phrases):
+    """Regex source matching any of the phrases (whole words, with inflections)"""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in normalize_phrase(phrase):
+            node = node.setdefault(char, {})
+        node[''] = True
+    inflections = "(?:" + "|".join(INFLECTIONS) + ")?"
+    return r"(?<!\w)" + _trie_pattern(trie) + inflections + r"(?!\w)"
+
+
+def compile_phrases(phrases):
+    """One regex matching any of the phrases (whole words, with inflections)"""
+    return re.compile(_phrases_pattern(phrases), re.IGNORECASE)
+
+
+def compile_descriptive(descriptive_words):
+    """Regex matching a descriptive word when one of its nouns follows ('sorted' in 'sorted array')"""
+    alternatives = [
+        r"(?<!\w)" + re.escape(word) + "(?=" + SEPARATOR + _phrases_pattern(nouns) + ")"
+        for word, nouns in descriptive_words.items()
+    ]
+    return re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+
+
+class ProblemClassifier:
+    """Compiled taxonomy; classify() returns categories ordered by score"""
+
+    def __init__(self, taxonomy=TAXONOMY, threshold=CATEGORY_THRESHOLD, max_categories=MAX_CATEGORIES,
+                 descriptive_words=DESCRIPTIVE_WORDS):
+        self.taxonomy = taxonomy
+        self.threshold = threshold
+        self.max_categories = max_categories
+
+        self._keyword_labels = {}
+        self._identifier_labels = {}
+        for category, spec in taxonomy.items():
+            if ',' in category:
+                raise ValueError(f"Category names can't contain commas: {category!r}")
+            for phrase in spec.get('keywords', []):
+                self._keyword_labels.setdefault(normalize_phrase(phrase), []).append(category)
+            for identifier in spec.get('identifiers', []):
+                self._identifier_labels.setdefault(identifier, []).append(category)
+
+        self._keyword_regex = compile_phrases(self._keyword_labels) if self._keyword_labels else None
+        self._descriptive_regex = compile_descriptive(descriptive_words)
+
+    def _phrase_categories(self, matched):
+        phrase = normalize_phrase(matched)
+        categories = self._keyword_labels.get(phrase)
+        if categories is None:
+            for suffix in INFLECTIONS:
+                if phrase.endswith(suffix) and phrase[:-len(suffix)] in self._keyword_labels:
+                    return self._keyword_labels[phrase[:-len(suffix)]]
+        return categories or []
+
+    def scores(self, problem, code=''):
+        """Score per matched category, in order of first appearance"""
+        scores = {}
+        if self._keyword_regex is not None and problem:
+            # A keyword that is exactly a descriptive word ('sorted' array) doesn't count;
+            # longer phrases containing it ('rotated sorted array') still do
+            descriptive = set()
+            if self._descriptive_regex is not None:
+                descriptive = {match.span() for match in self._descriptive_regex.finditer(problem)}
+            for match in self._keyword_regex.finditer(problem):
+                if match.span() in descriptive:
+                    continue
+                for category in self._phrase_categories(match.group(0)):
+                    scores[category] = scores.get(category, 0) + KEYWORD_WEIGHT
+        if self._identifier_labels and code:
+            for token in IDENTIFIER_REGEX.findall(code):
+                for category in self._identifier_labels.get(token, ()):
+                    scores[category] = scores.get(category, 0) + IDENTIFIER_WEIGHT
+        return scores
+
+    def classify(self, problem, code=''):
+        """Categories whose score reaches the threshold, best first; ['Other'] if none"""
+        scores = self.scores(problem, code)
+        # Stable sort: ties keep the order the categories first appeared in
+        ranked = sorted(
+            (category for category, score in scores.items() if score >= self.threshold),
+            key=lambda category: -scores[category]
+        )
+        return ranked[:self.max_categories] or [DEFAULT_CATEGORY]
+
+
+_default_classifier = None
+
+
+def get_classifier():
+    """Process-wide classifier for the configured taxonomy"""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = ProblemClassifier()
+    return _default_classifier
+
+
+def classify_solution(problem, code=''):
+    """Comma-separated categories as stored in the solutions table"""
+    return ','.join(get_classifier().classify(problem, code))
+
+
+def _classify_batch(rows):
+    return {solution_id: classify_solution(problem, code) for solution_id, problem, code in rows}
+
+
+def reclassify_store(store, workers=None, progress=None):
+    """
+    Re-derive the categories of every stored solution.
+    Batches are classified across worker processes for large libraries and
+    written back batch by batch. Returns the number of changed solutions.
+    """
+    total = store.count()
+    workers = workers or os.cpu_count() or 1
+    batches = store.iter_problem_code(RECLASSIFY_BATCH_SIZE)
+    done = changed = 0
+
+    if workers > 1 and total >= PARALLEL_MIN_SOLUTIONS:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # At most two batches per worker in flight, so memory doesn't grow with the library
+            results = ordered_map(pool, _classify_batch, batches, window=workers * 2)
+            for categories in results:
+                changed += store.set_categories(categories)
+                done += len(categories)
+                if progress:
+                    progress(done, total)
+    else:
+        for batch in batches:
+            categories = _classify_batch(batch)
+            changed += store.set_categories(categories)
+            done += len(categories)
+            if progress:
+                progress(done, total)
+
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AlgoGenie problem classifier")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    reclassify = subparsers.add_parser('reclassify', help="Re-derive categories of all stored solutions")
+    reclassify.add_argument('solutions_dir', nargs='?', default=SOLUTIONS_DIR)
+    reclassify.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    from storage.solution_store import get_store
+    store = get_store(Path(args.solutions_dir))
+
+    def report(done, total):
+        print(f"\r🏷️  Classified {done}/{total}", end='', flush=True)
+
+    changed = reclassify_store(store, workers=args.workers, progress=report)
+    print(f"\n✅ Updated categories of {changed} solutions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,498 @@
+"""
+Static complexity profiler for generated solutions
+
+Walks the AST of a solution and estimates its time complexity without
+running it. The cost of a statement is (exponential, polynomial degree,
+log factors): loops over input-sized collections add a degree, halving
+loops add a log factor, sorting costs n log n, calls to functions of the
+same file cost whatever those functions cost, and a function calling
+itself more than once per invocation without memoization is exponential,
+unless each call gets a slice or filtered copy of the input (quicksort):
+that is divide and conquer, estimated at its unbalanced worst case.
+Alongside the estimate it reports hotspots with line numbers: deep loop
+nesting, unmemoized branching recursion, list.insert(0)/pop(0) and
+`in list` membership inside loops, and sorting inside loops.
+
+This is a heuristic meant to flag likely slow solutions in bulk; it knows
+nothing about input sizes and errs towards the larger estimate.
+
+Usage:
+    python -m analysis.complexity check <file.py>
+    python -m analysis.complexity scan [solutions_dir] [--min O(n^2)]
+"""
+
+import argparse
+import ast
+import sys
+from pathlib import Path
+
+from config.constant import SOLUTIONS_DIR
+
+# (exponential, polynomial degree, log factors); tuples compare as big-O
+CONSTANT = (0, 0, 0)
+LINEAR = (0, 1, 0)
+LOGARITHMIC = (0, 0, 1)
+N_LOG_N = (0, 1, 1)
+EXPONENTIAL = (1, 0, 0)
+
+SCAN_BATCH_SIZE = 500
+MEMO_DECORATORS = ('cache', 'lru_cache', 'cached')
+MEMO_NAMES = ('memo', 'cache', 'dp', 'seen', 'visited', 'computed')
+SORT_FUNCTIONS = ('sorted',)
+LINEAR_BUILTINS = ('sum', 'min', 'max', 'list', 'set', 'dict', 'tuple', 'any', 'all', 'reversed')
+
+
+def format_cost(cost):
+    exponential, degree, logs = cost
+    if exponential:
+        return "O(2^n)"
+    terms = []
+    if degree == 1:
+        terms.append("n")
+    elif degree > 1:
+        terms.append(f"n^{degree}")
+    if logs == 1:
+        terms.append("log n")
+    elif logs > 1:
+        terms.append(f"log^{logs} n")
+    return f"O({' '.join(terms) or '1'})"
+
+
+def parse_cost(text):
+    """Inverse of format_cost for the common forms, used by --min"""
+    text = text.replace(' ', '').lower()
+    for cost in (EXPONENTIAL, (0, 3, 0), (0, 2, 1), (0, 2, 0), N_LOG_N, LINEAR, LOGARITHMIC, CONSTANT):
+        if format_cost(cost).replace(' ', '').lower() == text:
+            return cost
+    raise ValueError(f"Unknown complexity {text!r}; use e.g. O(n), O(n log n), O(n^2), O(2^n)")
+
+
+def multiply(a, b):
+    return (max(a[0], b[0]), a[1] + b[1], a[2] + b[2])
+
+
+class Hotspot:
+    __slots__ = ('line', 'kind', 'message')
+
+    def __init__(self, line, kind, message):
+        self.line = line
+        self.kind = kind
+        self.message = message
+
+    def to_dict(self):
+        return {'line': self.line, 'kind': self.kind, 'message': self.message}
+
+
+class ComplexityReport:
+    """Estimated complexity of a file and of each of its functions"""
+
+    def __init__(self, cost=CONSTANT, functions=None, hotspots=None, error=None):
+        self.cost = cost
+        self.functions = functions or {}
+        self.hotspots = hotspots or []
+        self.error = error
+
+    @property
+    def estimate(self):
+        return format_cost(self.cost)
+
+    def to_dict(self):
+        return {
+            'estimate': self.estimate,
+            'functions': {name: format_cost(cost) for name, cost in self.functions.items()},
+            'hotspots': [hotspot.to_dict() for hotspot in self.hotspots],
+            'error': self.error,
+        }
+
+
+def _name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _is_constant_iterable(node):
+    """Iterables whose length doesn't depend on the input"""
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return all(not isinstance(e, ast.Starred) for e in node.elts)
+    if isinstance(node, ast.Constant):
+        return True
+    if isinstance(node, ast.Call) and _name(node.func) == 'range':
+        return all(isinstance(arg, ast.Constant) for arg in node.args)
+    return False
+
+
+def _halves(node):
+    """True if a loop body shrinks its range geometrically (x //= 2, mid = (lo + hi) // 2, ...)"""
+    for child in ast.walk(node):
+        if isinstance(child, ast.AugAssign) and isinstance(child.op, (ast.FloorDiv, ast.RShift, ast.Div)):
+            return True
+        if isinstance(child, ast.AugAssign) and isinstance(child.op, ast.Mult) \
+                and isinstance(child.value, ast.Constant) and child.value.value == 2:
+            return True
+        if isinstance(child, ast.BinOp) and isinstance(child.op, (ast.FloorDiv, ast.RShift)) \
+                and isinstance(child.right, ast.Constant) and child.right.value in (1, 2):
+            return True
+    return False
+
+
+def _is_part_of(node, params):
+    """a[1:] or a[lo:mid] of a parameter"""
+    return isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice) and _name(node.value) in params
+
+
+def _partitions(arg, params):
+    """
+    True if a recursive call's argument is a shrinking partition of a
+    parameter: a slice of it or a comprehension over it (quicksort's
+    [x for x in a[1:] if x < pivot]). Concatenations such as
+    a[:i] + a[i+1:] are not; they are nearly as large as the input.
+    """
+    if _is_part_of(arg, params):
+        return True
+    if isinstance(arg, (ast.ListComp, ast.SetComp, ast.GeneratorExp)):
+        source = arg.generators[0].iter
+        return _name(source) in params or _is_part_of(source, params)
+    return False
+
+
+class _FunctionAnalyzer:
+    """Cost and hotspots of one function body (or the module body)"""
+
+    def __init__(self, profiler, name, node):
+        self.profiler = profiler
+        self.name = name
+        self.node = node
+        self.lists = set()
+        self.loop_depth = 0
+        # Deepest input-sized loop nesting reached inside the current outermost loop
+        self.nest_depth = 0
+        # (line, inside a loop, first argument) of every call to itself
+        self.self_calls = []
+
+    def analyze(self):
+        self._collect_lists(self.node.body)
+        cost = self._block(self.node.body)
+
+        if self.name and len(self.self_calls) > 0:
+            cost = self._recursion_cost(cost)
+        return cost
+
+    def _collect_lists(self, body):
+        for stmt in body:
+            for node in ast.walk(stmt):
+                if isinstance(node, ast.Assign) and isinstance(node.value, (ast.List, ast.ListComp)) \
+                        or isinstance(node, ast.Assign) and isinstance(node.value, ast.Call) \
+                        and _name(node.value.func) == 'list':
+                    self.lists.update(t.id for t in node.targets if isinstance(t, ast.Name))
+
+    def _memoized(self):
+        node = self.node
+        for decorator in getattr(node, 'decorator_list', []):
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            if _name(target) in MEMO_DECORATORS:
+                return True
+        # A dict consulted before recursing: `if key in memo: return memo[key]`
+        for child in ast.walk(node):
+            if isinstance(child, ast.Compare) and any(isinstance(op, (ast.In, ast.NotIn)) for op in child.ops):
+                if any(_name(c) in MEMO_NAMES for c in child.comparators):
+                    return True
+        return False
+
+    def _recursion_cost(self, body_cost):
+        line = self.self_calls[0][0]
+        # Recursing on a half (binary search, divide and conquer) adds log factors
+        halving = _halves(self.node)
+        per_call = max(len(self.profiler.calls_per_path(self.node, self.name)), 1)
+        in_loop = any(looped for _, looped, _ in self.self_calls)
+        # Recursing into node.left / node.right visits each node of a structure once
+        structural = all(isinstance(arg, ast.Attribute) for _, _, arg in self.self_calls)
+        params = {arg.arg for arg in getattr(getattr(self.node, 'args', None), 'args', [])}
+        # Each call gets a part of the input (quicksort): divide and conquer without the halving
+        partitioned = not in_loop and all(_partitions(arg, params) for _, _, arg in self.self_calls)
+        if (per_call >= 2 or in_loop) and not structural and not self._memoized():
+            if partitioned and not halving:
+                # Unbalanced parts make it n levels deep in the worst case
+                return max(body_cost, multiply(body_cost, LINEAR))
+            if halving:
+                # Divide and conquer (merge sort style): n log n with linear work per level
+                return max(body_cost, N_LOG_N) if body_cost[1] >= 1 else max(body_cost, LINEAR)
+            self.profiler.hotspot(line, 'exponential-recursion',
+                                  f"{self.name}() branches into several calls to itself without memoization")
+            return EXPONENTIAL
+        if halving:
+            return multiply(body_cost, LOGARITHMIC)
+        return multiply(body_cost, LINEAR)
+
+    def _block(self, statements):
+        cost = CONSTANT
+        for stmt in statements:
+            cost = max(cost, self._statement(stmt))
+        return cost
+
+    def _statement(self, node):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            return CONSTANT  # Analyzed separately; calls pay for them
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            return self._loop(node, node.iter, node.body + node.orelse)
+        if isinstance(node, ast.While):
+            return self._loop(node, None, node.body + node.orelse)
+        if isinstance(node, ast.If):
+            return max(self._expression(node.test), self._block(node.body), self._block(node.orelse))
+        if isinstance(node, (ast.With, ast.AsyncWith)):
+            return self._block(node.body)
+        if isinstance(node, ast.Try):
+            blocks = [node.body, node.orelse, node.finalbody] + [h.body for h in node.handlers]
+            return max(self._block(b) for b in blocks)
+        if hasattr(ast, 'Match') and isinstance(node, ast.Match):
+            return max([self._expression(node.subject)] + [self._block(c.body) for c in node.cases])
+        return self._expression(node)
+
+    def _loop_factor(self, node, iterable):
+        if iterable is not None:
+            if _is_constant_iterable(iterable):
+                return CONSTANT
+            return LINEAR
+        # while: halving loops are logarithmic, everything else is assumed linear
+        if isinstance(node.test, ast.Constant) and not node.test.value:
+            return CONSTANT
+        return LOGARITHMIC if _halves(node) else LINEAR
+
+    def _loop(self, node, iterable, body):
+        factor = self._loop_factor(node, iterable)
+        head = self._expression(iterable) if iterable is not None else self._expression(node.test)
+        sized = factor == LINEAR
+        outermost = sized and self.loop_depth == 0
+        if outermost:
+            self.nest_depth = 0
+        self.loop_depth += sized
+        self.nest_depth = max(self.nest_depth, self.loop_depth)
+        try:
+            inner = self._block(body)
+        finally:
+            self.loop_depth -= sized
+        cost = max(head, multiply(factor, inner))
+        if outermost and self.nest_depth >= 2:
+            self.profiler.hotspot(node.lineno, 'nested-loops',
+                                  f"loops nested {self.nest_depth} deep over input-sized data ({format_cost(cost)})")
+        return cost
+
+    def _expression(self, node):
+        """Cost of evaluating an expression, including the calls and comprehensions in it"""
+        if node is None or isinstance(node, ast.Lambda):
+            return CONSTANT
+        if isinstance(node, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+            return self._comprehension(node)
+        cost = CONSTANT
+        if isinstance(node, ast.Call):
+            cost = self._call(node)
+        elif isinstance(node, ast.Compare):
+            cost = self._compare(node)
+        for child in ast.iter_child_nodes(node):
+            cost = max(cost, self._expression(child))
+        return cost
+
+    def _comprehension(self, node):
+        factor, loops, head = CONSTANT, 0, CONSTANT
+        try:
+            for generator in node.generators:
+                # Every iterable after the first is evaluated once per element of
+                # the loops before it, so it runs inside them
+                head = max(head, multiply(factor, self._expression(generator.iter)))
+                if not _is_constant_iterable(generator.iter):
+                    factor = multiply(factor, LINEAR)
+                    loops += 1
+                    self.loop_depth += 1
+            parts = [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+            parts += [condition for generator in node.generators for condition in generator.ifs]
+            inner = max(self._expression(part) for part in parts)
+        finally:
+            self.loop_depth -= loops
+        if loops >= 2 and self.loop_depth == 0:
+            self.profiler.hotspot(node.lineno, 'nested-loops',
+                                  f"comprehension with {loops} nested loops over input-sized data")
+        return max(head, multiply(factor, inner))
+
+    def _call(self, node):
+        name = _name(node.func)
+        in_loop = self.loop_depth > 0
+        is_method = isinstance(node.func, ast.Attribute)
+
+        if name == self.name and not is_method:
+            self.self_calls.append((node.lineno, in_loop, node.args[0] if node.args else None))
+            return CONSTANT
+        if not is_method and name in self.profiler.functions:
+            return self.profiler.function_cost(name)
+        if name in SORT_FUNCTIONS or (is_method and name == 'sort'):
+            if in_loop:
+                self.profiler.hotspot(node.lineno, 'sort-in-loop', "sorting inside a loop")
+            return N_LOG_N
+        if is_method and name == 'insert' and node.args and isinstance(node.args[0], ast.Constant) \
+                and node.args[0].value == 0:
+            if in_loop:
+                self.profiler.hotspot(node.lineno, 'list-insert-front',
+                                      "list.insert(0, ...) in a loop shifts the whole list; use collections.deque")
+            return LINEAR
+        if is_method and name == 'pop' and node.args and isinstance(node.args[0], ast.Constant) \
+                and node.args[0].value == 0:
+            if in_loop:
+                self.profiler.hotspot(node.lineno, 'list-pop-front',
+                                      "list.pop(0) in a loop shifts the whole list; use collections.deque.popleft()")
+            return LINEAR
+        if is_method and name in ('index', 'count', 'remove') and _name(node.func.value) in self.lists:
+            if in_loop:
+                self.profiler.hotspot(node.lineno, 'list-scan', f"list.{name}() in a loop scans the whole list")
+            return LINEAR
+        # min(a, b) is constant, min(values) is a scan
+        if not is_method and name in LINEAR_BUILTINS and len(node.args) == 1 \
+                and not _is_constant_iterable(node.args[0]):
+            return LINEAR
+        return CONSTANT
+
+    def _compare(self, node):
+        cost = CONSTANT
+        for op, comparator in zip(node.ops, node.comparators):
+            if not isinstance(op, (ast.In, ast.NotIn)):
+                continue
+            is_list = isinstance(comparator, (ast.List, ast.ListComp)) and not _is_constant_iterable(comparator) \
+                or _name(comparator) in self.lists
+            if is_list:
+                if self.loop_depth > 0:
+                    self.profiler.hotspot(node.lineno, 'list-membership',
+                                          "`in` on a list inside a loop is a linear scan; use a set")
+                cost = LINEAR
+        return cost
+
+
+class ComplexityProfiler:
+    """Estimates the complexity of one source file"""
+
+    def __init__(self, code):
+        self.code = code
+        self.tree = ast.parse(code)
+        self.functions = {}
+        for node in ast.walk(self.tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.functions.setdefault(node.name, node)
+        self._costs = {}
+        self._in_progress = set()
+        self._hotspots = {}
+
+    def hotspot(self, line, kind, message):
+        self._hotspots.setdefault((line, kind), Hotspot(line, kind, message))
+
+    def calls_per_path(self, node, name):
+        """Self-call sites that can run in the same invocation (not split across if/else returns)"""
+        calls = [
+            child for child in ast.walk(node)
+            if isinstance(child, ast.Call) and isinstance(child.func, ast.Name) and child.func.id == name
+        ]
+        if len(calls) < 2:
+            return calls
+        # Calls in different branches of an if/else never run together
+        for child in ast.walk(node):
+            if isinstance(child, ast.If) and child.orelse:
+                body = {id(c) for stmt in child.body for c in ast.walk(stmt)}
+                orelse = {id(c) for stmt in child.orelse for c in ast.walk(stmt)}
+                in_body = [c for c in calls if id(c) in body]
+                in_orelse = [c for c in calls if id(c) in orelse]
+                if in_body and in_orelse and len(in_body) + len(in_orelse) == len(calls):
+                    return max(in_body, in_orelse, key=len)
+        return calls
+
+    def function_cost(self, name):
+        if name in self._costs:
+            return self._costs[name]
+        if name in self._in_progress:
+            return CONSTANT  # Mutual recursion; counted where the cycle is entered
+        self._in_progress.add(name)
+        try:
+            cost = _FunctionAnalyzer(self, name, self.functions[name]).analyze()
+        finally:
+            self._in_progress.discard(name)
+        self._costs[name] = cost
+        return cost
+
+    def profile(self):
+        for name in self.functions:
+            self.function_cost(name)
+        module_cost = _FunctionAnalyzer(self, None, self.tree).analyze()
+        # The solution is as slow as its slowest function, even if only tests call it
+        cost = max([module_cost] + list(self._costs.values()))
+        hotspots = sorted(self._hotspots.values(), key=lambda h: (h.line, h.kind))
+        return ComplexityReport(cost, dict(self._costs), hotspots)
+
+
+def analyze_code(code):
+    """ComplexityReport for a piece of python source; syntax errors are reported, not raised"""
+    try:
+        return ComplexityProfiler(code).profile()
+    except (SyntaxError, ValueError, RecursionError) as e:
+        return ComplexityReport(error=f"{type(e).__name__}: {e}")
+
+
+def scan_store(store, min_cost=(0, 2, 0), progress=None):
+    """
+    Statically profile every stored solution.
+    Returns (solution_id, problem, report) for solutions estimated at
+    min_cost or worse, slowest first.
+    """
+    flagged = []
+    total = store.count()
+    done = 0
+    for rows in store.iter_problem_code(SCAN_BATCH_SIZE):
+        for solution_id, problem, code in rows:
+            report = analyze_code(code or '')
+            if report.error is None and report.cost >= min_cost:
+                flagged.append((solution_id, problem, report))
+        done += len(rows)
+        if progress:
+            progress(done, total)
+    flagged.sort(key=lambda item: item[2].cost, reverse=True)
+    return flagged
+
+
+def _print_report(report):
+    if report.error:
+        print(f"   ⚠️ {report.error}")
+        return
+    for name, cost in report.functions.items():
+        print(f"   {name}(): {format_cost(cost)}")
+    for hotspot in report.hotspots:
+        print(f"   line {hotspot.line}: {hotspot.message}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AlgoGenie static complexity profiler")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    check = subparsers.add_parser('check', help="Profile one python file")
+    check.add_argument('file')
+    scan = subparsers.add_parser('scan', help="Flag stored solutions estimated at --min or worse")
+    scan.add_argument('solutions_dir', nargs='?', default=SOLUTIONS_DIR)
+    scan.add_argument('--min', default='O(n^2)', help="Complexity threshold (default: O(n^2))")
+    args = parser.parse_args(argv)
+
+    if args.command == 'check':
+        report = analyze_code(Path(args.file).read_text(encoding='utf-8'))
+        print(f"⏱️ {args.file}: {report.estimate}")
+        _print_report(report)
+        return 0
+
+    from storage.solution_store import get_store
+    store = get_store(Path(args.solutions_dir))
+
+    def report_progress(done, total):
+        print(f"\r🔍 Profiled {done}/{total}", end='', flush=True)
+
+    flagged = scan_store(store, parse_cost(args.min), progress=report_progress)
+    print(f"\n⚠️ {len(flagged)} solutions estimated at {args.min} or worse")
+    for solution_id, problem, report in flagged:
+        print(f"{report.estimate:>12}  {solution_id}  {problem[:60]}")
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
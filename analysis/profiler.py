@@ -0,0 +1,259 @@
+"""
+Runtime profile of a solution, measured in the sandbox
+
+A solution's code runs its own test cases, so running it is a realistic
+workload. profile_in_sandbox() wraps the code in a small harness that
+executes it under cProfile and tracemalloc inside the code executor (the
+Docker sandbox unless another executor is passed) and prints the result as
+one JSON line after PROFILE_MARKER:
+
+- functions: the top PROFILE_TOP_N functions by cumulative time, with
+  calls, own time and cumulative time
+- allocations: the top allocation sites by memory still held when the run
+  ended, with the source line for lines of the solution itself
+- duration, peak traced memory, the solution's output and any error
+
+Profiles are stored with the solution under 'profile' (see SolutionEditor)
+together with a hash of the profiled code, so a profile of code that has
+been edited since is recognisable. The solver can also profile every
+solution right after it passes (PROFILE_AFTER_SOLVE).
+
+Usage:
+    python -m analysis.profiler run <file.py> [--local]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from agents.preflight import check_code
+from config.constant import PROFILE_TOP_N, TIMEOUT
+
+PROFILE_MARKER = '@@ALGOGENIE_PROFILE@@'
+OUTPUT_LIMIT = 2000  # Characters of the solution's own output kept with the profile
+
+HARNESS = '''
+import cProfile, io, json, os, pstats, sys, time, traceback, tracemalloc
+
+CODE = {code!r}
+TOP = {top}
+SOLUTION_FILE = 'solution.py'
+HARNESS_FILE = globals().get('__file__', '<string>')
+
+output = io.StringIO()
+real_stdout, sys.stdout = sys.stdout, output
+namespace = {{'__name__': '__main__'}}
+failure = None
+compiled = compile(CODE, SOLUTION_FILE, 'exec')
+profiler = cProfile.Profile()
+tracemalloc.start()
+started = time.perf_counter()
+profiler.enable()
+try:
+    exec(compiled, namespace)
+except BaseException as e:
+    failure = e
+finally:
+    profiler.disable()
+duration = time.perf_counter() - started
+_, peak = tracemalloc.get_traced_memory()
+snapshot = tracemalloc.take_snapshot().filter_traces([
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, HARNESS_FILE),
+    tracemalloc.Filter(False, '<frozen *>'),
+])
+tracemalloc.stop()
+sys.stdout = real_stdout
+error = None
+if failure is not None:
+    error = ''.join(traceback.format_exception(type(failure), failure, failure.__traceback__, limit=5))
+
+functions = []
+for (filename, line, name), (primitive, calls, own, cumulative, _) in pstats.Stats(profiler).stats.items():
+    if filename == HARNESS_FILE or name == '<built-in method builtins.exec>':
+        continue
+    if name.startswith("<method 'disable'"):
+        continue
+    functions.append({{
+        'function': name,
+        'file': os.path.basename(filename) if filename != '~' else 'builtin',
+        'line': line,
+        'calls': calls,
+        'primitive_calls': primitive,
+        'own_ms': round(own * 1000, 3),
+        'cumulative_ms': round(cumulative * 1000, 3),
+    }})
+functions.sort(key=lambda f: -f['cumulative_ms'])
+
+source = CODE.splitlines()
+allocations = []
+for stat in snapshot.statistics('lineno')[:TOP]:
+    frame = stat.traceback[0]
+    in_solution = frame.filename == SOLUTION_FILE
+    allocations.append({{
+        'file': os.path.basename(frame.filename),
+        'line': frame.lineno,
+        'size_kb': round(stat.size / 1024, 2),
+        'count': stat.count,
+        'source': source[frame.lineno - 1].strip() if in_solution and 0 < frame.lineno <= len(source) else '',
+    }})
+
+print()
+print({marker!r} + json.dumps({{
+    'duration_ms': round(duration * 1000, 3),
+    'peak_memory_kb': round(peak / 1024, 2),
+    'functions': functions[:TOP],
+    'allocations': allocations,
+    'output': output.getvalue()[:{output_limit}],
+    'error': error,
+}}))
+'''
+
+
+def code_hash(code):
+    return hashlib.sha1(code.encode('utf-8')).hexdigest()[:12]
+
+
+def build_harness(code, top=PROFILE_TOP_N):
+    """Python source that profiles `code` and prints the result after PROFILE_MARKER"""
+    return HARNESS.format(code=code, top=top, marker=PROFILE_MARKER, output_limit=OUTPUT_LIMIT)
+
+
+def _failed(code, error):
+    return {
+        'profiled_at': datetime.now().isoformat(),
+        'code_hash': code_hash(code),
+        'duration_ms': None,
+        'peak_memory_kb': None,
+        'functions': [],
+        'allocations': [],
+        'output': '',
+        'error': error,
+    }
+
+
+def parse_output(code, output):
+    """The profile printed by the harness, or a failed profile with the raw output"""
+    for line in reversed(output.splitlines()):
+        if line.startswith(PROFILE_MARKER):
+            try:
+                profile = json.loads(line[len(PROFILE_MARKER):])
+            except json.JSONDecodeError:
+                break
+            profile['profiled_at'] = datetime.now().isoformat()
+            profile['code_hash'] = code_hash(code)
+            return profile
+    return _failed(code, output.strip()[-OUTPUT_LIMIT:] or "The profiler produced no output")
+
+
+async def profile_in_sandbox(code, executor=None):
+    """
+    Profile `code` in the code executor. Without an executor a Docker
+    sandbox is started for the run and stopped afterwards; a passed
+    executor must already be started and is left running.
+    """
+    check = check_code(code)
+    if not check.ok:
+        return _failed(code, check.report())
+
+    from autogen_core import CancellationToken
+    from autogen_core.code_executor import CodeBlock
+
+    own_executor = executor is None
+    if own_executor:
+        from config.docker_executor import get_docker_executor
+        from config.docker_utils import start_docker_container
+        executor = get_docker_executor()
+        await start_docker_container(executor)
+    try:
+        result = await executor.execute_code_blocks(
+            [CodeBlock(code=build_harness(code), language='python')], CancellationToken()
+        )
+    except Exception as e:
+        return _failed(code, f"{type(e).__name__}: {e}")
+    finally:
+        if own_executor:
+            from config.docker_utils import stop_docker_container
+            try:
+                await stop_docker_container(executor)
+            except Exception:
+                pass
+    return parse_output(code, result.output)
+
+
+def profile_locally(code, timeout=TIMEOUT):
+    """Profile `code` in a host subprocess - only for trusted code, e.g. while developing"""
+    check = check_code(code)
+    if not check.ok:
+        return _failed(code, check.report())
+    try:
+        result = subprocess.run(
+            [sys.executable, '-c', build_harness(code)], capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return _failed(code, f"Timed out after {timeout}s")
+    return parse_output(code, result.stdout + result.stderr)
+
+
+def function_rows(profile):
+    """Rows of the functions table, named like pstats does"""
+    return [
+        {
+            'function': f"{f['function']} ({f['file']}:{f['line']})" if f['line'] else f['function'],
+            'calls': f['calls'],
+            'primitive calls': f['primitive_calls'],
+            'own ms': f['own_ms'],
+            'cumulative ms': f['cumulative_ms'],
+            'ms per call': round(f['cumulative_ms'] / f['calls'], 4) if f['calls'] else 0.0,
+        }
+        for f in profile.get('functions', [])
+    ]
+
+
+def allocation_rows(profile):
+    return [
+        {
+            'site': f"{a['file']}:{a['line']}",
+            'source': a['source'],
+            'KiB': a['size_kb'],
+            'blocks': a['count'],
+        }
+        for a in profile.get('allocations', [])
+    ]
+
+
+def _print_profile(profile):
+    if profile['error']:
+        print(f"⚠️ {profile['error']}")
+    if profile['duration_ms'] is None:
+        return
+    print(f"⏱️ {profile['duration_ms']:.1f} ms, peak memory {profile['peak_memory_kb']:.1f} KiB")
+    print(f"\n{'cumulative ms':>14}{'own ms':>10}{'calls':>10}  function")
+    for row in function_rows(profile):
+        print(f"{row['cumulative ms']:>14.3f}{row['own ms']:>10.3f}{row['calls']:>10}  {row['function']}")
+    print(f"\n{'KiB':>10}{'blocks':>8}  site")
+    for row in allocation_rows(profile):
+        print(f"{row['KiB']:>10.2f}{row['blocks']:>8}  {row['site']}  {row['source']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AlgoGenie runtime profiler")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run = subparsers.add_parser('run', help="Profile one python file in the sandbox")
+    run.add_argument('file')
+    run.add_argument('--local', action='store_true', help="Run on the host instead of in Docker (trusted code only)")
+    args = parser.parse_args(argv)
+
+    code = Path(args.file).read_text(encoding='utf-8')
+    profile = profile_locally(code) if args.local else asyncio.run(profile_in_sandbox(code))
+    _print_profile(profile)
+    return 0 if profile['duration_ms'] is not None and not profile['error'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
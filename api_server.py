@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Headless HTTP API for AlgoGenie
+
+Lets other services submit DSA problems and follow the agent conversation
+without going through Streamlit. Built on plain asyncio so a single process
+can hold many client connections while a bounded number of solves run.
+
+Endpoints:
+    POST /solve                 Submit {"problem": "..."}; returns the solve id
+    GET  /solve/<id>            Status, messages so far, code blocks and extracted code
+    POST /solve/<id>/cancel     Cancel a queued or running solve
+    GET  /solve/<id>/stream     Server-Sent Events with every agent message
+    GET  /health                Liveness, queue and pre-flight information
+    GET  /metrics               Prometheus metrics (monitoring/metrics.py)
+
+Usage:
+    python api_server.py [--host 127.0.0.1] [--port 8000]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from team.dsa_team import get_dsa_team_and_docker
+from team.code_extractor import CodeExtractor
+from agents.preflight import stats as preflight_stats
+from monitoring import metrics
+from config.docker_utils import start_docker_container, stop_docker_container
+from config.constant import (
+    API_HOST, API_PORT, MAX_CONCURRENT_SOLVES, MAX_QUEUED_SOLVES, SSE_KEEPALIVE
+)
+from autogen_agentchat.messages import TextMessage
+from autogen_agentchat.base import TaskResult
+from autogen_core import CancellationToken
+
+TERMINAL_STATES = ("completed", "failed", "cancelled")
+
+HTTP_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+}
+
+MAX_BODY_SIZE = 64 * 1024
+FINISHED_JOBS_KEPT = 200
+
+
+class RequestTooLarge(ValueError):
+    """Body over MAX_BODY_SIZE; answered with 413 without reading it"""
+
+
+class SolveJob:
+    """A single submitted problem and everything streamed for it so far"""
+
+    def __init__(self, problem):
+        self.id = uuid.uuid4().hex
+        self.problem = problem
+        self.status = "queued"
+        self.created = datetime.now().isoformat()
+        self.started = None
+        self.finished = None
+        self.stop_reason = None
+        self.error = None
+        self.code = ''
+        self.extractor = CodeExtractor()
+        self.events = []
+        self.subscribers = set()
+        self.task = None
+        self.cancellation_token = CancellationToken()
+
+    def publish(self, event, data):
+        """Record an event and wake up every stream listening to this job"""
+        self.events.append((event, data))
+        for queue in list(self.subscribers):
+            queue.put_nowait((event, data))
+
+    def to_dict(self, include_messages=True):
+        job = {
+            'id': self.id,
+            'status': self.status,
+            'problem': self.problem,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'stop_reason': self.stop_reason,
+            'error': self.error,
+            'code': self.code,
+            'code_blocks': [block.to_dict() for block in self.extractor.blocks],
+        }
+        if include_messages:
+            job['messages'] = [data for event, data in self.events if event == 'message']
+        return job
+
+
+def serialize_message(message):
+    """Convert a team stream item into a JSON friendly dict"""
+    if isinstance(message, TaskResult):
+        return {'type': 'TaskResult', 'stop_reason': message.stop_reason}
+
+    content = getattr(message, 'content', None)
+    if not isinstance(content, str):
+        content = str(content) if content is not None else ''
+
+    return {
+        'type': type(message).__name__,
+        'source': getattr(message, 'source', ''),
+        'content': content,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+class SolveService:
+    """Runs submitted jobs with a bound on how many solve at the same time"""
+
+    def __init__(self, max_concurrent=MAX_CONCURRENT_SOLVES, max_queued=MAX_QUEUED_SOLVES):
+        self.jobs = {}
+        self.max_queued = max_queued
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+
+    def pending_count(self):
+        return sum(1 for job in self.jobs.values() if job.status == "queued")
+
+    def running_count(self):
+        return sum(1 for job in self.jobs.values() if job.status == "running")
+
+    def submit(self, problem):
+        if self.pending_count() >= self.max_queued:
+            return None
+
+        self.prune_finished()
+        job = SolveJob(problem)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    def prune_finished(self):
+        """Forget the oldest finished jobs so memory stays bounded"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in TERMINAL_STATES]
+        for job_id in finished[:max(0, len(finished) - FINISHED_JOBS_KEPT)]:
+            del self.jobs[job_id]
+
+    def cancel(self, job):
+        if job.status in TERMINAL_STATES:
+            return False
+        if job.status == "running":
+            # Let the team abort the model request and kill the sandbox process
+            job.cancellation_token.cancel()
+        else:
+            job.task.cancel()
+        return True
+
+    async def _run(self, job):
+        docker = None
+        failure = None
+        started = None
+        try:
+            async with self.semaphore:
+                job.status = "running"
+                job.started = datetime.now().isoformat()
+                job.publish('status', {'status': job.status})
+                started = time.perf_counter()
+                metrics.solves_started.inc(entrypoint='api')
+                metrics.solves_running.inc(entrypoint='api')
+
+                team, docker = get_dsa_team_and_docker()
+                await start_docker_container(docker)
+
+                async for message in team.run_stream(
+                    task=job.problem, cancellation_token=job.cancellation_token
+                ):
+                    data = serialize_message(message)
+                    metrics.record_usage(getattr(message, 'models_usage', None))
+                    if isinstance(message, TaskResult):
+                        job.stop_reason = message.stop_reason
+                    elif isinstance(message, TextMessage):
+                        job.extractor.add_message(message.source, message.content)
+                        job.code = job.extractor.solution_code() or job.code
+                    job.publish('message', data)
+
+            job.status = "cancelled" if job.cancellation_token.is_cancelled() else "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            failure = e
+        finally:
+            if docker is not None:
+                try:
+                    await stop_docker_container(docker)
+                except Exception:
+                    pass
+            if started is not None:
+                metrics.solves_running.dec(entrypoint='api')
+                metrics.record_finished('api', job.status, time.perf_counter() - started, failure)
+            job.finished = datetime.now().isoformat()
+            job.publish('status', {'status': job.status, 'error': job.error})
+            job.publish('done', job.to_dict(include_messages=False))
+
+
+class ApiServer:
+    """Minimal HTTP/1.1 front end for SolveService"""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def handle_connection(self, reader, writer):
+        try:
+            request = await self.read_request(reader)
+            if request is None:
+                return
+            method, path, body = request
+            await self.dispatch(method, path, body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except RequestTooLarge as e:
+            await self.send_json(writer, 413, {'error': str(e)})
+        except ValueError as e:
+            await self.send_json(writer, 400, {'error': str(e)})
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+
+        parts = request_line.decode('latin-1').split()
+        if len(parts) < 2:
+            raise ValueError("Malformed request line")
+        method, target = parts[0].upper(), parts[1]
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length', 0) or 0)
+        if length < 0:
+            raise ValueError("Invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise RequestTooLarge(f"Request body over {MAX_BODY_SIZE} bytes")
+        body = await reader.readexactly(length) if length else b''
+
+        return method, urlsplit(target).path.rstrip('/') or '/', body
+
+    async def dispatch(self, method, path, body, writer):
+        segments = [segment for segment in path.split('/') if segment]
+
+        if segments == ['health']:
+            await self.send_json(writer, 200, {
+                'status': 'ok',
+                'running': self.service.running_count(),
+                'queued': self.service.pending_count(),
+                'preflight': preflight_stats.to_dict(),
+            })
+            return
+
+        if segments == ['metrics']:
+            await self.send_text(writer, 200, metrics.registry.render(), metrics.CONTENT_TYPE)
+            return
+
+        if not segments or segments[0] != 'solve' or len(segments) > 3:
+            await self.send_json(writer, 404, {'error': 'Not found'})
+            return
+
+        if len(segments) == 1:
+            if method != 'POST':
+                await self.send_json(writer, 405, {'error': 'Use POST to submit a problem'})
+                return
+            await self.handle_submit(body, writer)
+            return
+
+        job = self.service.jobs.get(segments[1])
+        if job is None:
+            await self.send_json(writer, 404, {'error': 'Unknown solve id'})
+            return
+
+        action = segments[2] if len(segments) == 3 else None
+        if action is None and method == 'GET':
+            await self.send_json(writer, 200, job.to_dict())
+        elif action == 'cancel' and method == 'POST':
+            if self.service.cancel(job):
+                await self.send_json(writer, 202, {'id': job.id, 'status': 'cancelling'})
+            else:
+                await self.send_json(writer, 409, {'id': job.id, 'status': job.status})
+        elif action == 'stream' and method == 'GET':
+            await self.handle_stream(job, writer)
+        else:
+            await self.send_json(writer, 405, {'error': 'Method not allowed'})
+
+    async def handle_submit(self, body, writer):
+        try:
+            payload = json.loads(body or b'{}')
+        except json.JSONDecodeError:
+            raise ValueError("Request body must be JSON")
+
+        problem = str(payload.get('problem', '')).strip() if isinstance(payload, dict) else ''
+        if not problem:
+            raise ValueError("'problem' is required")
+
+        job = self.service.submit(problem)
+        if job is None:
+            await self.send_json(writer, 429, {'error': 'Too many queued solves, try again later'})
+            return
+
+        await self.send_json(writer, 202, {
+            'id': job.id,
+            'status': job.status,
+            'status_url': f"/solve/{job.id}",
+            'stream_url': f"/solve/{job.id}/stream",
+        })
+
+    async def handle_stream(self, job, writer):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+
+        # Replay what already happened, then follow live events
+        queue = asyncio.Queue()
+        for event in job.events:
+            queue.put_nowait(event)
+        job.subscribers.add(queue)
+        try:
+            if job.status in TERMINAL_STATES and not any(event == 'done' for event, _ in job.events):
+                queue.put_nowait(('done', job.to_dict(include_messages=False)))
+
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\r\n\r\n")
+                    await writer.drain()
+                    continue
+
+                writer.write(format_sse(event, data))
+                await writer.drain()
+                if event == 'done':
+                    break
+        finally:
+            job.subscribers.discard(queue)
+
+    async def send_json(self, writer, status, payload):
+        body = json.dumps(payload, ensure_ascii=False)
+        await self.send_text(writer, status, body, 'application/json; charset=utf-8')
+
+    async def send_text(self, writer, status, text, content_type):
+        body = text.encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + body
+        )
+        await writer.drain()
+
+
+def format_sse(event, data):
+    """Encode one Server-Sent Event"""
+    payload = json.dumps(data, ensure_ascii=False)
+    lines = ''.join(f"data: {line}\n" for line in payload.split('\n'))
+    return f"event: {event}\n{lines}\n".encode('utf-8')
+
+
+async def serve(host=API_HOST, port=API_PORT):
+    service = SolveService()
+    metrics.solves_queued.set_function(service.pending_count, entrypoint='api')
+    api = ApiServer(service)
+    server = await asyncio.start_server(api.handle_connection, host, port)
+
+    print("🚀 AlgoGenie API server")
+    print(f"✅ Listening on http://{host}:{port} (max {MAX_CONCURRENT_SOLVES} concurrent solves)")
+
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AlgoGenie headless HTTP API")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 API server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,7 @@
 import streamlit as st
 import asyncio
 import sys
-from team.dsa_team import get_dsa_team_and_docker
 from config.docker_utils import start_docker_container, stop_docker_container
-from autogen_agentchat.messages import TextMessage
-from autogen_agentchat.base import TaskResult
 
 # Configure Streamlit page
 st.set_page_config(
@@ -34,6 +31,9 @@ task = st.text_input(
 
 async def run(team, docker, task):
     """Run the DSA solving process"""
+    from autogen_agentchat.base import TaskResult
+    from autogen_agentchat.messages import TextMessage
+
     try:
         await start_docker_container(docker)
         st.success("🐳 Docker container started successfully")
@@ -61,6 +61,10 @@ if st.button("🚀 Run Solution", type="primary"):
         st.error("Please enter a problem to solve!")
         st.stop()
     
+    # The agent stack is only loaded once a solve is requested
+    from autogen_agentchat.base import TaskResult
+    from team.dsa_team import get_dsa_team_and_docker
+
     # Initialize progress
     progress_bar = st.progress(0)
     status_text = st.empty()
@@ -1,17 +1,17 @@
 import streamlit as st
-import asyncio
-import sys
-import os
-import time
 from datetime import datetime
 from pathlib import Path
-import json
-from team.dsa_team import get_dsa_team_and_docker
-from config.docker_utils import start_docker_container, stop_docker_container
-from autogen_agentchat.messages import TextMessage
-from autogen_agentchat.base import TaskResult
-from file_browser import SolutionBrowser, render_file_browser
-from solution_editor import SolutionEditor, render_solution_editor
+from collections import deque
+from team.solve_runner import start_solve, get_run, active_runs
+from agents.preflight import stats as preflight_stats
+from config.constant import METRICS_PORT, PREWARM_ON_START, SESSION_SOLUTIONS_KEPT, SOLVE_POLL_INTERVAL
+from team import prewarm
+from monitoring import metrics, tracing
+from team.checkpoint import SolveCheckpoint, list_checkpoints
+from file_browser import render_file_browser, get_session_cache
+from storage.solution_store import get_store
+from storage.ids import new_solution_id
+from solution_editor import render_solution_editor
 
 # Configure Streamlit page
 st.set_page_config(
@@ -279,44 +279,71 @@ st.markdown("""
 
 # Initialize session state
 if 'solutions' not in st.session_state:
-    st.session_state.solutions = []
+    # Summaries of this session's solves; bounded so long sessions stay small
+    st.session_state.solutions = deque(maxlen=SESSION_SOLUTIONS_KEPT)
 if 'current_solution' not in st.session_state:
     st.session_state.current_solution = None
 if 'current_tab' not in st.session_state:
     st.session_state.current_tab = "Solve"
 
-def load_solutions():
-    """Load all saved solutions"""
-    browser = SolutionBrowser()
-    return browser.get_solutions()
+# Opt-in: warm the sandbox and model connection once per server process
+if PREWARM_ON_START:
+    prewarm.start_prewarm()
 
-def save_solution(problem, code, explanation, test_results=None):
-    """Save solution to file"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+# Prometheus scrape endpoint, shared by every session of this server process
+if METRICS_PORT:
+    metrics.start_http_server(METRICS_PORT)
+
+def save_solution(problem, code, explanation, test_results=None, messages=None, metrics=None, profile=None):
+    """Save solution to the solution store"""
+    solution_id = new_solution_id()
     solution_data = {
-        'id': f"solution_{timestamp}",
+        'id': solution_id,
         'timestamp': datetime.now().isoformat(),
         'problem': problem,
         'code': code,
         'explanation': explanation,
-        'test_results': test_results or []
+        'test_results': test_results or [],
+        'messages': messages or [],
+        'metrics': metrics or {}
     }
+    if profile:
+        # Runtime profile from the post-solve stage (analysis/profiler.py)
+        solution_data['profile'] = profile
     
-    # Save as JSON
     solutions_dir = Path("solutions")
     solutions_dir.mkdir(exist_ok=True)
-    
-    json_file = solutions_dir / f"solution_{timestamp}.json"
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(solution_data, f, indent=2, ensure_ascii=False)
-    
-    # Save as Python file
-    py_file = solutions_dir / f"solution_{timestamp}.py"
-    with open(py_file, 'w', encoding='utf-8') as f:
-        f.write(code)
+    get_store(solutions_dir).save(solution_data)
     
     return solution_data
 
+PREWARM_ICONS = {prewarm.READY: "🟢", prewarm.PENDING: "🟡", prewarm.FAILED: "🔴"}
+
+def render_prewarm_status():
+    """Sidebar readiness of the sandbox image, warm containers and model connection"""
+    st.markdown("### 🔥 Readiness")
+    status = prewarm.status()
+    if not status['started']:
+        st.caption("⚪ Not prewarmed: the first solve starts everything cold")
+        st.button("🔥 Prewarm now", key="prewarm_now", on_click=prewarm.start_prewarm)
+    elif status['settled']:
+        render_prewarm_steps(status)
+    else:
+        render_prewarm_progress()
+
+def render_prewarm_steps(status):
+    for step, (state, detail) in status['steps'].items():
+        st.caption(f"{PREWARM_ICONS[state]} **{step}** {detail}")
+    st.caption(f"Warm containers waiting: {status['warm_containers']}")
+
+@st.fragment(run_every=SOLVE_POLL_INTERVAL)
+def render_prewarm_progress():
+    """Polls while prewarming, then redraws the page once everything settled"""
+    status = prewarm.status()
+    render_prewarm_steps(status)
+    if status['settled']:
+        st.rerun()
+
 def main():
     # Header
     st.markdown("""
@@ -331,6 +358,9 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
+    with st.sidebar:
+        render_prewarm_status()
+
     # Main navigation tabs
     tab1, tab2, tab3, tab4 = st.tabs(["🚀 Solve", "📁 Browse", "✏️ Edit", "📊 Analytics"])
 
@@ -348,6 +378,12 @@ def main():
 
 def render_solve_tab():
     """Render the problem solving tab"""
+    if st.session_state.pop('solve_cancelled', False):
+        st.warning("⏹️ The previous solve was cancelled. The model request and Docker container were released.")
+    render_solve_outcome()
+    
+    render_resumable_solves()
+    
     st.markdown("### 💭 Problem Input")
     
     # Problem input with enhanced UI
@@ -393,185 +429,51 @@ def render_solve_tab():
     col1, col2, col3 = st.columns([1, 2, 1])
     
     with col2:
-        if st.button("🚀 Solve Problem", type="primary", use_container_width=True):
+        solving = get_run(st.session_state.get('active_solve')) is not None
+        if st.button("🚀 Solve Problem", type="primary", use_container_width=True, disabled=solving):
             if not problem_input.strip():
                 st.error("Please enter a problem to solve!")
             else:
                 solve_problem(problem_input, include_tests, include_docs, complexity_analysis, optimization_tips)
-
-def solve_problem(problem, include_tests=True, include_docs=True, complexity_analysis=True, optimization_tips=True):
-    """Solve the DSA problem using AI agents"""
     
-    # Initialize progress tracking
-    progress_bar = st.progress(0)
-    status_container = st.container()
-    messages_container = st.container()
+    if st.session_state.get('active_solve'):
+        render_active_solve()
+
+def render_resumable_solves():
+    """Offer to resume solves that were interrupted before finishing"""
+    # Solves still running on the background loop checkpoint too; they aren't interrupted
+    running = {run.run_id for run in active_runs()}
+    checkpoints = [c for c in list_checkpoints() if c.run_id not in running]
+    if not checkpoints:
+        return
     
+    with st.expander(f"♻️ Interrupted Solves ({len(checkpoints)})", expanded=True):
+        for checkpoint in checkpoints:
+            col1, col2, col3 = st.columns([3, 1, 1])
+            with col1:
+                st.write(f"**{checkpoint.problem[:60]}{'...' if len(checkpoint.problem) > 60 else ''}**")
+                st.caption(f"{len(checkpoint.transcript)} messages · last update {checkpoint.updated[:19]}")
+            with col2:
+                if st.button("▶️ Resume", key=f"resume_{checkpoint.run_id}"):
+                    solve_problem(checkpoint.problem, resume_from=checkpoint)
+            with col3:
+                if st.button("🗑️ Discard", key=f"discard_{checkpoint.run_id}"):
+                    checkpoint.delete()
+                    st.rerun()
+
+def cancel_active_solve():
+    """Callback for the Cancel button"""
+    run = get_run(st.session_state.get('active_solve'))
+    if run is not None:
+        run.cancel()
+
+def solve_problem(problem, include_tests=True, include_docs=True, complexity_analysis=True, optimization_tips=True, resume_from=None):
+    """Start solving the DSA problem on the background loop, optionally resuming from a checkpoint"""
     try:
-        # Step 1: Initialize
-        with status_container:
-            st.markdown('<div class="status-warning">🔄 Initializing AI agents and Docker container...</div>', unsafe_allow_html=True)
-        progress_bar.progress(10)
-        
-        team, docker = get_dsa_team_and_docker()
-        progress_bar.progress(20)
-        
-        # Step 2: Start Docker
-        with status_container:
-            st.markdown('<div class="status-warning">🐳 Starting Docker container for code execution...</div>', unsafe_allow_html=True)
-        progress_bar.progress(30)
-        
-        # Step 3: Solve problem
-        with status_container:
-            st.markdown('<div class="status-warning">🧠 AI agents are analyzing and solving your problem...</div>', unsafe_allow_html=True)
-        progress_bar.progress(40)
-        
-        # Create message containers
-        with messages_container:
-            st.markdown("### 🤖 AI Agent Conversation")
-            
-            # Run the solving process
-            async def run_solving_process():
-                try:
-                    await start_docker_container(docker)
-                    
-                    solution_data = {
-                        'problem': problem,
-                        'code': '',
-                        'explanation': '',
-                        'test_results': [],
-                        'messages': []
-                    }
-                    
-                    message_count = 0
-                    async for message in team.run_stream(task=problem):
-                        message_count += 1
-                        progress = min(40 + (message_count * 3), 90)
-                        progress_bar.progress(progress)
-                        
-                        if isinstance(message, TextMessage):
-                            # Display agent message with enhanced styling
-                            agent_name = message.source
-                            content = message.content
-                            
-                            if "DSA_Problem_Solver_Agent" in agent_name:
-                                with st.chat_message("assistant", avatar="🧑‍💻"):
-                                    st.markdown("""
-                                    <div class="solution-card">
-                                        <h4>🧑‍💻 Problem Solver Agent</h4>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                                    st.markdown(content)
-                                    
-                                    # Extract code if present
-                                    if "```python" in content:
-                                        code_start = content.find("```python") + 9
-                                        code_end = content.find("```", code_start)
-                                        if code_end > code_start:
-                                            solution_data['code'] = content[code_start:code_end].strip()
-                                    
-                                    solution_data['messages'].append({
-                                        'agent': 'Problem Solver',
-                                        'content': content,
-                                        'timestamp': datetime.now().isoformat()
-                                    })
-                            
-                            elif "CodeExecutorAgent" in agent_name:
-                                with st.chat_message("assistant", avatar="🤖"):
-                                    st.markdown("""
-                                    <div class="solution-card">
-                                        <h4>🤖 Code Executor Agent</h4>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                                    st.markdown(content)
-                                    
-                                    solution_data['messages'].append({
-                                        'agent': 'Code Executor',
-                                        'content': content,
-                                        'timestamp': datetime.now().isoformat()
-                                    })
-                            
-                            elif "user" in agent_name.lower():
-                                with st.chat_message("user", avatar="👤"):
-                                    st.markdown(content)
-                        
-                        elif isinstance(message, TaskResult):
-                            with st.chat_message("system", avatar="✅"):
-                                st.markdown("""
-                                <div class="status-success">
-                                    ✅ Task Completed: """ + message.stop_reason + """
-                                </div>
-                                """, unsafe_allow_html=True)
-                                solution_data['messages'].append({
-                                    'agent': 'System',
-                                    'content': f"Task completed: {message.stop_reason}",
-                                    'timestamp': datetime.now().isoformat()
-                                })
-                    
-                    return solution_data
-                    
-                except Exception as e:
-                    st.markdown(f"""
-                    <div class="status-error">
-                        ❌ Error during solving: {e}
-                    </div>
-                    """, unsafe_allow_html=True)
-                    return None
-                finally:
-                    try:
-                        await stop_docker_container(docker)
-                    except:
-                        pass
-            
-            # Run the async process
-            solution_data = asyncio.run(run_solving_process())
-            
-            if solution_data and solution_data['code']:
-                progress_bar.progress(95)
-                
-                # Save solution
-                saved_solution = save_solution(
-                    problem=solution_data['problem'],
-                    code=solution_data['code'],
-                    explanation=solution_data.get('explanation', ''),
-                    test_results=solution_data.get('test_results', [])
-                )
-                
-                st.session_state.solutions.append(saved_solution)
-                st.session_state.current_solution = saved_solution
-                
-                progress_bar.progress(100)
-                
-                # Success message with animation
-                st.markdown("""
-                <div class="status-success pulse">
-                    🎉 Problem solved successfully!
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Display solution summary
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Problem", problem[:30] + "...")
-                with col2:
-                    st.metric("Code Lines", len(solution_data['code'].split('\n')))
-                with col3:
-                    st.metric("Status", "✅ Complete")
-                
-                # File location info
-                st.info(f"📁 Solution saved to: {Path('solutions').absolute()}")
-                
-                # Auto-refresh to show the solution
-                time.sleep(1)
-                st.rerun()
-            
-            else:
-                st.markdown("""
-                <div class="status-error">
-                    ❌ Failed to solve the problem. Please try again.
-                </div>
-                """, unsafe_allow_html=True)
-    
+        # Checkpoint after every message so an interrupted solve can be resumed
+        checkpoint = resume_from or SolveCheckpoint(problem)
+        run = start_solve(problem, checkpoint=checkpoint, resume=resume_from is not None)
+        st.session_state.active_solve = run.run_id
     except Exception as e:
         st.markdown(f"""
         <div class="status-error">
@@ -580,13 +482,193 @@ def solve_problem(problem, include_tests=True, include_docs=True, complexity_ana
         """, unsafe_allow_html=True)
         st.error("Please check your configuration and try again.")
 
+def render_agent_message(entry):
+    """Display one conversation entry with the agent's styling"""
+    agent, content = entry['agent'], entry['content']
+    if agent == 'Problem Solver':
+        with st.chat_message("assistant", avatar="🧑‍💻"):
+            st.markdown("""
+            <div class="solution-card">
+                <h4>🧑‍💻 Problem Solver Agent</h4>
+            </div>
+            """, unsafe_allow_html=True)
+            st.markdown(content)
+    elif agent == 'Code Executor':
+        with st.chat_message("assistant", avatar="🤖"):
+            st.markdown("""
+            <div class="solution-card">
+                <h4>🤖 Code Executor Agent</h4>
+            </div>
+            """, unsafe_allow_html=True)
+            st.markdown(content)
+    elif agent == 'User':
+        with st.chat_message("user", avatar="👤"):
+            st.markdown(content)
+    elif agent == 'System':
+        with st.chat_message("system", avatar="✅"):
+            st.markdown(f"""
+            <div class="status-success">
+                ✅ {content}
+            </div>
+            """, unsafe_allow_html=True)
+
+@st.fragment(run_every=SOLVE_POLL_INTERVAL)
+def render_active_solve():
+    """
+    Live view of this session's solve. The solve runs on the background
+    loop; only this fragment is re-run to pick up new messages, so the rest
+    of the page stays responsive while it works.
+    """
+    run = get_run(st.session_state.get('active_solve'))
+    if run is None:
+        st.session_state.pop('active_solve', None)
+        st.rerun()
+    
+    st.progress(run.progress)
+    if run.status == "starting":
+        st.markdown('<div class="status-warning">🐳 Starting Docker container for code execution...</div>', unsafe_allow_html=True)
+    elif not run.done:
+        st.markdown(f'<div class="status-warning">🧠 AI agents are analyzing and solving your problem... ({run.elapsed:.0f}s)</div>', unsafe_allow_html=True)
+        st.button("⏹️ Cancel Solve", key="cancel_solve", on_click=cancel_active_solve)
+    if run.resumed_messages:
+        st.info(f"♻️ Resumed from checkpoint with {run.resumed_messages} saved messages")
+    
+    st.markdown("### 🤖 AI Agent Conversation")
+    for entry in list(run.transcript):
+        render_agent_message(entry)
+    
+    if run.done:
+        finish_solve(run)
+
+def finish_solve(run):
+    """Save a finished solve into this session and refresh the whole page"""
+    if run.collect() is None:
+        return
+    st.session_state.pop('active_solve', None)
+    st.session_state.solve_trace = run.run_id
+    solution_data = run.solution_data
+    
+    if run.status == "completed" and solution_data['code']:
+        with tracing.span('solution.save', trace_id=run.run_id):
+            saved_solution = save_solution(
+                problem=solution_data['problem'],
+                code=solution_data['code'],
+                explanation=solution_data.get('explanation', ''),
+                test_results=solution_data.get('test_results', []),
+                messages=solution_data.get('messages', []),
+                metrics=solution_data.get('metrics'),
+                profile=solution_data.get('profile')
+            )
+        
+        # Keep only a lightweight summary in the session; code loads on demand
+        store = get_store(Path("solutions"))
+        summary = store.get_summary(saved_solution['id'], loader=get_session_cache(store))
+        st.session_state.solutions.append(summary)
+        st.session_state.current_solution = summary
+        st.session_state.solve_outcome = ('solved', None)
+        if run.checkpoint is not None:
+            run.checkpoint.delete()
+    elif run.status == "cancelled":
+        st.session_state.solve_cancelled = True
+    else:
+        st.session_state.solve_outcome = ('failed', run.error)
+    st.rerun()
+
+def render_solve_outcome():
+    """Result of the solve that finished on the previous run"""
+    outcome = st.session_state.pop('solve_outcome', None)
+    if outcome is None:
+        return
+    
+    status, error = outcome
+    if status == 'solved':
+        # Success message with animation
+        st.markdown("""
+        <div class="status-success pulse">
+            🎉 Problem solved successfully!
+        </div>
+        """, unsafe_allow_html=True)
+        
+        solution = st.session_state.current_solution
+        if solution is not None:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Problem", solution.problem[:30] + "...")
+            with col2:
+                st.metric("Code Lines", solution.code_lines)
+            with col3:
+                st.metric("Status", "✅ Complete")
+        
+        # File location info
+        st.info(f"📁 Solution saved to: {Path('solutions').absolute()}")
+    elif error:
+        st.markdown(f"""
+        <div class="status-error">
+            ❌ Error during solving: {error}
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown("""
+        <div class="status-error">
+            ❌ Failed to solve the problem. Please try again.
+        </div>
+        """, unsafe_allow_html=True)
+    
+    if tracing.enabled and st.session_state.get('solve_trace'):
+        render_trace_timeline(st.session_state.solve_trace)
+
+def render_trace_timeline(trace_id):
+    """Timeline of the spans recorded for one solve (monitoring/tracing.py)"""
+    spans = tracing.load_trace(trace_id)
+    if not spans:
+        return
+    origin = spans[0]['start']
+    total = max(s['end'] for s in spans) - origin
+    rows = [
+        {
+            'span': s['name'],
+            'start_ms': round((s['start'] - origin) * 1000, 1),
+            'end_ms': round((s['end'] - origin) * 1000, 1),
+            'duration_ms': s['duration_ms'],
+            'details': ', '.join(f"{key}={value}" for key, value in s['attributes'].items()),
+        }
+        for s in spans
+    ]
+    
+    with st.expander(f"⏱️ Solve trace: {len(spans)} spans over {total:.1f}s", expanded=False):
+        st.vega_lite_chart(rows, {
+            'mark': {'type': 'bar', 'cornerRadius': 2},
+            'encoding': {
+                'x': {'field': 'start_ms', 'type': 'quantitative', 'title': 'ms since the solve started'},
+                'x2': {'field': 'end_ms'},
+                'y': {'field': 'span', 'type': 'nominal', 'sort': None, 'title': None},
+                'color': {'field': 'span', 'type': 'nominal', 'legend': None},
+                'tooltip': [
+                    {'field': 'span'}, {'field': 'duration_ms', 'title': 'ms'}, {'field': 'details'}
+                ],
+            },
+        }, use_container_width=True)
+        
+        # Time per kind of step, largest first
+        by_name = {}
+        for s in spans:
+            if s['name'] != 'solve':
+                by_name[s['name']] = by_name.get(s['name'], 0) + s['duration_ms']
+        st.caption(" · ".join(
+            f"{name}: {ms / 1000:.2f}s" for name, ms in sorted(by_name.items(), key=lambda item: -item[1])
+        ))
+        st.caption(f"Export: `python -m monitoring.tracing chrome {trace_id}`")
+
 def render_analytics_tab():
     """Render the analytics tab"""
     st.markdown("### 📊 Solution Analytics")
     
-    solutions = load_solutions()
+    # Aggregates are maintained by the store on every save/edit/delete,
+    # so this doesn't grow with the number of solutions
+    store = get_store(Path("solutions"))
+    analytics = store.get_analytics()
     
-    if not solutions:
+    if not analytics['total_solutions']:
         st.info("No solutions found. Solve some problems first!")
         return
     
@@ -594,57 +676,69 @@ def render_analytics_tab():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Solutions", len(solutions))
+        st.metric("Total Solutions", analytics['total_solutions'])
     
     with col2:
-        recent_count = len([s for s in solutions if 
-                          (datetime.now() - datetime.fromisoformat(s['timestamp'])).days <= 7])
-        st.metric("This Week", recent_count)
+        st.metric("This Week", analytics['recent_solutions'])
     
     with col3:
-        avg_code_length = sum(len(s['code'].split('\n')) for s in solutions) / len(solutions)
-        st.metric("Avg Code Lines", f"{avg_code_length:.1f}")
+        st.metric("Avg Code Lines", f"{analytics['avg_code_lines']:.1f}")
     
     with col4:
-        unique_problems = len(set(s['problem'] for s in solutions))
-        st.metric("Unique Problems", unique_problems)
+        st.metric("Unique Problems", analytics['unique_problems'])
     
     # Problem categories
     st.markdown("#### 🏷️ Problem Categories")
-    categories = {}
-    for solution in solutions:
-        problem = solution['problem'].lower()
-        if 'sort' in problem or 'merge' in problem or 'quick' in problem:
-            categories['Sorting'] = categories.get('Sorting', 0) + 1
-        elif 'search' in problem or 'binary' in problem:
-            categories['Searching'] = categories.get('Searching', 0) + 1
-        elif 'tree' in problem or 'binary tree' in problem:
-            categories['Trees'] = categories.get('Trees', 0) + 1
-        elif 'graph' in problem or 'bfs' in problem or 'dfs' in problem:
-            categories['Graphs'] = categories.get('Graphs', 0) + 1
-        elif 'dynamic' in problem or 'dp' in problem:
-            categories['Dynamic Programming'] = categories.get('Dynamic Programming', 0) + 1
-        else:
-            categories['Other'] = categories.get('Other', 0) + 1
+    categories = analytics['categories']
     
     # Display categories as metrics
     if categories:
         cols = st.columns(len(categories))
-        for i, (category, count) in enumerate(sorted(categories.items(), key=lambda x: x[1], reverse=True)):
+        for i, (category, count) in enumerate(categories.items()):
             with cols[i]:
                 st.metric(category, count)
     
+    # Solve latency and token usage percentiles
+    metrics = analytics['metrics']
+    if metrics:
+        st.markdown("#### ⏱️ Solve Performance")
+        labels = {'duration_s': 'Duration (s)', 'tokens': 'Tokens', 'turns': 'Turns'}
+        st.table({
+            labels.get(name, name): {
+                'solves': stats['count'],
+                'mean': round(stats['mean'], 1),
+                'p50': round(stats['p50'], 1),
+                'p90': round(stats['p90'], 1),
+                'p99': round(stats['p99'], 1),
+            }
+            for name, stats in metrics.items()
+        })
+    
+    # Pre-flight checks of this server process
+    preflight = preflight_stats.to_dict()
+    if preflight['checked']:
+        st.caption(
+            f"🛫 Pre-flight: {preflight['rejected']}/{preflight['checked']} blocks rejected before the sandbox "
+            f"({preflight['hit_rate']:.0%}, {preflight['avg_check_ms']:.2f} ms per check, "
+            f"~{preflight['saved_seconds']:.1f}s of sandbox time saved)"
+        )
+    
+    # Solutions per day
+    if len(analytics['daily']) > 1:
+        st.markdown("#### 📅 Solutions per Day")
+        st.bar_chart(analytics['daily'])
+    
     # Recent activity
     st.markdown("#### 📈 Recent Activity")
-    recent_solutions = sorted(solutions, key=lambda x: x['timestamp'], reverse=True)[:5]
+    recent_solutions, _ = store.list_page(order='newest', limit=5)
     
     for solution in recent_solutions:
         with st.expander(f"📄 {solution['problem'][:50]}...", expanded=False):
             st.write(f"**Created:** {solution['timestamp'][:19]}")
-            st.write("**Code Lines:**", len(solution['code'].split("\n")))
+            st.write("**Code Lines:**", solution.code_lines)
 
-            if solution.get('test_results'):
-                st.write(f"**Test Cases:** {len(solution['test_results'])}")
+            if solution.test_count:
+                st.write(f"**Test Cases:** {solution.test_count}")
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,16 @@
 import streamlit as st
-import asyncio
-import sys
 import os
-import time
 from datetime import datetime
 from pathlib import Path
-import json
-from team.dsa_team import get_dsa_team_and_docker
-from config.docker_utils import start_docker_container, stop_docker_container
-from autogen_agentchat.messages import TextMessage
-from autogen_agentchat.base import TaskResult
+from collections import deque
+from team.solve_runner import start_solve, get_run
+from analysis.complexity import analyze_code
+from config.constant import METRICS_PORT, PREWARM_ON_START, SESSION_SOLUTIONS_KEPT, SOLVE_POLL_INTERVAL
+from team import prewarm
+from monitoring import metrics, tracing
+from storage.solution_store import get_store
+from storage.ids import new_solution_id
+from file_browser import get_session_cache
 
 # Configure Streamlit page
 st.set_page_config(
@@ -204,50 +205,71 @@ st.markdown("""
 
 # Initialize session state
 if 'solutions' not in st.session_state:
-    st.session_state.solutions = []
+    # Summaries of this session's solves; bounded so long sessions stay small
+    st.session_state.solutions = deque(maxlen=SESSION_SOLUTIONS_KEPT)
 if 'current_solution' not in st.session_state:
     st.session_state.current_solution = None
 
+# Opt-in: warm the sandbox and model connection once per server process
+if PREWARM_ON_START:
+    prewarm.start_prewarm()
+
+# Prometheus scrape endpoint, shared by every session of this server process
+if METRICS_PORT:
+    metrics.start_http_server(METRICS_PORT)
+
 # Create solutions directory
 solutions_dir = Path("solutions")
 solutions_dir.mkdir(exist_ok=True)
 
-def load_solutions():
-    """Load all saved solutions"""
-    solutions = []
-    for solution_file in solutions_dir.glob("*.json"):
-        try:
-            with open(solution_file, 'r', encoding='utf-8') as f:
-                solution_data = json.load(f)
-                solutions.append(solution_data)
-        except Exception as e:
-            st.error(f"Error loading solution {solution_file}: {e}")
-    return sorted(solutions, key=lambda x: x['timestamp'], reverse=True)
-
-def save_solution(problem, code, explanation, test_results=None):
-    """Save solution to file"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+def save_solution(problem, code, explanation, test_results=None, messages=None, metrics=None, profile=None):
+    """Save solution to the solution store"""
+    solution_id = new_solution_id()
     solution_data = {
-        'id': f"solution_{timestamp}",
+        'id': solution_id,
         'timestamp': datetime.now().isoformat(),
         'problem': problem,
         'code': code,
         'explanation': explanation,
-        'test_results': test_results or []
+        'test_results': test_results or [],
+        'messages': messages or [],
+        'metrics': metrics or {}
     }
+    if profile:
+        # Runtime profile from the post-solve stage (analysis/profiler.py)
+        solution_data['profile'] = profile
     
-    # Save as JSON
-    json_file = solutions_dir / f"solution_{timestamp}.json"
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(solution_data, f, indent=2, ensure_ascii=False)
-    
-    # Save as Python file
-    py_file = solutions_dir / f"solution_{timestamp}.py"
-    with open(py_file, 'w', encoding='utf-8') as f:
-        f.write(code)
+    get_store(solutions_dir).save(solution_data)
     
     return solution_data
 
+PREWARM_ICONS = {prewarm.READY: "🟢", prewarm.PENDING: "🟡", prewarm.FAILED: "🔴"}
+
+def render_prewarm_status():
+    """Sidebar readiness of the sandbox image, warm containers and model connection"""
+    st.markdown("### 🔥 Readiness")
+    status = prewarm.status()
+    if not status['started']:
+        st.caption("⚪ Not prewarmed: the first solve starts everything cold")
+        st.button("🔥 Prewarm now", key="prewarm_now", on_click=prewarm.start_prewarm)
+    elif status['settled']:
+        render_prewarm_steps(status)
+    else:
+        render_prewarm_progress()
+
+def render_prewarm_steps(status):
+    for step, (state, detail) in status['steps'].items():
+        st.caption(f"{PREWARM_ICONS[state]} **{step}** {detail}")
+    st.caption(f"Warm containers waiting: {status['warm_containers']}")
+
+@st.fragment(run_every=SOLVE_POLL_INTERVAL)
+def render_prewarm_progress():
+    """Polls while prewarming, then redraws the page once everything settled"""
+    status = prewarm.status()
+    render_prewarm_steps(status)
+    if status['settled']:
+        st.rerun()
+
 def main():
     # Header
     st.markdown("""
@@ -282,16 +304,22 @@ def main():
         
         st.markdown("---")
         
+        render_prewarm_status()
+        
+        st.markdown("---")
+        
         # Solution browser
         st.markdown("### 📁 Saved Solutions")
-        solutions = load_solutions()
+        store = get_store(solutions_dir)
+        recent_solutions, _ = store.list_page(order='newest', limit=5, loader=get_session_cache(store))  # Show last 5
         
-        if solutions:
-            for solution in solutions[:5]:  # Show last 5
+        if recent_solutions:
+            for solution in recent_solutions:
                 with st.expander(f"📄 {solution['problem'][:50]}..."):
                     st.write(f"**Created:** {solution['timestamp'][:19]}")
                     st.write(f"**Problem:** {solution['problem']}")
                     if st.button(f"View Solution", key=f"view_{solution['id']}"):
+                        # Code and explanation are only loaded when displayed
                         st.session_state.current_solution = solution
         else:
             st.info("No solutions saved yet")
@@ -305,7 +333,8 @@ def main():
         
         if st.button("🧹 Clear All Solutions"):
             if st.session_state.get('confirm_clear', False):
-                for file in solutions_dir.glob("*"):
+                get_store(solutions_dir).clear()
+                for file in solutions_dir.glob("solution_*"):
                     file.unlink()
                 st.success("All solutions cleared!")
                 st.session_state.confirm_clear = False
@@ -382,172 +411,121 @@ def main():
             st.markdown("**Code:**")
             st.code(solution['code'], language='python')
             
+            report = analyze_code(solution['code'])
+            if report.error is None:
+                st.markdown(f"**Estimated Complexity:** {report.estimate}")
+                for hotspot in report.hotspots:
+                    st.markdown(f"- ⚠️ Line {hotspot.line}: {hotspot.message}")
+            
             st.markdown("**Explanation:**")
             st.write(solution['explanation'])
 
     # Main solve button
     st.markdown("---")
+    if st.session_state.pop('solve_cancelled', False):
+        st.warning("⏹️ The previous solve was cancelled. The model request and Docker container were released.")
+    outcome = st.session_state.pop('solve_outcome', None)
+    if outcome == 'solved':
+        st.success("🎉 Problem solved successfully!")
+        st.info(f"📁 Solution saved to: {solutions_dir.absolute()}")
+    elif outcome is not None:
+        st.error(f"❌ {outcome}")
+
     col1, col2, col3 = st.columns([1, 2, 1])
     
     with col2:
-        if st.button("🚀 Solve Problem", type="primary", use_container_width=True):
+        solving = get_run(st.session_state.get('active_solve')) is not None
+        if st.button("🚀 Solve Problem", type="primary", use_container_width=True, disabled=solving):
             if not problem_input.strip():
                 st.error("Please enter a problem to solve!")
             else:
                 solve_problem(problem_input, include_tests, include_docs, complexity_analysis, optimization_tips)
+    
+    if st.session_state.get('active_solve'):
+        render_active_solve()
+
+def cancel_active_solve():
+    """Callback for the Cancel button"""
+    run = get_run(st.session_state.get('active_solve'))
+    if run is not None:
+        run.cancel()
 
 def solve_problem(problem, include_tests=True, include_docs=True, complexity_analysis=True, optimization_tips=True):
-    """Solve the DSA problem using AI agents"""
-    
-    # Initialize progress tracking
-    progress_bar = st.progress(0)
-    status_container = st.container()
-    messages_container = st.container()
-    
+    """Start solving the DSA problem on the background loop"""
     try:
-        # Step 1: Initialize
-        with status_container:
-            st.info("🔄 Initializing AI agents and Docker container...")
-        progress_bar.progress(10)
-        
-        team, docker = get_dsa_team_and_docker()
-        progress_bar.progress(20)
-        
-        # Step 2: Start Docker
-        with status_container:
-            st.info("🐳 Starting Docker container for code execution...")
-        progress_bar.progress(30)
-        
-        # Step 3: Solve problem
-        with status_container:
-            st.info("🧠 AI agents are analyzing and solving your problem...")
-        progress_bar.progress(40)
-        
-        # Create message containers
-        with messages_container:
-            st.markdown("### 🤖 AI Agent Conversation")
-            
-            # Run the solving process
-            async def run_solving_process():
-                try:
-                    await start_docker_container(docker)
-                    
-                    solution_data = {
-                        'problem': problem,
-                        'code': '',
-                        'explanation': '',
-                        'test_results': [],
-                        'messages': []
-                    }
-                    
-                    message_count = 0
-                    async for message in team.run_stream(task=problem):
-                        message_count += 1
-                        progress = min(40 + (message_count * 3), 90)
-                        progress_bar.progress(progress)
-                        
-                        if isinstance(message, TextMessage):
-                            # Display agent message
-                            agent_name = message.source
-                            content = message.content
-                            
-                            if "DSA_Problem_Solver_Agent" in agent_name:
-                                with st.chat_message("assistant", avatar="🧑‍💻"):
-                                    st.markdown(f"**Problem Solver Agent:**")
-                                    st.markdown(content)
-                                    
-                                    # Extract code if present
-                                    if "```python" in content:
-                                        code_start = content.find("```python") + 9
-                                        code_end = content.find("```", code_start)
-                                        if code_end > code_start:
-                                            solution_data['code'] = content[code_start:code_end].strip()
-                                    
-                                    solution_data['messages'].append({
-                                        'agent': 'Problem Solver',
-                                        'content': content,
-                                        'timestamp': datetime.now().isoformat()
-                                    })
-                            
-                            elif "CodeExecutorAgent" in agent_name:
-                                with st.chat_message("assistant", avatar="🤖"):
-                                    st.markdown(f"**Code Executor Agent:**")
-                                    st.markdown(content)
-                                    
-                                    solution_data['messages'].append({
-                                        'agent': 'Code Executor',
-                                        'content': content,
-                                        'timestamp': datetime.now().isoformat()
-                                    })
-                            
-                            elif "user" in agent_name.lower():
-                                with st.chat_message("user", avatar="👤"):
-                                    st.markdown(content)
-                        
-                        elif isinstance(message, TaskResult):
-                            with st.chat_message("system", avatar="✅"):
-                                st.success(f"**Task Completed:** {message.stop_reason}")
-                                solution_data['messages'].append({
-                                    'agent': 'System',
-                                    'content': f"Task completed: {message.stop_reason}",
-                                    'timestamp': datetime.now().isoformat()
-                                })
-                    
-                    return solution_data
-                    
-                except Exception as e:
-                    st.error(f"Error during solving: {e}")
-                    return None
-                finally:
-                    try:
-                        await stop_docker_container(docker)
-                    except:
-                        pass
-            
-            # Run the async process
-            solution_data = asyncio.run(run_solving_process())
-            
-            if solution_data and solution_data['code']:
-                progress_bar.progress(95)
-                
-                # Save solution
-                saved_solution = save_solution(
-                    problem=solution_data['problem'],
-                    code=solution_data['code'],
-                    explanation=solution_data.get('explanation', ''),
-                    test_results=solution_data.get('test_results', [])
-                )
-                
-                st.session_state.solutions.append(saved_solution)
-                st.session_state.current_solution = saved_solution
-                
-                progress_bar.progress(100)
-                
-                # Success message
-                st.success("🎉 Problem solved successfully!")
-                
-                # Display solution summary
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Problem", problem[:30] + "...")
-                with col2:
-                    st.metric("Code Lines", len(solution_data['code'].split('\n')))
-                with col3:
-                    st.metric("Status", "✅ Complete")
-                
-                # File location info
-                st.info(f"📁 Solution saved to: {solutions_dir.absolute()}")
-                
-                # Auto-refresh to show the solution
-                time.sleep(1)
-                st.rerun()
-            
-            else:
-                st.error("❌ Failed to solve the problem. Please try again.")
-    
+        run = start_solve(problem)
+        st.session_state.active_solve = run.run_id
     except Exception as e:
         st.error(f"❌ Error: {e}")
         st.error("Please check your configuration and try again.")
 
+@st.fragment(run_every=SOLVE_POLL_INTERVAL)
+def render_active_solve():
+    """Live view of this session's solve, re-run on its own while the solve works in the background"""
+    run = get_run(st.session_state.get('active_solve'))
+    if run is None:
+        st.session_state.pop('active_solve', None)
+        st.rerun()
+    
+    st.progress(run.progress)
+    if run.status == "starting":
+        st.info("🐳 Starting Docker container for code execution...")
+    elif not run.done:
+        st.info(f"🧠 AI agents are analyzing and solving your problem... ({run.elapsed:.0f}s)")
+        st.button("⏹️ Cancel Solve", key="cancel_solve", on_click=cancel_active_solve)
+    
+    st.markdown("### 🤖 AI Agent Conversation")
+    for entry in list(run.transcript):
+        if entry['agent'] == 'Problem Solver':
+            with st.chat_message("assistant", avatar="🧑‍💻"):
+                st.markdown(f"**Problem Solver Agent:**")
+                st.markdown(entry['content'])
+        elif entry['agent'] == 'Code Executor':
+            with st.chat_message("assistant", avatar="🤖"):
+                st.markdown(f"**Code Executor Agent:**")
+                st.markdown(entry['content'])
+        elif entry['agent'] == 'User':
+            with st.chat_message("user", avatar="👤"):
+                st.markdown(entry['content'])
+        elif entry['agent'] == 'System':
+            with st.chat_message("system", avatar="✅"):
+                st.success(f"**{entry['content']}**")
+    
+    if run.done:
+        finish_solve(run)
+
+def finish_solve(run):
+    """Save a finished solve into this session and refresh the whole page"""
+    if run.collect() is None:
+        return
+    st.session_state.pop('active_solve', None)
+    solution_data = run.solution_data
+    
+    if run.status == "completed" and solution_data['code']:
+        with tracing.span('solution.save', trace_id=run.run_id):
+            saved_solution = save_solution(
+                problem=solution_data['problem'],
+                code=solution_data['code'],
+                explanation=solution_data.get('explanation', ''),
+                test_results=solution_data.get('test_results', []),
+                messages=solution_data.get('messages', []),
+                metrics=solution_data.get('metrics'),
+                profile=solution_data.get('profile')
+            )
+        
+        # Keep only a lightweight summary in the session; code loads on demand
+        store = get_store(solutions_dir)
+        summary = store.get_summary(saved_solution['id'], loader=get_session_cache(store))
+        st.session_state.solutions.append(summary)
+        st.session_state.current_solution = summary
+        st.session_state.solve_outcome = 'solved'
+    elif run.status == "cancelled":
+        st.session_state.solve_cancelled = True
+    else:
+        st.session_state.solve_outcome = (
+            f"Error during solving: {run.error}" if run.error else "Failed to solve the problem. Please try again."
+        )
+    st.rerun()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,204 @@
+"""
+Fixed DSA problem corpus for the benchmarks
+
+One problem per Quick Template of the dashboard. Each problem carries a
+reference solution with its own test cases; in replay mode the model's
+side of the conversation is scripted from it (replay_script), so a run
+exercises the real team, executor, extraction and storage code without
+depending on a model provider.
+
+Bump CORPUS_VERSION whenever a problem, solution or script changes:
+results are only compared against a baseline of the same version.
+"""
+
+CORPUS_VERSION = 1
+
+PROBLEMS = [
+    {
+        'id': 'binary_search',
+        'template': 'Binary Search',
+        'problem': "Write a function that returns the index of a target in a sorted array, or -1 if it is absent.",
+        'solution': '''
+def binary_search(nums, target):
+    low, high = 0, len(nums) - 1
+    while low <= high:
+        mid = (low + high) // 2
+        if nums[mid] == target:
+            return mid
+        if nums[mid] < target:
+            low = mid + 1
+        else:
+            high = mid - 1
+    return -1
+
+assert binary_search([1, 3, 5, 7, 9], 7) == 3
+assert binary_search([1, 3, 5, 7, 9], 4) == -1
+assert binary_search([], 1) == -1
+assert binary_search(list(range(100000)), 99999) == 99999
+print("All test cases passed")
+''',
+    },
+    {
+        'id': 'merge_sort',
+        'template': 'Merge Sort',
+        'problem': "Implement merge sort for a list of integers.",
+        'solution': '''
+def merge_sort(nums):
+    if len(nums) <= 1:
+        return nums
+    mid = len(nums) // 2
+    left, right = merge_sort(nums[:mid]), merge_sort(nums[mid:])
+    merged, i, j = [], 0, 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+        else:
+            merged.append(right[j])
+            j += 1
+    return merged + left[i:] + right[j:]
+
+assert merge_sort([5, 2, 9, 1, 5, 6]) == [1, 2, 5, 5, 6, 9]
+assert merge_sort([]) == []
+assert merge_sort([3, -1, 0]) == [-1, 0, 3]
+assert merge_sort(list(range(5000, 0, -1))) == list(range(1, 5001))
+print("All test cases passed")
+''',
+    },
+    {
+        'id': 'reverse_linked_list',
+        'template': 'Linked List',
+        'problem': "Reverse a singly linked list and return the new head.",
+        'solution': '''
+class ListNode:
+    def __init__(self, val, next=None):
+        self.val = val
+        self.next = next
+
+def reverse_list(head):
+    previous = None
+    while head:
+        head.next, previous, head = previous, head, head.next
+    return previous
+
+def build(values):
+    head = None
+    for value in reversed(values):
+        head = ListNode(value, head)
+    return head
+
+def to_list(head):
+    values = []
+    while head:
+        values.append(head.val)
+        head = head.next
+    return values
+
+assert to_list(reverse_list(build([1, 2, 3, 4]))) == [4, 3, 2, 1]
+assert to_list(reverse_list(build([]))) == []
+assert to_list(reverse_list(build([7]))) == [7]
+print("All test cases passed")
+''',
+    },
+    {
+        'id': 'inorder_traversal',
+        'template': 'Tree Traversal',
+        'problem': "Return the inorder traversal of a binary tree without recursion.",
+        'solution': '''
+class TreeNode:
+    def __init__(self, val, left=None, right=None):
+        self.val = val
+        self.left = left
+        self.right = right
+
+def inorder(root):
+    result, stack, node = [], [], root
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        result.append(node.val)
+        node = node.right
+    return result
+
+tree = TreeNode(4, TreeNode(2, TreeNode(1), TreeNode(3)), TreeNode(6, TreeNode(5), TreeNode(7)))
+assert inorder(tree) == [1, 2, 3, 4, 5, 6, 7]
+assert inorder(None) == []
+assert inorder(TreeNode(1, right=TreeNode(2))) == [1, 2]
+print("All test cases passed")
+''',
+    },
+    {
+        'id': 'coin_change',
+        'template': 'Dynamic Programming',
+        'problem': "Given coin denominations and an amount, return the fewest coins that make up the amount, or -1.",
+        'solution': '''
+def coin_change(coins, amount):
+    fewest = [0] + [amount + 1] * amount
+    for total in range(1, amount + 1):
+        for coin in coins:
+            if coin <= total:
+                fewest[total] = min(fewest[total], fewest[total - coin] + 1)
+    return fewest[amount] if fewest[amount] <= amount else -1
+
+assert coin_change([1, 2, 5], 11) == 3
+assert coin_change([2], 3) == -1
+assert coin_change([1], 0) == 0
+assert coin_change([186, 419, 83, 408], 6249) == 20
+print("All test cases passed")
+''',
+    },
+    {
+        'id': 'shortest_path_bfs',
+        'template': 'Graph Algorithms',
+        'problem': "Find the length of the shortest path between two nodes of an unweighted graph, or -1 if unreachable.",
+        'solution': '''
+from collections import deque
+
+def shortest_path(graph, start, goal):
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if node == goal:
+            return distances[node]
+        for neighbour in graph.get(node, ()):
+            if neighbour not in distances:
+                distances[neighbour] = distances[node] + 1
+                queue.append(neighbour)
+    return -1
+
+graph = {'a': ['b', 'c'], 'b': ['d'], 'c': ['d', 'e'], 'd': ['f'], 'e': ['f'], 'f': []}
+assert shortest_path(graph, 'a', 'f') == 3
+assert shortest_path(graph, 'a', 'a') == 0
+assert shortest_path(graph, 'f', 'a') == -1
+print("All test cases passed")
+''',
+    },
+]
+
+
+def get_problems(ids=None):
+    """The corpus, or the problems with the given ids in corpus order"""
+    if not ids:
+        return list(PROBLEMS)
+    unknown = set(ids) - {problem['id'] for problem in PROBLEMS}
+    if unknown:
+        raise ValueError(f"Unknown benchmark problems: {', '.join(sorted(unknown))}")
+    return [problem for problem in PROBLEMS if problem['id'] in ids]
+
+
+def replay_script(problem):
+    """
+    The problem solver's turns for a replayed solve, following its system
+    message: plan and tested code, then the save block, then STOP.
+    """
+    code = problem['solution'].strip()
+    return [
+        f"Plan: implement the solution and check it against test cases.\n\n```python\n{code}\n```",
+        "The tests passed. Saving the solution:\n\n"
+        f"```python\ncode = '''\n{code}\n'''\nwith open('solution.py', 'w') as f:\n"
+        "    f.write(code)\n    print(\"Code saved successfully in solution.py\")\n```",
+        "The solution is saved in solution.py. STOP",
+    ]
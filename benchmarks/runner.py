@@ -0,0 +1,378 @@
+"""
+End-to-end benchmarks over the fixed problem corpus
+
+Each solve drives the real pipeline: the team from get_dsa_team_and_docker()
+(including the pre-flight executor wrapper), container start, the streamed
+conversation, code extraction and a save into a scratch SolutionStore.
+The model is either replayed from the corpus scripts (deterministic, no
+API key needed) or the live model from config/settings.py; code runs either
+in a local executor in a scratch directory or in the Docker sandbox. The
+local executor runs code on the host, so with the live model (whose code
+nobody has reviewed) it needs --unsafe-local.
+
+For every solve the runner records the latency of each stage (team,
+container_start, model, execution, extraction, save, total), every model
+call and execution, turns, tokens and whether it passed: stopped with
+STOP after its solution block ran successfully. A run writes the solves
+and their summary (mean, p50, p95 and the pass rate) to a JSON results
+file, and compares it against the baseline when there is one of the same
+corpus version. Regressions make the command exit with status 1.
+
+Usage:
+    python -m benchmarks.runner run [--model replay|live] [--executor local|docker] [--unsafe-local]
+                                    [--repeat N] [--problems ID ...] [--output FILE]
+                                    [--baseline FILE] [--save-baseline]
+    python -m benchmarks.runner compare <results.json> [--baseline FILE]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.corpus import CORPUS_VERSION, get_problems, replay_script
+from config.constant import (
+    BENCHMARK_BASELINE, BENCHMARK_MIN_DELTA, BENCHMARK_REGRESSION_THRESHOLD, BENCHMARK_REPEAT,
+    BENCHMARK_RESULTS_DIR, MODEL, SOLUTIONS_DB_NAME, TEXT_MENTION, TIMEOUT
+)
+from storage.ids import new_solution_id
+from team.code_extractor import CodeExtractor, EXECUTOR_AGENT, SOLVER_AGENT
+
+STAGES = ('team', 'container_start', 'model', 'execution', 'extraction', 'save', 'total')
+# Summary metrics where a higher value is better; everything else is a cost
+HIGHER_IS_BETTER = ('pass_rate',)
+
+
+def percentile(values, p):
+    """Nearest-rank p-th percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(len(ordered) * p / 100)) - 1]
+
+
+def describe(values):
+    return {
+        'mean': statistics.fmean(values) if values else None,
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+    }
+
+
+def _make_executor(kind, work_dir):
+    if kind == 'docker':
+        from config.docker_executor import get_docker_executor
+        return get_docker_executor()
+    from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
+    return LocalCommandLineCodeExecutor(work_dir=work_dir, timeout=TIMEOUT)
+
+
+def _make_model_client(mode, problem):
+    if mode == 'live':
+        return None  # The shared client the apps use
+    from autogen_ext.models.replay import ReplayChatCompletionClient
+    return ReplayChatCompletionClient(replay_script(problem))
+
+
+async def run_solve(problem, model, executor, store, work_dir):
+    """One solve of a corpus problem; returns its record"""
+    from autogen_agentchat.base import TaskResult
+    from autogen_agentchat.messages import TextMessage
+    from config.docker_utils import start_docker_container, stop_docker_container
+    from team.dsa_team import get_dsa_team_and_docker
+
+    stages = dict.fromkeys(STAGES, 0.0)
+    record = {
+        'problem': problem['id'],
+        'passed': False,
+        'stop_reason': None,
+        'error': None,
+        'turns': 0,
+        'tokens': 0,
+        'stages': stages,
+        'model_calls': [],
+        'executions': [],
+    }
+    started = time.perf_counter()
+    docker = None
+    try:
+        mark = time.perf_counter()
+        team, docker = get_dsa_team_and_docker(
+            executor=_make_executor(executor, work_dir),
+            model_client=_make_model_client(model, problem)
+        )
+        stages['team'] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        await start_docker_container(docker)
+        stages['container_start'] = time.perf_counter() - mark
+
+        extractor = CodeExtractor()
+        messages = []
+        last = time.perf_counter()
+        async for message in team.run_stream(task=problem['problem']):
+            now = time.perf_counter()
+            record['turns'] += 1
+            usage = getattr(message, 'models_usage', None)
+            if usage is not None:
+                record['tokens'] += usage.prompt_tokens + usage.completion_tokens
+
+            if isinstance(message, TextMessage):
+                # The time since the previous message was spent producing this one
+                if SOLVER_AGENT in message.source:
+                    record['model_calls'].append(now - last)
+                elif EXECUTOR_AGENT in message.source:
+                    record['executions'].append(now - last)
+                messages.append({'agent': message.source, 'content': message.content})
+
+                mark = time.perf_counter()
+                extractor.add_message(message.source, message.content)
+                stages['extraction'] += time.perf_counter() - mark
+                last = time.perf_counter()
+            elif isinstance(message, TaskResult):
+                record['stop_reason'] = message.stop_reason
+
+        stages['model'] = sum(record['model_calls'])
+        stages['execution'] = sum(record['executions'])
+        block = extractor.solution_block()
+        record['passed'] = (block is not None and block.passed
+                            and TEXT_MENTION in (record['stop_reason'] or ''))
+
+        mark = time.perf_counter()
+        store.save({
+            'id': new_solution_id(),
+            'timestamp': datetime.now().isoformat(),
+            'problem': problem['problem'],
+            'code': extractor.solution_code(),
+            'explanation': '',
+            'test_results': [],
+            'messages': messages,
+            'metrics': {'turns': record['turns'], 'tokens': record['tokens']},
+        })
+        stages['save'] = time.perf_counter() - mark
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        if docker is not None:
+            try:
+                await stop_docker_container(docker)
+            except Exception:
+                pass
+        stages['total'] = time.perf_counter() - started
+    return record
+
+
+def summarize(solves):
+    """Corpus-wide and per-problem statistics of a run's solves"""
+    summary = {
+        'solves': len(solves),
+        'pass_rate': sum(solve['passed'] for solve in solves) / len(solves) if solves else 0.0,
+        'errors': sum(1 for solve in solves if solve['error']),
+        'turns': describe([solve['turns'] for solve in solves]),
+        'tokens': describe([solve['tokens'] for solve in solves]),
+        'stages': {stage: describe([solve['stages'][stage] for solve in solves]) for stage in STAGES},
+        'model_call': describe([call for solve in solves for call in solve['model_calls']]),
+        'execution_call': describe([run for solve in solves for run in solve['executions']]),
+        'problems': {},
+    }
+    for problem_id in dict.fromkeys(solve['problem'] for solve in solves):
+        runs = [solve for solve in solves if solve['problem'] == problem_id]
+        summary['problems'][problem_id] = {
+            'pass_rate': sum(solve['passed'] for solve in runs) / len(runs),
+            'total': describe([solve['stages']['total'] for solve in runs]),
+        }
+    return summary
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+async def run_benchmark(model='replay', executor='local', repeat=BENCHMARK_REPEAT, problem_ids=None,
+                        progress=None, unsafe_local=False):
+    if model == 'live' and executor == 'local' and not unsafe_local:
+        raise ValueError("The live model's code would run unsandboxed on this host; "
+                         "use the docker executor or pass unsafe_local=True")
+    problems = get_problems(problem_ids)
+    solves = []
+    with tempfile.TemporaryDirectory(prefix='algogenie_bench_') as scratch:
+        from storage.solution_store import SolutionStore
+        store = SolutionStore(Path(scratch) / SOLUTIONS_DB_NAME)
+        try:
+            for round_index in range(repeat):
+                for problem in problems:
+                    work_dir = Path(scratch) / f"{problem['id']}_{round_index}"
+                    work_dir.mkdir()
+                    record = await run_solve(problem, model, executor, store, work_dir)
+                    record['round'] = round_index
+                    solves.append(record)
+                    if progress is not None:
+                        progress(record)
+        finally:
+            store.close()
+
+    return {
+        'corpus_version': CORPUS_VERSION,
+        'timestamp': datetime.now().isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'model': MODEL if model == 'live' else 'replay',
+        'executor': executor,
+        'repeat': repeat,
+        'summary': summarize(solves),
+        'solves': solves,
+    }
+
+
+def _metrics(summary):
+    """Flat {name: value} view of the summary used for comparisons"""
+    metrics = {'pass_rate': summary['pass_rate']}
+    for stage in STAGES:
+        for stat in ('p50', 'p95'):
+            metrics[f'{stage}.{stat}'] = summary['stages'][stage][stat]
+    for name in ('model_call', 'execution_call'):
+        for stat in ('p50', 'p95'):
+            metrics[f'{name}.{stat}'] = summary[name][stat]
+    metrics['turns.mean'] = summary['turns']['mean']
+    metrics['tokens.mean'] = summary['tokens']['mean']
+    return metrics
+
+
+def compare(results, baseline, threshold=BENCHMARK_REGRESSION_THRESHOLD):
+    """
+    Metrics that changed by more than `threshold` relative to the baseline,
+    as (name, baseline, current, relative change, regressed) rows.
+    Latency changes under BENCHMARK_MIN_DELTA seconds are ignored.
+    """
+    if results['corpus_version'] != baseline['corpus_version']:
+        raise ValueError(
+            f"Corpus version {results['corpus_version']} can't be compared with a "
+            f"baseline of version {baseline['corpus_version']}"
+        )
+    current, previous = _metrics(results['summary']), _metrics(baseline['summary'])
+    rows = []
+    for name, before in previous.items():
+        after = current.get(name)
+        if before is None or after is None or before == after:
+            continue
+        is_latency = not name.startswith(('turns', 'tokens', 'pass_rate'))
+        if is_latency and abs(after - before) < BENCHMARK_MIN_DELTA:
+            continue
+        change = (after - before) / before if before else math.inf
+        if abs(change) <= threshold:
+            continue
+        worse = after < before if name in HIGHER_IS_BETTER else after > before
+        rows.append((name, before, after, change, worse))
+    return rows
+
+
+def _format_value(name, value):
+    if name == 'pass_rate':
+        return f"{value:.0%}"
+    if name.startswith(('turns', 'tokens')):
+        return f"{value:.1f}"
+    return f"{value * 1000:.1f}ms"
+
+
+def _print_summary(results):
+    summary = results['summary']
+    print(f"📊 Corpus v{results['corpus_version']} | model: {results['model']} | "
+          f"executor: {results['executor']} | {summary['solves']} solves")
+    print(f"   Pass rate: {summary['pass_rate']:.0%}  errors: {summary['errors']}  "
+          f"turns: {summary['turns']['mean']:.1f}  tokens: {summary['tokens']['mean']:.0f}")
+    print(f"   {'stage':<16}{'p50':>12}{'p95':>12}")
+    for stage in STAGES:
+        stats = summary['stages'][stage]
+        print(f"   {stage:<16}{stats['p50'] * 1000:>10.1f}ms{stats['p95'] * 1000:>10.1f}ms")
+
+
+def _print_comparison(rows):
+    if not rows:
+        print("✅ No changes beyond the threshold against the baseline")
+        return
+    for name, before, after, change, worse in rows:
+        marker = '🔴' if worse else '🟢'
+        print(f"   {marker} {name:<22}{_format_value(name, before):>12} → "
+              f"{_format_value(name, after):<12}({change:+.0%})")
+
+
+def _load(path):
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def _compare_with_baseline(results, baseline_path):
+    if not Path(baseline_path).exists():
+        print(f"ℹ️ No baseline at {baseline_path}; save one with --save-baseline")
+        return 0
+    rows = compare(results, _load(baseline_path))
+    print(f"📐 Compared with {baseline_path}:")
+    _print_comparison(rows)
+    return 1 if any(worse for *_, worse in rows) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AlgoGenie end-to-end benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run = subparsers.add_parser('run', help="Solve the corpus and write a results file")
+    run.add_argument('--model', choices=('replay', 'live'), default='replay')
+    run.add_argument('--executor', choices=('local', 'docker'), default='local')
+    run.add_argument('--unsafe-local', action='store_true',
+                     help="Allow --model live with --executor local, running model-written code on this host")
+    run.add_argument('--repeat', type=int, default=BENCHMARK_REPEAT)
+    run.add_argument('--problems', nargs='+', metavar='ID', help="Only these corpus problems")
+    run.add_argument('--output', help=f"Results file (default: {BENCHMARK_RESULTS_DIR}/<timestamp>.json)")
+    run.add_argument('--baseline', default=BENCHMARK_BASELINE)
+    run.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    compare_parser = subparsers.add_parser('compare', help="Compare a results file with the baseline")
+    compare_parser.add_argument('results')
+    compare_parser.add_argument('--baseline', default=BENCHMARK_BASELINE)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run' and args.model == 'live' and args.executor == 'local' and not args.unsafe_local:
+        parser.error("--model live --executor local runs model-written code on this host without a sandbox; "
+                     "use --executor docker, or pass --unsafe-local if you accept that")
+
+    if args.command == 'compare':
+        results = _load(args.results)
+        _print_summary(results)
+        return _compare_with_baseline(results, args.baseline)
+
+    def report_progress(record):
+        status = '✅' if record['passed'] else ('💥' if record['error'] else '❌')
+        print(f"{status} {record['problem']:<22} round {record['round'] + 1}: "
+              f"{record['stages']['total']:.2f}s, {record['turns']} turns"
+              + (f" ({record['error']})" if record['error'] else ''))
+
+    results = asyncio.run(run_benchmark(
+        model=args.model, executor=args.executor, repeat=args.repeat,
+        problem_ids=args.problems, progress=report_progress, unsafe_local=args.unsafe_local
+    ))
+    output = Path(args.output or Path(BENCHMARK_RESULTS_DIR) / f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    _print_summary(results)
+    print(f"💾 Results written to {output}")
+
+    if args.save_baseline:
+        Path(args.baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.baseline).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"📌 Saved as baseline {args.baseline}")
+        return 0
+    return _compare_with_baseline(results, args.baseline)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+import sys
+
 # OpenRouter models - you can change these to any model available on OpenRouter
 MODEL = 'meta-llama/llama-3.1-8b-instruct'  # Free model on OpenRouter
 # Alternative models you can use:
@@ -8,4 +10,64 @@ MODEL = 'meta-llama/llama-3.1-8b-instruct'  # Free model on OpenRouter
 TEXT_MENTION = 'STOP'
 WORK_DIR = 'temp'
 TIMEOUT = 120
-MAX_TURNS=15
\ No newline at end of file
+# Sandbox image of the code executor, pinned to the host's python so the
+# pre-flight check (agents/preflight.py) parses code like the sandbox does
+DOCKER_IMAGE = f'python:{sys.version_info.major}.{sys.version_info.minor}-slim'
+# Policy: network client imports blocked by the pre-flight check. The container
+# keeps Docker's default network, so these would run; solutions don't need the
+# network and generated code shouldn't reach it. Processes, files and ctypes are
+# left alone as they only affect the throwaway container.
+# A dotted entry also covers its submodules ('urllib.request' leaves urllib.parse alone).
+PREFLIGHT_FORBIDDEN_IMPORTS = ('socket', 'ssl', 'http.client', 'urllib.request', 'ftplib', 'smtplib', 'requests', 'httpx')
+MAX_TURNS=15
+
+# Headless HTTP API (api_server.py)
+API_HOST = '127.0.0.1'
+API_PORT = 8000
+MAX_CONCURRENT_SOLVES = 4  # Solves running at the same time (one Docker container each)
+MAX_QUEUED_SOLVES = 32  # Pending solves before new submissions are rejected with 429
+SSE_KEEPALIVE = 15  # Seconds between keep-alive comments on idle event streams
+
+# Checkpoints of in-flight solves, rewritten after every message (team/checkpoint.py)
+CHECKPOINT_DIR = 'checkpoints'
+
+# Solution storage (storage/solution_store.py)
+SOLUTIONS_DIR = 'solutions'
+SOLUTIONS_DB_NAME = 'solutions.db'
+SESSION_CACHE_SIZE = 16  # Full solutions cached per Streamlit session
+SESSION_SOLUTIONS_KEPT = 20  # Solves remembered in a session's history
+MAX_REVISION_CHAIN = 16  # Edit deltas between full snapshots in a solution's history
+ARCHIVE_AFTER_DAYS = 90  # Move content of older solutions into archive segments (None disables)
+ARCHIVE_SEGMENT_BYTES = 64 * 1024 * 1024  # Size at which a new archive segment file is started
+
+# Solves run on a background event loop and the UI polls them (team/solve_runner.py)
+SOLVE_POLL_INTERVAL = 1.0  # Seconds between UI refreshes of a running solve
+FINISHED_RUNS_KEPT = 50  # Finished solves kept until their session collects them
+
+# Opt-in warm-up of the sandbox and model connection when the app starts (team/prewarm.py)
+PREWARM_ON_START = False
+WARM_CONTAINERS = 1  # Started sandbox containers kept ready for the next solves
+PREWARM_KEEPALIVE = 4.0  # Seconds between requests that keep the model connection open (None disables)
+PREWARM_KEEPALIVE_IDLE = 300  # Seconds after prewarming that keep-alive requests stop if no solve started
+PREWARM_SHUTDOWN_TIMEOUT = 15  # Seconds allowed at exit for stopping the warm containers
+
+# End-to-end benchmarks over the fixed problem corpus (benchmarks/runner.py)
+BENCHMARK_RESULTS_DIR = 'benchmarks/results'
+BENCHMARK_BASELINE = 'benchmarks/baseline.json'
+BENCHMARK_REPEAT = 3  # Solves of each problem per run
+BENCHMARK_REGRESSION_THRESHOLD = 0.10  # Relative change of a metric reported as a regression
+BENCHMARK_MIN_DELTA = 0.005  # Seconds; smaller latency changes are treated as noise
+
+# Span tracing of solves (monitoring/tracing.py)
+TRACING_ENABLED = False  # Off: spans are no-ops and nothing is written
+TRACE_DIR = 'traces'  # One <run id>.jsonl file of spans per solve
+
+# Prometheus-style metrics (monitoring/metrics.py)
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = None  # Scrape endpoint of the Streamlit apps, e.g. 9464 (api_server.py serves /metrics itself)
+METRICS_SNAPSHOT_FILE = 'metrics.prom'  # Written by main.py after each CLI solve
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)  # Seconds
+
+# Runtime profiles of solutions in the sandbox (analysis/profiler.py)
+PROFILE_TOP_N = 15  # Functions and allocation sites kept per profile
+PROFILE_AFTER_SOLVE = False  # Profile every solution once its solve completes
@@ -1,6 +1,6 @@
 from autogen_ext.code_executors.docker import DockerCommandLineCodeExecutor
 
-from config.constant import WORK_DIR, TIMEOUT
+from config.constant import WORK_DIR, TIMEOUT, DOCKER_IMAGE
 
 def get_docker_executor():
     """
@@ -8,6 +8,7 @@ def get_docker_executor():
     This executor will run the code in a Docker container.
     """
     docker_executor = DockerCommandLineCodeExecutor(
+        image=DOCKER_IMAGE,
         work_dir=WORK_DIR,
         timeout=TIMEOUT
     )
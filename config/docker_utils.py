@@ -1,8 +1,20 @@
+import time
+
+from monitoring import metrics
+
+
 async def start_docker_container(docker):
     print("Starting Docker container...")
-    await docker.start()
+    started = time.perf_counter()
+    try:
+        await docker.start()
+    except Exception:
+        metrics.container_starts.inc(result='failed')
+        raise
+    metrics.container_starts.inc(result='started')
+    metrics.container_start_seconds.observe(time.perf_counter() - started)
 
 async def stop_docker_container(docker):
     print("Stopping Docker container...")
     await docker.stop()
-    print("Docker container stopped.")
\ No newline at end of file
+    print("Docker container stopped.")
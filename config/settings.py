@@ -1,14 +1,16 @@
 import os
 from dotenv import load_dotenv
 
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_ext.models.openai._model_info import ModelInfo
 from config.constant import MODEL
 
 load_dotenv()
 api_key = os.getenv('OPENROUTER_API_KEY')
 
 def get_model_client():
+    # autogen_ext and the OpenAI SDK are only loaded when a solve needs them
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+    from autogen_ext.models.openai._model_info import ModelInfo
+
     if not api_key:
         raise ValueError(
             "OPENROUTER_API_KEY not found in environment variables. "
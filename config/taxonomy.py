@@ -0,0 +1,120 @@
+# Problem taxonomy used by analysis/classifier.py
+#
+# Each category lists phrases matched in the problem text (whole words,
+# case-insensitive, common inflections like -s/-ing/-ed included) and
+# identifiers matched in the generated code. A phrase may appear under more
+# than one category; a solution gets every category whose score reaches the
+# threshold, so 'binary search tree' is both Trees and Searching.
+# Category names must not contain commas (they are stored comma-separated).
+# Bare words that only describe the input ('integer', 'sorted array') are left
+# out or listed in DESCRIPTIVE_WORDS, so they don't add categories.
+
+TAXONOMY = {
+    'Sorting': {
+        'keywords': [
+            'sort', 'sorting algorithm', 'merge sort', 'quick sort', 'quicksort', 'heap sort',
+            'bubble sort', 'insertion sort', 'selection sort', 'counting sort', 'radix sort',
+            'merge intervals', 'kth smallest',
+        ],
+        'identifiers': [
+            'merge_sort', 'mergesort', 'quick_sort', 'quicksort', 'heap_sort', 'bubble_sort',
+            'insertion_sort', 'selection_sort', 'counting_sort', 'radix_sort', 'partition',
+        ],
+    },
+    'Searching': {
+        'keywords': [
+            'search', 'binary search', 'binary search tree', 'bisect', 'lower bound',
+            'upper bound', 'find the index', 'rotated sorted array',
+        ],
+        'identifiers': [
+            'binary_search', 'bisect', 'bisect_left', 'bisect_right', 'lower_bound', 'upper_bound',
+        ],
+    },
+    'Trees': {
+        'keywords': [
+            'tree', 'binary tree', 'binary search tree', 'bst', 'trie', 'prefix tree',
+            'segment tree', 'fenwick tree', 'inorder', 'preorder', 'postorder', 'level order',
+            'tree traversal', 'lowest common ancestor', 'subtree',
+        ],
+        'identifiers': [
+            'TreeNode', 'Node', 'inorder', 'preorder', 'postorder', 'level_order', 'Trie',
+            'TrieNode', 'insert_node', 'lowest_common_ancestor',
+        ],
+    },
+    'Graphs': {
+        'keywords': [
+            'graph', 'graph algorithm', 'bfs', 'dfs', 'breadth first search', 'depth first search',
+            'shortest path', 'dijkstra', 'bellman ford', 'floyd warshall', 'topological sort',
+            'adjacency list', 'adjacency matrix', 'connected component', 'cycle detection',
+            'union find', 'disjoint set', 'minimum spanning tree', 'kruskal', 'prim',
+        ],
+        'identifiers': [
+            'graph', 'adj', 'adjacency', 'bfs', 'dfs', 'dijkstra', 'topological_sort',
+            'visited', 'union', 'find_parent', 'UnionFind', 'DisjointSet',
+        ],
+    },
+    'Dynamic Programming': {
+        'keywords': [
+            'dynamic programming', 'dp', 'memoization', 'memoize', 'tabulation', 'knapsack',
+            'longest common subsequence', 'longest increasing subsequence', 'edit distance',
+            'coin change', 'climbing stairs', 'fibonacci', 'optimal substructure',
+        ],
+        'identifiers': ['dp', 'memo', 'lru_cache', 'cache', 'knapsack', 'table'],
+    },
+    'Linked Lists': {
+        'keywords': ['linked list', 'singly linked list', 'doubly linked list', 'list node'],
+        'identifiers': ['ListNode', 'LinkedList', 'head', 'next_node', 'prev_node'],
+    },
+    'Hashing': {
+        'keywords': ['hash', 'hash map', 'hashmap', 'hash table', 'hash set', 'two sum', 'anagram'],
+        'identifiers': ['Counter', 'defaultdict', 'seen'],
+    },
+    'Heaps': {
+        'keywords': ['heap', 'priority queue', 'kth largest', 'top k', 'k largest', 'median of stream'],
+        'identifiers': ['heapq', 'heappush', 'heappop', 'heapify', 'nlargest', 'nsmallest'],
+    },
+    'Stacks & Queues': {
+        'keywords': [
+            'stack', 'queue', 'deque', 'monotonic stack', 'valid parentheses', 'balanced brackets',
+            'next greater element',
+        ],
+        'identifiers': ['deque', 'stack', 'popleft', 'appendleft', 'Queue', 'LifoQueue'],
+    },
+    'Strings': {
+        'keywords': ['string', 'substring', 'palindrome', 'anagram', 'character', 'word', 'pattern matching', 'kmp'],
+        'identifiers': ['ord', 'chr', 'isalpha', 'isalnum', 'lower', 'kmp'],
+    },
+    'Arrays': {
+        'keywords': [
+            'array', 'subarray', 'matrix', 'two pointers', 'sliding window', 'prefix sum',
+            'maximum element', 'minimum element', 'rotate array', 'kadane',
+        ],
+        'identifiers': ['prefix', 'prefix_sum', 'window', 'kadane'],
+    },
+    'Math': {
+        'keywords': [
+            'prime', 'sieve', 'gcd', 'lcm', 'factorial', 'modulo', 'power of', 'fibonacci',
+            'add two numbers', 'digit',
+        ],
+        'identifiers': ['gcd', 'lcm', 'isqrt', 'sqrt', 'factorial', 'is_prime', 'sieve'],
+    },
+    'Backtracking': {
+        'keywords': [
+            'backtracking', 'permutation', 'combination', 'subset', 'n queens', 'sudoku',
+            'word search', 'generate all',
+        ],
+        'identifiers': ['backtrack', 'permutations', 'combinations', 'permute'],
+    },
+}
+
+# Keyword inflections that describe the input rather than name the task when
+# followed by one of the nouns: 'binary search on a sorted array' isn't Sorting
+DESCRIPTIVE_WORDS = {
+    'sorted': ['array', 'list', 'linked list', 'matrix', 'sequence', 'input', 'string'],
+}
+
+# Scoring: a phrase in the problem statement outweighs an identifier in the code
+KEYWORD_WEIGHT = 3
+IDENTIFIER_WEIGHT = 1
+CATEGORY_THRESHOLD = 3  # Minimum score for a category to be assigned
+MAX_CATEGORIES = 3  # Labels kept per solution, highest score first
@@ -2,27 +2,44 @@ import streamlit as st
 import os
 import json
 from pathlib import Path
-from datetime import datetime
 import subprocess
 import platform
+import tempfile
+from datetime import datetime
+from storage.solution_store import get_store
+from storage.solution_model import SolutionCache
+from storage.library_io import export_library_download, import_library
+
+def get_session_cache(store):
+    """Bounded cache of full solutions for the current Streamlit session"""
+    cache = st.session_state.get('solution_cache')
+    if cache is None or cache.store is not store:
+        cache = SolutionCache(store)
+        st.session_state.solution_cache = cache
+    return cache
 
 class SolutionBrowser:
     def __init__(self, solutions_dir="solutions"):
         self.solutions_dir = Path(solutions_dir)
         self.solutions_dir.mkdir(exist_ok=True)
+        self.store = get_store(self.solutions_dir)
+        self.cache = get_session_cache(self.store)
     
-    def get_solutions(self):
-        """Get all saved solutions"""
-        solutions = []
-        for solution_file in self.solutions_dir.glob("*.json"):
-            try:
-                with open(solution_file, 'r', encoding='utf-8') as f:
-                    solution_data = json.load(f)
-                    solutions.append(solution_data)
-            except Exception as e:
-                st.error(f"Error loading {solution_file}: {e}")
-        
-        return sorted(solutions, key=lambda x: x['timestamp'], reverse=True)
+    def get_page(self, sort_by="Newest", page_size=20, cursor=None):
+        """Get one page of solution summaries (no code or transcripts)"""
+        try:
+            return self.store.list_page(order=sort_by.lower(), limit=page_size, cursor=cursor, loader=self.cache)
+        except Exception as e:
+            st.error(f"Error loading solutions: {e}")
+            return [], None
+    
+    def search_solutions(self, query, limit=50, offset=0):
+        """Ranked full-text search over problem, code and explanation"""
+        try:
+            return self.store.search(query, limit=limit, offset=offset, loader=self.cache)
+        except Exception as e:
+            st.error(f"Error searching solutions: {e}")
+            return []
     
     def open_file_explorer(self):
         """Open file explorer to solutions directory"""
@@ -39,19 +56,30 @@ class SolutionBrowser:
     def delete_solution(self, solution_id):
         """Delete a solution"""
         try:
-            json_file = self.solutions_dir / f"{solution_id}.json"
-            py_file = self.solutions_dir / f"{solution_id}.py"
+            self.store.delete(solution_id)
             
-            if json_file.exists():
-                json_file.unlink()
-            if py_file.exists():
-                py_file.unlink()
+            # Legacy per-solution files
+            for suffix in (".json", ".py"):
+                solution_file = self.solutions_dir / f"{solution_id}{suffix}"
+                if solution_file.exists():
+                    solution_file.unlink()
             
             return True
         except Exception as e:
             st.error(f"Error deleting solution: {e}")
             return False
     
+    def clear_all(self):
+        """Delete every solution"""
+        try:
+            self.store.clear()
+            for solution_file in self.solutions_dir.glob("solution_*"):
+                solution_file.unlink()
+            return True
+        except Exception as e:
+            st.error(f"Error clearing solutions: {e}")
+            return False
+    
     def export_solution(self, solution_data, format="zip"):
         """Export solution in different formats"""
         try:
@@ -74,69 +102,149 @@ class SolutionBrowser:
             st.error(f"Error exporting solution: {e}")
             return None
 
+    def export_library(self, ids=None, format="zip"):
+        """Stream all (or the given) solutions into one archive; returns its path (delete it once served)"""
+        progress = st.progress(0.0, text="Exporting solutions...")
+        
+        def report(done, total):
+            progress.progress(min(done / max(total, 1), 1.0), text=f"Exported {done}/{total} solutions")
+        
+        try:
+            suffix = ".zip" if format == "zip" else ".jsonl.gz"
+            return export_library_download(self.store, ids=ids, suffix=suffix, progress=report)
+        except Exception as e:
+            st.error(f"Error exporting library: {e}")
+            return None
+        finally:
+            progress.empty()
+    
+    def import_library(self, uploaded_file, replace=False):
+        """Import an uploaded .zip / .jsonl.gz / .jsonl archive; returns the import counts"""
+        exports_dir = self.solutions_dir / "exports"
+        exports_dir.mkdir(exist_ok=True)
+        upload_path = None
+        progress = st.progress(0.0, text="Importing solutions...")
+        
+        def report(done, total):
+            progress.progress(0.5, text=f"Imported {done} solutions...")
+        
+        try:
+            # The client-supplied name only contributes its suffix, never a path
+            with tempfile.NamedTemporaryFile(
+                dir=exports_dir, prefix=".upload_", suffix=Path(uploaded_file.name).suffix, delete=False
+            ) as f:
+                upload_path = Path(f.name)
+                for chunk in iter(lambda: uploaded_file.read(1 << 20), b''):
+                    f.write(chunk)
+            stats = import_library(self.store, upload_path, replace=replace, progress=report)
+            self.cache.invalidate()
+            return stats
+        except Exception as e:
+            st.error(f"Error importing library: {e}")
+            return None
+        finally:
+            progress.empty()
+            if upload_path is not None:
+                upload_path.unlink(missing_ok=True)
+
+def get_browser_page(browser, search_term, sort_by, page_size):
+    """Fetch the summary rows of the current page, tracking keyset cursors in the session"""
+    query = (search_term, sort_by, page_size)
+    if st.session_state.get('browser_query') != query:
+        st.session_state.browser_query = query
+        st.session_state.browser_page = 0
+        st.session_state.browser_cursors = [None]
+    
+    page = st.session_state.browser_page
+    if search_term:
+        # Search results are ranked, so they are paged by offset
+        results = browser.search_solutions(search_term, limit=page_size + 1, offset=page * page_size)
+        has_next = len(results) > page_size
+        return results[:page_size], has_next
+    
+    rows, next_cursor = browser.get_page(sort_by, page_size, st.session_state.browser_cursors[page])
+    if next_cursor is not None and len(st.session_state.browser_cursors) == page + 1:
+        st.session_state.browser_cursors.append(next_cursor)
+    return rows, next_cursor is not None
+
 def render_file_browser():
     """Render the file browser component"""
     browser = SolutionBrowser()
-    solutions = browser.get_solutions()
     
     st.markdown("### 📁 Solution Browser")
     
-    if not solutions:
+    total = browser.store.count()
+    if total == 0:
         st.info("No solutions found. Solve some problems first!")
+        render_library_transfer(browser, [])
         return
     
     # Search and filter
-    col1, col2 = st.columns([3, 1])
+    col1, col2, col3 = st.columns([3, 1, 1])
     with col1:
-        search_term = st.text_input("🔍 Search solutions:", placeholder="Enter problem description...")
+        search_term = st.text_input("🔍 Search solutions:", placeholder="Search problems, code and explanations...")
     with col2:
         sort_by = st.selectbox("Sort by:", ["Newest", "Oldest", "Problem"])
+    with col3:
+        page_size = st.selectbox("Per page:", [10, 20, 50], index=1)
     
-    # Filter solutions
-    filtered_solutions = solutions
-    if search_term:
-        filtered_solutions = [s for s in solutions if search_term.lower() in s['problem'].lower()]
+    # Only the summary rows of the visible page are loaded; code and
+    # transcripts are fetched when a solution is opened
+    rows, has_next = get_browser_page(browser, search_term.strip(), sort_by, page_size)
+    page = st.session_state.browser_page
     
-    # Sort solutions
-    if sort_by == "Newest":
-        filtered_solutions = sorted(filtered_solutions, key=lambda x: x['timestamp'], reverse=True)
-    elif sort_by == "Oldest":
-        filtered_solutions = sorted(filtered_solutions, key=lambda x: x['timestamp'])
-    elif sort_by == "Problem":
-        filtered_solutions = sorted(filtered_solutions, key=lambda x: x['problem'])
+    if search_term.strip():
+        st.caption(f"Page {page + 1} of matching solutions, best matches first")
+    else:
+        st.caption(f"Page {page + 1} of {max(1, -(-total // page_size))} · {total} solutions")
     
     # Display solutions
-    for i, solution in enumerate(filtered_solutions):
-        with st.expander(f"📄 {solution['problem'][:60]}{'...' if len(solution['problem']) > 60 else ''}", expanded=False):
+    for row in rows:
+        with st.expander(f"📄 {row.problem[:60]}{'...' if len(row.problem) > 60 else ''}", expanded=False):
             col1, col2, col3 = st.columns([2, 1, 1])
             
             with col1:
-                st.write(f"**Created:** {solution['timestamp'][:19]}")
-                st.write(f"**Problem:** {solution['problem']}")
+                st.write(f"**Created:** {row.timestamp[:19]}")
+                st.write(f"**Problem:** {row.problem}")
                 
-                if solution.get('test_results'):
-                    st.write(f"**Test Results:** {len(solution['test_results'])} tests")
+                if row.test_count:
+                    st.write(f"**Test Results:** {row.test_count} tests")
+                
+                for field, snippet in row.snippets.items():
+                    st.markdown(f"🔎 *{field}:* {snippet}")
             
             with col2:
-                if st.button("👁️ View", key=f"view_{solution['id']}"):
-                    st.session_state.current_solution = solution
+                if st.button("👁️ View", key=f"view_{row.id}"):
+                    st.session_state.current_solution = row
                     st.rerun()
                 
-                if st.button("📝 Edit", key=f"edit_{solution['id']}"):
-                    st.session_state.editing_solution = solution
+                if st.button("📝 Edit", key=f"edit_{row.id}"):
+                    st.session_state.editing_solution = row
                     st.rerun()
             
             with col3:
-                if st.button("🗑️ Delete", key=f"delete_{solution['id']}"):
-                    if browser.delete_solution(solution['id']):
+                if st.button("🗑️ Delete", key=f"delete_{row.id}"):
+                    if browser.delete_solution(row.id):
                         st.success("Solution deleted!")
                         st.rerun()
                 
-                if st.button("📦 Export", key=f"export_{solution['id']}"):
-                    zip_path = browser.export_solution(solution)
+                if st.button("📦 Export", key=f"export_{row.id}"):
+                    solution = browser.cache.get(row.id)
+                    zip_path = browser.export_solution(solution) if solution else None
                     if zip_path:
                         st.success(f"Exported to: {zip_path}")
     
+    # Pagination
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Previous", disabled=page == 0, use_container_width=True):
+            st.session_state.browser_page = page - 1
+            st.rerun()
+    with col3:
+        if st.button("Next ➡️", disabled=not has_next, use_container_width=True):
+            st.session_state.browser_page = page + 1
+            st.rerun()
+    
     # Quick actions
     st.markdown("---")
     col1, col2, col3 = st.columns(3)
@@ -147,23 +255,78 @@ def render_file_browser():
     
     with col2:
         if st.button("📊 Statistics", use_container_width=True):
-            show_statistics(solutions)
+            show_statistics(browser.store.get_analytics())
+            archived = browser.store.archive_stats()
+            if archived['archived']:
+                st.caption(f"🗄️ {archived['archived']} older solutions are archived in "
+                           f"{archived['segments']} compressed segment files; they open and search as usual")
     
     with col3:
         if st.button("🧹 Clear All", use_container_width=True):
             if st.session_state.get('confirm_clear_all', False):
-                for solution in solutions:
-                    browser.delete_solution(solution['id'])
+                browser.clear_all()
                 st.success("All solutions cleared!")
                 st.session_state.confirm_clear_all = False
                 st.rerun()
             else:
                 st.session_state.confirm_clear_all = True
                 st.warning("Click again to confirm deletion of all solutions")
+    
+    render_library_transfer(browser, rows)
+
+def discard_library_export():
+    """Delete the session's prepared export archive (after it was downloaded or replaced)"""
+    export = st.session_state.get('library_export')
+    st.session_state.library_export = None
+    if export:
+        Path(export[0]).unlink(missing_ok=True)
+
+def render_library_transfer(browser, rows):
+    """Bulk export of the library (or the visible page) and bulk import"""
+    with st.expander("📦 Export / Import Library", expanded=False):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**Export**")
+            scope = st.radio("Solutions:", ["All solutions", "Current page"], key="export_scope")
+            format = st.radio("Format:", ["zip", "jsonl.gz"], key="export_format", horizontal=True)
+            if st.button("📦 Prepare Export", use_container_width=True):
+                ids = [row.id for row in rows] if scope == "Current page" else None
+                discard_library_export()
+                path = browser.export_library(ids=ids, format=format)
+                # Only the path is kept in the session; the archive stays on disk
+                st.session_state.library_export = (str(path), format) if path else None
+            
+            export = st.session_state.get('library_export')
+            if export and not os.path.exists(export[0]):
+                st.session_state.library_export = export = None
+            if export:
+                path, format = export
+                with open(path, 'rb') as archive:
+                    st.download_button(
+                        "⬇️ Download Archive",
+                        data=archive,
+                        file_name=f"algogenie_library_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}",
+                        mime="application/zip" if format == "zip" else "application/gzip",
+                        on_click=discard_library_export,
+                        use_container_width=True
+                    )
+        
+        with col2:
+            st.markdown("**Import**")
+            uploaded = st.file_uploader("Library archive", type=["zip", "gz", "jsonl"], key="import_archive")
+            replace = st.checkbox("Overwrite solutions with the same id", value=False)
+            if uploaded is not None and st.button("📥 Import", use_container_width=True):
+                stats = browser.import_library(uploaded, replace=replace)
+                if stats:
+                    st.success(
+                        f"Imported {stats['imported']} solutions "
+                        f"({stats['existing']} already present, {stats['duplicates']} duplicates skipped)"
+                    )
 
-def show_statistics(solutions):
-    """Show solution statistics"""
-    if not solutions:
+def show_statistics(analytics):
+    """Show solution statistics from the store's precomputed aggregates"""
+    if not analytics['total_solutions']:
         st.info("No solutions to analyze")
         return
     
@@ -172,38 +335,18 @@ def show_statistics(solutions):
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Solutions", len(solutions))
+        st.metric("Total Solutions", analytics['total_solutions'])
     
     with col2:
-        recent_count = len([s for s in solutions if 
-                          (datetime.now() - datetime.fromisoformat(s['timestamp'])).days <= 7])
-        st.metric("This Week", recent_count)
+        st.metric("This Week", analytics['recent_solutions'])
     
     with col3:
-        avg_code_length = sum(len(s['code'].split('\n')) for s in solutions) / len(solutions)
-        st.metric("Avg Code Lines", f"{avg_code_length:.1f}")
+        st.metric("Avg Code Lines", f"{analytics['avg_code_lines']:.1f}")
     
     with col4:
-        unique_problems = len(set(s['problem'] for s in solutions))
-        st.metric("Unique Problems", unique_problems)
+        st.metric("Unique Problems", analytics['unique_problems'])
     
     # Problem categories
     st.markdown("#### 🏷️ Problem Categories")
-    categories = {}
-    for solution in solutions:
-        problem = solution['problem'].lower()
-        if 'sort' in problem or 'merge' in problem or 'quick' in problem:
-            categories['Sorting'] = categories.get('Sorting', 0) + 1
-        elif 'search' in problem or 'binary' in problem:
-            categories['Searching'] = categories.get('Searching', 0) + 1
-        elif 'tree' in problem or 'binary tree' in problem:
-            categories['Trees'] = categories.get('Trees', 0) + 1
-        elif 'graph' in problem or 'bfs' in problem or 'dfs' in problem:
-            categories['Graphs'] = categories.get('Graphs', 0) + 1
-        elif 'dynamic' in problem or 'dp' in problem:
-            categories['Dynamic Programming'] = categories.get('Dynamic Programming', 0) + 1
-        else:
-            categories['Other'] = categories.get('Other', 0) + 1
-    
-    for category, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
+    for category, count in analytics['categories'].items():
         st.write(f"**{category}:** {count} solutions")
@@ -6,8 +6,12 @@ AlgoGenie Launcher - Choose your interface
 import subprocess
 import sys
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
+# Checked with find_spec so the launcher doesn't pay for importing them
+REQUIRED_MODULES = ['streamlit', 'autogen_agentchat', 'autogen_ext', 'docker', 'dotenv']
+
 def print_banner():
     """Print the AlgoGenie banner"""
     print("""
@@ -23,16 +27,13 @@ def print_banner():
 
 def check_requirements():
     """Check if all requirements are installed"""
-    try:
-        import streamlit
-        import asyncio
-        from team.dsa_team import get_dsa_team_and_docker
-        print("✅ All requirements are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing requirement: {e}")
+    missing = [module for module in REQUIRED_MODULES if find_spec(module) is None]
+    if missing:
+        print(f"❌ Missing requirement: {', '.join(missing)}")
         print("Please run: pip install -r requirements.txt")
         return False
+    print("✅ All requirements are installed")
+    return True
 
 def check_config():
     """Check if configuration is set up"""
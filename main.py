@@ -1,44 +1,123 @@
+import argparse
 import asyncio
+import signal
 import sys
-from team.dsa_team import get_dsa_team_and_docker
+import time
+from team.checkpoint import SolveCheckpoint, list_checkpoints
 from config.docker_utils import start_docker_container, stop_docker_container
-from autogen_agentchat.messages import TextMessage
-from autogen_agentchat.base import TaskResult
+from config.constant import METRICS_SNAPSHOT_FILE
+from monitoring import metrics
 
 
-async def main():
+def install_sigint_handler(cancellation_token):
+    """Make Ctrl+C cancel the running solve instead of killing the process"""
+    loop = asyncio.get_running_loop()
+
+    def request_cancel():
+        if cancellation_token.is_cancelled():
+            return
+        print("\n⚠️  Cancelling solve (aborting model request and sandbox execution)...")
+        cancellation_token.cancel()
+
+    try:
+        loop.add_signal_handler(signal.SIGINT, request_cancel)
+    except (NotImplementedError, RuntimeError):
+        # Windows event loops don't support add_signal_handler
+        signal.signal(signal.SIGINT, lambda signum, frame: loop.call_soon_threadsafe(request_cancel))
+
+
+def find_checkpoint(run_id):
+    """Find the checkpoint to resume: a specific run id or the most recent one"""
+    if run_id != 'latest':
+        return SolveCheckpoint.load(run_id)
+    checkpoints = list_checkpoints()
+    return checkpoints[0] if checkpoints else None
+
+
+async def main(resume=None, metrics_file=METRICS_SNAPSHOT_FILE):
+    # The agent stack is loaded once a solve actually starts, not for --help
+    from autogen_agentchat.base import TaskResult
+    from autogen_agentchat.messages import TextMessage
+    from autogen_core import CancellationToken
+    from team.dsa_team import get_dsa_team_and_docker
+
+    checkpoint = find_checkpoint(resume) if resume else None
+    if resume and checkpoint is None:
+        # Nothing was attempted, so there is no solve to count
+        print("❌ No checkpoint found to resume")
+        sys.exit(1)
+
+    docker = None
+    status = "failed"
+    failure = None
+    started = time.perf_counter()
+    cancellation_token = CancellationToken()
+    install_sigint_handler(cancellation_token)
+
     try:
         print("🚀 Starting AlgoGenie - DSA Problem Solver")
         print("=" * 50)
-        
+
         dsa_team, docker = get_dsa_team_and_docker()
         print("✅ Team and Docker executor initialized")
 
         await start_docker_container(docker)
         print("✅ Docker container started successfully")
-        
-        task = 'Write a Python code to add two numbers.'
-        print(f"📝 Task: {task}")
+
+        if checkpoint is not None:
+            resumed = len(checkpoint.transcript)  # restore() clears the transcript it replays
+            task = await checkpoint.restore(dsa_team)
+            print(f"♻️  Resuming {checkpoint.run_id} after {resumed} messages")
+            print(f"📝 Task: {checkpoint.problem}")
+        else:
+            task = 'Write a Python code to add two numbers.'
+            checkpoint = SolveCheckpoint(task)
+            print(f"📝 Task: {task}")
         print("=" * 50)
 
-        async for message in dsa_team.run_stream(task=task):
+        metrics.solves_started.inc(entrypoint='cli')
+        async for message in dsa_team.run_stream(task=task, cancellation_token=cancellation_token):
+            metrics.record_usage(getattr(message, 'models_usage', None))
             if isinstance(message, TextMessage):
                 print('==' * 20)
                 print(f"{message.source}: {message.content}")
             elif isinstance(message, TaskResult):
                 print('Stop Reason:', message.stop_reason)
-                
-    except KeyboardInterrupt:
+            await checkpoint.update(dsa_team, message)
+
+        # Finished - nothing left to resume
+        checkpoint.delete()
+        status = "cancelled" if cancellation_token.is_cancelled() else "completed"
+
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        status = "cancelled"
         print("\n⚠️  Process interrupted by user")
+        print("♻️  Continue later with: python main.py --resume")
     except Exception as e:
+        failure = e
         print(f"❌ Error: {e}")
         sys.exit(1)
     finally:
-        try:
-            await stop_docker_container(docker)
-            print("✅ Docker container stopped")
-        except Exception as e:
-            print(f"⚠️  Warning: Error stopping Docker container: {e}")
+        if docker is not None:
+            try:
+                await stop_docker_container(docker)
+                print("✅ Docker container stopped")
+            except Exception as e:
+                print(f"⚠️  Warning: Error stopping Docker container: {e}")
+        metrics.record_finished('cli', status, time.perf_counter() - started, failure)
+        if metrics_file:
+            # Batch runs have no scrape endpoint; the snapshot is for the textfile collector
+            metrics.registry.write_snapshot(metrics_file)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="AlgoGenie CLI")
+    parser.add_argument(
+        "--resume", nargs="?", const="latest", metavar="RUN_ID",
+        help="Continue an interrupted solve from its checkpoint (default: the most recent)"
+    )
+    parser.add_argument(
+        "--metrics-file", default=METRICS_SNAPSHOT_FILE,
+        help=f"Where to write the metrics snapshot (default: {METRICS_SNAPSHOT_FILE}, '' to skip)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(resume=args.resume, metrics_file=args.metrics_file))
@@ -0,0 +1,301 @@
+"""
+Prometheus-style operational metrics
+
+A small registry of counters, gauges and histograms with labels, rendered
+in the Prometheus text exposition format (version 0.0.4). The metrics of
+the solve pipeline are defined at the bottom of this module and updated
+by the code paths they describe:
+
+- solves started, finished (by status), running and queued, and their duration
+- model calls and prompt/completion tokens, and model errors
+- container starts and their latency (config/docker_utils.py)
+- sandbox executions by result and their latency, including the blocks the
+  pre-flight check rejected (agents/code_executor_agent.py)
+- solution store operations and their latency (storage/solution_store.py)
+
+They are exposed three ways: GET /metrics on the API server, a standalone
+scrape endpoint for the Streamlit apps (start_http_server, on METRICS_PORT),
+and a snapshot file written by the CLI when a solve ends, in the format of
+node_exporter's textfile collector.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from config.constant import LATENCY_BUCKETS, METRICS_HOST, METRICS_PORT
+from storage.atomic_io import atomic_write_text
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Exception modules that mean the model provider failed, not the pipeline
+MODEL_ERROR_MODULES = ('openai', 'httpx', 'httpcore', 'autogen_ext.models')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} takes labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _samples(self):
+        """(suffix, label values, extra labels, value) rows for rendering"""
+        with self._lock:
+            return [('', key, (), value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.label_names, key, extra)} {_format_value(value)}")
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is computed when scraped"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._functions = {}
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function, **labels):
+        """Compute the value with `function()` at every scrape"""
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = function
+
+    def _collect_functions(self):
+        with self._lock:
+            functions = list(self._functions.items())
+        for key, function in functions:
+            try:
+                value = function()
+            except Exception:
+                continue
+            with self._lock:
+                self._values[key] = value
+
+    def _samples(self):
+        self._collect_functions()
+        return super()._samples()
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets, with their sum and count"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block; also usable as a decorator"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self):
+        rows = []
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                rows.append(('_bucket', key, (('le', _format_value(bound)),), cumulative))
+            rows.append(('_sum', key, (), total))
+            rows.append(('_count', key, (), cumulative))
+        return rows
+
+
+class Registry:
+    """Named metrics of the process; asking twice for a name returns the same metric"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self._get(Histogram, name, help_text, labels, buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+    def write_snapshot(self, path):
+        """Write the exposition text to `path` atomically (textfile collector format)"""
+        return atomic_write_text(path, self.render(), fsync=False)
+
+
+registry = Registry()
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_http_server(port=METRICS_PORT, host=METRICS_HOST):
+    """
+    Serve GET /metrics from a daemon thread, once per process.
+    Returns the server, or None when the port is taken (e.g. by another app process).
+    """
+    global _server
+    # Only processes that serve metrics pay for importing http.server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0].rstrip('/') != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes every few seconds would flood the console
+
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError:
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="algogenie-metrics", daemon=True).start()
+        return _server
+
+
+def is_model_error(error):
+    return type(error).__module__.startswith(MODEL_ERROR_MODULES)
+
+
+# Metrics of the solve pipeline; `entrypoint` is app, api or cli
+solves_started = registry.counter('algogenie_solves_started_total', "Solves started", ('entrypoint',))
+solves_finished = registry.counter(
+    'algogenie_solves_finished_total', "Solves finished, by final status", ('entrypoint', 'status')
+)
+solves_running = registry.gauge('algogenie_solves_running', "Solves in progress", ('entrypoint',))
+solves_queued = registry.gauge('algogenie_solves_queued', "Solves waiting for a free slot", ('entrypoint',))
+solve_seconds = registry.histogram(
+    'algogenie_solve_duration_seconds', "Duration of finished solves", ('entrypoint',),
+    buckets=(5, 10, 20, 30, 60, 90, 120, 180, 300, 600)
+)
+model_calls = registry.counter('algogenie_model_calls_total', "Model completions received")
+model_tokens = registry.counter('algogenie_model_tokens_total', "Tokens used by the model", ('kind',))
+model_errors = registry.counter('algogenie_model_errors_total', "Solves failed by a model error", ('error',))
+container_starts = registry.counter('algogenie_container_starts_total', "Sandbox container starts", ('result',))
+container_start_seconds = registry.histogram(
+    'algogenie_container_start_seconds', "Time to start a sandbox container"
+)
+executions = registry.counter(
+    'algogenie_executions_total', "Code executions, by result (passed, failed, rejected by pre-flight)",
+    ('result',)
+)
+execution_seconds = registry.histogram('algogenie_execution_seconds', "Sandbox execution time")
+store_operation_seconds = registry.histogram(
+    'algogenie_store_operation_seconds', "Solution store operation latency", ('operation',),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+)
+
+
+def record_usage(usage):
+    """Count one model completion from a message's models_usage"""
+    if usage is None:
+        return
+    model_calls.inc()
+    model_tokens.inc(usage.prompt_tokens, kind='prompt')
+    model_tokens.inc(usage.completion_tokens, kind='completion')
+
+
+def record_finished(entrypoint, status, seconds, error=None):
+    solves_finished.inc(entrypoint=entrypoint, status=status)
+    solve_seconds.observe(seconds, entrypoint=entrypoint)
+    if error is not None and is_model_error(error):
+        model_errors.inc(error=type(error).__name__)
+
@@ -0,0 +1,275 @@
+"""
+Span tracing of the solve pipeline
+
+A span is a named, timed step of a solve with attributes (run id, model,
+tokens, exit code, ...). Spans nest through a context variable, so a span
+opened inside another becomes its child, also across the tasks of the
+background loop. Every solve is one trace whose id is its run id.
+
+Finished spans are buffered per trace and appended to TRACE_DIR/<trace>.jsonl
+when the outermost span ends, so tracing costs one file write per top-level
+step. A child that ends after its trace's top-level span (a late record())
+is appended on its own rather than buffered for a flush that never comes.
+With TRACING_ENABLED off, span() and start_span() return a shared no-op
+span and nothing is timed, buffered or written.
+
+Steps that already happened (a model call, known only once its message
+arrives) are added with record().
+
+Usage:
+    python -m monitoring.tracing list
+    python -m monitoring.tracing chrome <trace_id> [--output trace.json]
+
+The Chrome trace opens in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import argparse
+import contextvars
+import json
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from config.constant import TRACE_DIR, TRACING_ENABLED
+
+enabled = TRACING_ENABLED
+
+_current = contextvars.ContextVar('algogenie_span', default=None)
+_buffers = {}
+# Traces whose top-level span has been written, most recent last
+_closed = {}
+CLOSED_TRACES_KEPT = 256
+_lock = threading.Lock()
+
+
+class Span:
+    """A timed step; times are epoch seconds"""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'start', 'end', 'attributes')
+
+    def __init__(self, name, trace_id, parent_id=None, start=None, attributes=None):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time() if start is None else start
+        self.end = None
+        self.attributes = attributes or {}
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def finish(self, end=None):
+        if self.end is not None:
+            return
+        self.end = time.time() if end is None else end
+        _collect(self)
+
+    def to_dict(self):
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.start,
+            'end': self.end,
+            'duration_ms': round((self.end - self.start) * 1000, 3),
+            'attributes': self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Returned while tracing is disabled"""
+
+    __slots__ = ()
+    trace_id = span_id = parent_id = None
+
+    def set(self, **attributes):
+        pass
+
+    def finish(self, end=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _collect(span):
+    with _lock:
+        if span.parent_id is not None and span.trace_id not in _closed:
+            _buffers.setdefault(span.trace_id, []).append(span.to_dict())
+            return
+        buffer = _buffers.pop(span.trace_id, [])
+        buffer.append(span.to_dict())
+        if span.parent_id is None:
+            _closed.pop(span.trace_id, None)
+            _closed[span.trace_id] = True
+            while len(_closed) > CLOSED_TRACES_KEPT:
+                del _closed[next(iter(_closed))]
+    _write(span.trace_id, buffer)
+
+
+def _write(trace_id, records):
+    try:
+        path = Path(TRACE_DIR)
+        path.mkdir(exist_ok=True)
+        with open(path / f"{trace_id}.jsonl", 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(record, default=str) + '\n' for record in records)
+    except OSError:
+        pass  # Tracing must never break a solve
+
+
+def start_span(name, trace_id=None, **attributes):
+    """
+    Start a span without making it current. It is a child of the current
+    span unless trace_id is given, which starts a new top-level span of
+    that trace. End it with finish().
+    """
+    if not enabled:
+        return NOOP_SPAN
+    parent = _current.get()
+    if trace_id is not None or parent is None:
+        return Span(name, trace_id or uuid.uuid4().hex, attributes=attributes)
+    return Span(name, parent.trace_id, parent.span_id, attributes=attributes)
+
+
+@contextmanager
+def activate(span):
+    """Make `span` the parent of the spans opened in this block"""
+    if span is NOOP_SPAN:
+        yield span
+        return
+    token = _current.set(span)
+    try:
+        yield span
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def _traced(span):
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.set(error=type(e).__name__)
+        raise
+    finally:
+        _current.reset(token)
+        span.finish()
+
+
+def span(name, trace_id=None, **attributes):
+    """Context manager timing a block as a child of the current span"""
+    if not enabled:
+        return NOOP_SPAN
+    return _traced(start_span(name, trace_id, **attributes))
+
+
+def record(name, start, end, **attributes):
+    """Add an already finished step as a child of the current span"""
+    if not enabled:
+        return
+    new_span = start_span(name, **attributes)
+    new_span.start = start
+    new_span.finish(end)
+
+
+def current_trace_id():
+    current = _current.get()
+    return current.trace_id if current is not None else None
+
+
+def load_trace(trace_id):
+    """The spans of a trace, ordered by start time"""
+    path = Path(TRACE_DIR) / f"{trace_id}.jsonl"
+    if not path.exists():
+        return []
+    spans = []
+    for line in path.read_text(encoding='utf-8').splitlines():
+        try:
+            spans.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue  # A line cut short by a crash
+    return sorted(spans, key=lambda s: s['start'])
+
+
+def list_traces():
+    """(trace_id, modified time) of the stored traces, newest first"""
+    path = Path(TRACE_DIR)
+    if not path.exists():
+        return []
+    files = sorted(path.glob('*.jsonl'), key=lambda f: f.stat().st_mtime, reverse=True)
+    return [(f.stem, f.stat().st_mtime) for f in files]
+
+
+def depths(spans):
+    """Nesting depth of every span id"""
+    parents = {s['span_id']: s['parent_id'] for s in spans}
+    result = {}
+    for span_id in parents:
+        depth, parent = 0, parents[span_id]
+        while parent in parents and depth < len(parents):
+            depth, parent = depth + 1, parents[parent]
+        result[span_id] = depth
+    return result
+
+
+def to_chrome_trace(spans):
+    """Chrome trace event format: complete ("X") events in microseconds"""
+    return {
+        'traceEvents': [
+            {
+                'name': s['name'],
+                'cat': 'algogenie',
+                'ph': 'X',
+                'ts': s['start'] * 1e6,
+                'dur': (s['end'] - s['start']) * 1e6,
+                'pid': 1,
+                'tid': 1,
+                'args': s['attributes'],
+            }
+            for s in spans
+        ],
+        'displayTimeUnit': 'ms',
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AlgoGenie solve traces")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="List stored traces")
+    chrome = subparsers.add_parser('chrome', help="Export a trace in Chrome trace format")
+    chrome.add_argument('trace_id')
+    chrome.add_argument('--output', help="Output file (default: <trace_id>.trace.json)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for trace_id, modified in list_traces():
+            spans = load_trace(trace_id)
+            total = max((s['end'] for s in spans), default=0) - min((s['start'] for s in spans), default=0)
+            print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(modified))}  {trace_id}  "
+                  f"{len(spans)} spans  {total:.2f}s")
+        return 0
+
+    spans = load_trace(args.trace_id)
+    if not spans:
+        print(f"❌ No trace {args.trace_id} in {TRACE_DIR}/")
+        return 1
+    output = Path(args.output or f"{args.trace_id}.trace.json")
+    output.write_text(json.dumps(to_chrome_trace(spans)), encoding='utf-8')
+    print(f"💾 {len(spans)} spans written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,17 @@
 import streamlit as st
-import json
+import difflib
 from datetime import datetime
 from pathlib import Path
+from storage.solution_store import get_store
+from analysis.complexity import analyze_code
+from analysis.profiler import allocation_rows, code_hash, function_rows, profile_in_sandbox
+from team.background_loop import submit
 
 class SolutionEditor:
     def __init__(self, solutions_dir="solutions"):
         self.solutions_dir = Path(solutions_dir)
         self.solutions_dir.mkdir(exist_ok=True)
+        self.store = get_store(self.solutions_dir)
     
     def render_editor(self, solution_data=None):
         """Render the solution editor"""
@@ -53,7 +58,7 @@ class SolutionEditor:
         )
         
         # Action buttons
-        col1, col2, col3, col4 = st.columns(4)
+        col1, col2, col3, col4, col5 = st.columns(5)
         
         with col1:
             if st.button("💾 Save Changes", type="primary"):
@@ -86,6 +91,125 @@ class SolutionEditor:
                     'explanation': explanation,
                     'test_results': [tc.strip() for tc in test_cases.split('\n') if tc.strip()]
                 })
+        
+        with col5:
+            if st.button("🔬 Profile"):
+                if self.profile_solution(solution_data, code):
+                    st.rerun()
+        
+        self.render_complexity(code)
+        self.render_profile(solution_data, code)
+        self.render_history(solution_data, code)
+    
+    def render_complexity(self, code):
+        """Static complexity estimate and hotspots of the code in the editor"""
+        report = analyze_code(code)
+        
+        with st.expander(f"⏱️ Estimated Complexity: {report.estimate}", expanded=bool(report.hotspots)):
+            if report.error:
+                st.warning(f"Could not analyze the code: {report.error}")
+                return
+            
+            if report.functions:
+                st.table({name: {'estimate': estimate} for name, estimate in report.to_dict()['functions'].items()})
+            
+            if report.hotspots:
+                st.markdown("**Hotspots:**")
+                for hotspot in report.hotspots:
+                    st.markdown(f"- Line {hotspot.line}: {hotspot.message}")
+            else:
+                st.caption("No hotspots found")
+            st.caption("Static estimate from the code structure; it doesn't run the code")
+    
+    def render_profile(self, solution_data, code):
+        """The stored runtime profile as sortable tables of functions and allocation sites"""
+        profile = solution_data.get('profile')
+        if not profile:
+            return
+        
+        if profile['duration_ms'] is None:
+            title = "🔬 Runtime Profile: failed"
+        else:
+            title = f"🔬 Runtime Profile: {profile['duration_ms']:.1f} ms, peak {profile['peak_memory_kb']:.0f} KiB"
+        with st.expander(title, expanded=False):
+            if profile.get('code_hash') != code_hash(code):
+                st.warning("The code changed since this profile was taken - profile again to update it")
+            if profile['error']:
+                st.markdown("**The run failed:**")
+                st.code(profile['error'], language='text')
+            
+            if profile['functions']:
+                st.markdown("**Top functions by cumulative time** (click a column to sort)")
+                st.dataframe(function_rows(profile), use_container_width=True, hide_index=True)
+            if profile['allocations']:
+                st.markdown("**Top allocation sites** (memory still held when the run ended)")
+                st.dataframe(allocation_rows(profile), use_container_width=True, hide_index=True)
+            
+            if profile.get('output'):
+                st.markdown("**Output:**")
+                st.code(profile['output'], language='text')
+            st.caption(f"Profiled {profile['profiled_at'][:19]} with cProfile and tracemalloc in the sandbox")
+    
+    def profile_solution(self, solution_data, code):
+        """Profile the editor's code in the sandbox and store the profile with the solution"""
+        try:
+            with st.spinner("🔬 Profiling in the sandbox..."):
+                profile = submit(profile_in_sandbox(code)).result()
+            
+            # Stored next to the solution without touching its content or history
+            existing = self.store.get(solution_data['id'])
+            if existing is None:
+                st.error("This solution no longer exists")
+                return False
+            existing['profile'] = profile
+            self.store.save(existing)
+            if isinstance(solution_data, dict):
+                solution_data['profile'] = profile
+            return True
+        except Exception as e:
+            st.error(f"Error profiling solution: {e}")
+            return False
+    
+    def render_history(self, solution_data, current_code):
+        """Show earlier revisions, their diff against the editor and a restore action"""
+        history = self.store.list_revisions(solution_data['id'])
+        
+        with st.expander(f"🕘 Version History ({len(history)} revisions)", expanded=False):
+            if not history:
+                st.info("No earlier versions yet - every saved change adds one")
+                return
+            
+            labels = {
+                r['revision']: f"v{r['revision']} · {r['created'][:19]} · +{r['added']}/-{r['removed']} lines"
+                for r in history
+            }
+            revision = st.selectbox("Revision:", list(labels), format_func=labels.get, key="history_revision")
+            content = self.store.get_revision(solution_data['id'], revision)
+            if content is None:
+                st.warning("This revision is no longer available")
+                return
+            
+            diff = difflib.unified_diff(
+                content['code'].splitlines(), current_code.splitlines(),
+                fromfile=f"v{revision}", tofile="editor", lineterm=""
+            )
+            st.markdown("**Changes from this revision to the editor:**")
+            st.code("\n".join(diff) or "No differences", language="diff")
+            
+            with st.expander(f"Code of v{revision}", expanded=False):
+                st.code(content['code'], language='python')
+            
+            if st.button("⏪ Restore This Version", key="history_restore"):
+                # Restoring is itself a new revision, so nothing is lost
+                self.save_solution({
+                    'id': solution_data['id'],
+                    'timestamp': solution_data['timestamp'],
+                    **content
+                })
+                for key in ("edit_problem", "edit_code", "edit_explanation", "edit_test_cases"):
+                    st.session_state.pop(key, None)
+                st.success(f"Restored v{revision}")
+                st.rerun()
     
     def save_solution(self, solution_data):
         """Save solution to file"""
@@ -93,15 +217,11 @@ class SolutionEditor:
             # Update timestamp if content changed
             solution_data['last_modified'] = datetime.now().isoformat()
             
-            # Save JSON
-            json_file = self.solutions_dir / f"{solution_data['id']}.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(solution_data, f, indent=2, ensure_ascii=False)
-            
-            # Save Python file
-            py_file = self.solutions_dir / f"{solution_data['id']}.py"
-            with open(py_file, 'w', encoding='utf-8') as f:
-                f.write(solution_data['code'])
+            # Keep fields the editor doesn't show (e.g. the agent transcript)
+            existing = self.store.get(solution_data['id']) or {}
+            solution_data = {**existing, **solution_data}
+            solution_data.pop('category', None)  # Re-derived from the edited problem
+            self.store.save(solution_data)
             
             return True
         except Exception as e:
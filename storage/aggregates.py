@@ -0,0 +1,208 @@
+"""
+Incrementally maintained analytics aggregates
+
+The analytics views used to recompute totals, weekly counts, average code
+lines, unique problems and categories over every solution on every render.
+These tables are updated inside the same transaction as each save, edit and
+delete, so reading analytics costs a handful of tiny queries regardless of
+library size. rebuild() recomputes everything from the solutions table.
+
+Latency and token usage are kept as log-bucketed histograms (~5% relative
+error), which gives percentiles without storing or sorting raw samples.
+"""
+
+import json
+import math
+from datetime import datetime, timedelta
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats_counters (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS stats_daily (
+    day TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS stats_categories (
+    category TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS stats_problems (
+    problem TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS stats_histograms (
+    metric TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (metric, bucket)
+);
+"""
+
+# Solution metrics tracked as histograms
+HISTOGRAM_METRICS = ('duration_s', 'tokens', 'turns')
+
+BUCKET_BASE = 1.1
+ZERO_BUCKET = -10000
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def bucket_for(value):
+    """Log bucket of a non-negative value"""
+    if value <= 0:
+        return ZERO_BUCKET
+    return math.ceil(math.log(value, BUCKET_BASE))
+
+
+def bucket_value(bucket):
+    """Representative value of a bucket (geometric middle of its range)"""
+    if bucket == ZERO_BUCKET:
+        return 0.0
+    return BUCKET_BASE ** (bucket - 0.5)
+
+
+def solution_stats(row):
+    """
+    The aggregate contribution of one solution.
+    `row` is a solutions table row (or dict with the same keys); None means
+    the solution doesn't exist and contributes nothing.
+    """
+    if row is None:
+        return None
+    metrics = row['metrics']
+    if isinstance(metrics, str):
+        metrics = json.loads(metrics or '{}')
+    return {
+        'day': (row['timestamp'] or '')[:10],
+        'problem': row['problem'],
+        'categories': split_categories(row['category']),
+        'code_lines': row['code_lines'] or 0,
+        'metrics': {name: metrics[name] for name in HISTOGRAM_METRICS
+                    if isinstance(metrics.get(name), (int, float))},
+    }
+
+
+def split_categories(category):
+    return [c for c in (category or 'Other').split(',') if c] or ['Other']
+
+
+def _bump(conn, table, key_column, key, delta):
+    """Add delta to a keyed count; returns the new count"""
+    conn.execute(
+        f"INSERT INTO {table} ({key_column}, count) VALUES (?, ?) "
+        f"ON CONFLICT({key_column}) DO UPDATE SET count = count + excluded.count",
+        (key, delta)
+    )
+    count = conn.execute(f"SELECT count FROM {table} WHERE {key_column} = ?", (key,)).fetchone()[0]
+    if count <= 0:
+        conn.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (key,))
+    return count
+
+
+def _add_counter(conn, name, delta):
+    conn.execute(
+        "INSERT INTO stats_counters (name, value) VALUES (?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+        (name, delta)
+    )
+
+
+def _apply(conn, stats, sign):
+    _add_counter(conn, 'total_solutions', sign)
+    _add_counter(conn, 'total_code_lines', sign * stats['code_lines'])
+
+    _bump(conn, 'stats_daily', 'day', stats['day'], sign)
+    for category in stats['categories']:
+        _bump(conn, 'stats_categories', 'category', category, sign)
+
+    problem_count = _bump(conn, 'stats_problems', 'problem', stats['problem'], sign)
+    if sign > 0 and problem_count == 1:
+        _add_counter(conn, 'unique_problems', 1)
+    elif sign < 0 and problem_count == 0:
+        _add_counter(conn, 'unique_problems', -1)
+
+    for name, value in stats['metrics'].items():
+        conn.execute(
+            "INSERT INTO stats_histograms (metric, bucket, count) VALUES (?, ?, ?) "
+            "ON CONFLICT(metric, bucket) DO UPDATE SET count = count + excluded.count",
+            (name, bucket_for(value), sign)
+        )
+        _add_counter(conn, f'{name}_sum', sign * value)
+        _add_counter(conn, f'{name}_count', sign)
+
+
+def update(conn, old_row, new_row):
+    """Move the aggregates from old_row's contribution to new_row's (either may be None)"""
+    old_stats, new_stats = solution_stats(old_row), solution_stats(new_row)
+    if old_stats == new_stats:
+        return
+    if old_stats is not None:
+        _apply(conn, old_stats, -1)
+    if new_stats is not None:
+        _apply(conn, new_stats, +1)
+    conn.execute("DELETE FROM stats_histograms WHERE count <= 0")
+
+
+def reset(conn):
+    for table in ('stats_counters', 'stats_daily', 'stats_categories', 'stats_problems', 'stats_histograms'):
+        conn.execute(f"DELETE FROM {table}")
+
+
+def rebuild(conn):
+    """Recompute every aggregate from the solutions table"""
+    reset(conn)
+    for row in conn.execute("SELECT timestamp, problem, category, code_lines, metrics FROM solutions"):
+        _apply(conn, solution_stats(row), +1)
+
+
+def read(conn, today=None, recent_days=7):
+    """Snapshot of all aggregates as a plain dict"""
+    counters = {name: value for name, value in conn.execute("SELECT name, value FROM stats_counters")}
+    total = int(counters.get('total_solutions', 0))
+
+    today = today or datetime.now().date()
+    since = (today - timedelta(days=recent_days)).isoformat()
+    recent = conn.execute("SELECT COALESCE(SUM(count), 0) FROM stats_daily WHERE day >= ?", (since,)).fetchone()[0]
+
+    categories = dict(conn.execute("SELECT category, count FROM stats_categories ORDER BY count DESC, category"))
+    daily = dict(conn.execute("SELECT day, count FROM stats_daily ORDER BY day"))
+
+    metrics = {}
+    for name in HISTOGRAM_METRICS:
+        count = counters.get(f'{name}_count', 0)
+        if not count:
+            continue
+        buckets = conn.execute(
+            "SELECT bucket, count FROM stats_histograms WHERE metric = ? ORDER BY bucket", (name,)
+        ).fetchall()
+        metrics[name] = {
+            'count': int(count),
+            'mean': counters.get(f'{name}_sum', 0) / count,
+            **{f'p{p}': percentile(buckets, p) for p in PERCENTILES},
+        }
+
+    return {
+        'total_solutions': total,
+        'recent_solutions': recent,
+        'avg_code_lines': counters.get('total_code_lines', 0) / total if total else 0.0,
+        'unique_problems': int(counters.get('unique_problems', 0)),
+        'categories': categories,
+        'daily': daily,
+        'metrics': metrics,
+    }
+
+
+def percentile(buckets, p):
+    """Approximate p-th percentile from (bucket, count) pairs sorted by bucket"""
+    total = sum(count for _, count in buckets)
+    if not total:
+        return None
+    rank = max(1, math.ceil(total * p / 100))
+    seen = 0
+    for bucket, count in buckets:
+        seen += count
+        if seen >= rank:
+            return bucket_value(bucket)
+    return bucket_value(buckets[-1][0])
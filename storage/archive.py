@@ -0,0 +1,112 @@
+"""
+Tiered archival of old solutions
+
+Solutions older than ARCHIVE_AFTER_DAYS move their heavy content (code,
+explanation, test results, transcript) out of the database into
+append-only segment files under solutions/archive/. Each record is one
+zlib-compressed JSON document; the `archived_content` table is the offset
+index (segment, offset, length). The summary row and the full-text entry
+stay in the database, so archived solutions are still listed, counted and
+searchable, and the store reads their content back from the segment when
+they are opened. Editing an archived solution moves it back to the hot set.
+
+Records of solutions that were edited or deleted after archival stay in
+their segment until compact() rewrites the segments with live records only.
+"""
+
+import json
+import os
+import threading
+import zlib
+from pathlib import Path
+
+from config.constant import ARCHIVE_SEGMENT_BYTES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS archived_content (
+    id TEXT PRIMARY KEY REFERENCES solutions(id) ON DELETE CASCADE,
+    segment INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    archived TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_archived_segment ON archived_content(segment, position);
+"""
+
+SEGMENT_NAME = "segment-{:06d}.seg"
+
+
+def encode_record(content):
+    return zlib.compress(json.dumps(content, ensure_ascii=False, default=str).encode('utf-8'), 9)
+
+
+def decode_record(data):
+    return json.loads(zlib.decompress(data))
+
+
+class SegmentArchive:
+    """Append-only segment files of compressed solution records"""
+
+    def __init__(self, archive_dir, segment_bytes=ARCHIVE_SEGMENT_BYTES):
+        self.archive_dir = Path(archive_dir)
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+
+    def segment_path(self, segment):
+        return self.archive_dir / SEGMENT_NAME.format(segment)
+
+    def segments(self):
+        if not self.archive_dir.exists():
+            return []
+        return sorted(int(path.stem.split('-')[1]) for path in self.archive_dir.glob("segment-*.seg"))
+
+    def append(self, records, start_segment=None):
+        """
+        Append encoded records, rolling over to a new segment when the
+        current one is full. Data is fsynced before returning, so the
+        (segment, position, length) locations can be committed to the index.
+        """
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        locations = []
+        with self._lock:
+            segments = self.segments()
+            segment = start_segment or (segments[-1] if segments else 1)
+            f = open(self.segment_path(segment), 'ab')
+            try:
+                for data in records:
+                    if f.tell() and f.tell() + len(data) > self.segment_bytes:
+                        f.flush()
+                        os.fsync(f.fileno())
+                        f.close()
+                        segment += 1
+                        f = open(self.segment_path(segment), 'ab')
+                    locations.append((segment, f.tell(), len(data)))
+                    f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                f.close()
+        return locations
+
+    def read_raw(self, segment, position, length):
+        with open(self.segment_path(segment), 'rb') as f:
+            f.seek(position)
+            data = f.read(length)
+        if len(data) != length:
+            raise IOError(f"Archive segment {segment} is truncated at offset {position}")
+        return data
+
+    def read(self, segment, position, length):
+        return decode_record(self.read_raw(segment, position, length))
+
+    def total_bytes(self):
+        return sum(self.segment_path(s).stat().st_size for s in self.segments())
+
+    def remove(self, segments):
+        for segment in segments:
+            path = self.segment_path(segment)
+            if path.exists():
+                path.unlink()
+
+    def remove_all(self):
+        self.remove(self.segments())
@@ -0,0 +1,39 @@
+"""
+Crash-safe file writes
+
+Files are written to a temporary file in the same directory and moved into
+place with os.replace(), so readers and crashes only ever see the old or the
+new content, never a partially written file.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def atomic_write_bytes(path, data, fsync=True):
+    """
+    Atomically replace `path` with `data`.
+    With fsync=False the rename is still atomic but the content may be lost
+    on power failure - fine for files that can be regenerated from the store.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return path
+
+
+def atomic_write_text(path, text, fsync=True, encoding='utf-8'):
+    """Atomically replace `path` with `text`"""
+    return atomic_write_bytes(path, text.encode(encoding), fsync=fsync)
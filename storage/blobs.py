@@ -0,0 +1,161 @@
+"""
+Content-addressed blob storage
+
+Generated code and agent transcripts are stored once per distinct content
+in the `blobs` table, keyed by the SHA-256 of the text and zlib-compressed;
+solution_content rows reference them by hash. Re-solving a template that
+produces the same code adds no new blob, so disk use and write volume grow
+with unique content rather than with the number of solves.
+
+Blobs are released as soon as the last row referencing them is rewritten or
+deleted; collect_garbage() sweeps anything left unreferenced (for example
+after editing the database by hand).
+"""
+
+import hashlib
+import json
+import zlib
+
+COMPRESS_LEVEL = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_content_code_hash ON solution_content(code_hash);
+CREATE INDEX IF NOT EXISTS idx_content_messages_hash ON solution_content(messages_hash);
+"""
+
+# Columns of solution_content that reference blobs
+BLOB_COLUMNS = ('code_hash', 'messages_hash')
+
+# FROM clause joining a solution to its content and blobs (no content row
+# when the solution is archived, see storage/archive.py)
+CONTENT_JOIN = """solutions s LEFT JOIN solution_content c ON c.id = s.id
+    LEFT JOIN blobs code_blob ON code_blob.hash = c.code_hash
+    LEFT JOIN blobs messages_blob ON messages_blob.hash = c.messages_hash"""
+
+CODE_COLUMN = "COALESCE(inflate(code_blob.data), '') AS code"
+MESSAGES_COLUMN = "COALESCE(inflate(messages_blob.data), '[]') AS messages"
+CONTENT_COLUMNS = f"{CODE_COLUMN}, c.explanation, c.test_results, {MESSAGES_COLUMN}, c.extra"
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def inflate(data):
+    """SQL function: decompress a blob back to text"""
+    if data is None:
+        return None
+    return zlib.decompress(data).decode('utf-8')
+
+
+def register(conn):
+    conn.create_function('inflate', 1, inflate, deterministic=True)
+
+
+def put(conn, text):
+    """Store text (if new) and return its hash; empty text is stored as NULL"""
+    if not text:
+        return None
+    digest = content_hash(text)
+    if conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone() is None:
+        encoded = text.encode('utf-8')
+        conn.execute(
+            "INSERT OR IGNORE INTO blobs (hash, size, data) VALUES (?, ?, ?)",
+            (digest, len(encoded), zlib.compress(encoded, COMPRESS_LEVEL))
+        )
+    return digest
+
+
+def put_messages(conn, messages):
+    return put(conn, json.dumps(messages, ensure_ascii=False)) if messages else None
+
+
+def release(conn, hashes):
+    """Delete the given blobs if nothing references them any more"""
+    for digest in set(h for h in hashes if h):
+        conn.execute(
+            """
+            DELETE FROM blobs WHERE hash = ?
+              AND NOT EXISTS (SELECT 1 FROM solution_content WHERE code_hash = ?)
+              AND NOT EXISTS (SELECT 1 FROM solution_content WHERE messages_hash = ?)
+            """,
+            (digest, digest, digest)
+        )
+
+
+def references(conn, solution_id):
+    row = conn.execute(
+        "SELECT code_hash, messages_hash FROM solution_content WHERE id = ?", (solution_id,)
+    ).fetchone()
+    return tuple(row) if row else ()
+
+
+def collect_garbage(conn):
+    """Delete every unreferenced blob; returns how many were removed"""
+    cursor = conn.execute(
+        """
+        DELETE FROM blobs WHERE hash NOT IN (
+            SELECT code_hash FROM solution_content WHERE code_hash IS NOT NULL
+            UNION
+            SELECT messages_hash FROM solution_content WHERE messages_hash IS NOT NULL
+        )
+        """
+    )
+    return cursor.rowcount
+
+
+def stats(conn):
+    """Blob count, original and stored sizes, and how many references they serve"""
+    count, size, stored = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+    ).fetchone()
+    refs = conn.execute(
+        "SELECT COUNT(code_hash) + COUNT(messages_hash) FROM solution_content"
+    ).fetchone()[0]
+    return {'blobs': count, 'original_bytes': size, 'stored_bytes': stored, 'references': refs}
+
+
+def migrate_inline_content(conn):
+    """
+    Move code and messages of a pre-blob database out of solution_content.
+    Returns True if the table was migrated.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(solution_content)")}
+    if 'code' not in columns:
+        return False
+
+    conn.execute("ALTER TABLE solution_content RENAME TO solution_content_inline")
+    conn.execute(
+        """
+        CREATE TABLE solution_content (
+            id TEXT PRIMARY KEY REFERENCES solutions(id) ON DELETE CASCADE,
+            code_hash TEXT,
+            explanation TEXT NOT NULL DEFAULT '',
+            test_results TEXT NOT NULL DEFAULT '[]',
+            messages_hash TEXT,
+            extra TEXT NOT NULL DEFAULT '{}'
+        )
+        """
+    )
+    rows = conn.execute(
+        "SELECT id, code, explanation, test_results, messages, extra FROM solution_content_inline"
+    ).fetchall()
+    for solution_id, code, explanation, test_results, messages, extra in rows:
+        conn.execute(
+            """
+            INSERT INTO solution_content (id, code_hash, explanation, test_results, messages_hash, extra)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (solution_id, put(conn, code), explanation, test_results,
+             put(conn, messages) if messages and messages != '[]' else None, extra)
+        )
+    conn.execute("DROP TABLE solution_content_inline")
+    return True
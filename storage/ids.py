@@ -0,0 +1,54 @@
+"""
+Collision-free, time-ordered solution ids
+
+Ids are ULIDs (48-bit millisecond timestamp + 80 random bits, Crockford
+base32) behind the usual "solution_" prefix. They sort by creation time like
+the old solution_%Y%m%d_%H%M%S ids, but two solves finishing in the same
+second - or in different worker processes - no longer collide. Within one
+process, ids generated in the same millisecond are strictly increasing.
+"""
+
+import os
+import threading
+import time
+
+CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ID_PREFIX = "solution_"
+
+_lock = threading.Lock()
+_last_millis = -1
+_last_random = 0
+
+
+def _encode(value, length):
+    chars = []
+    for _ in range(length):
+        chars.append(CROCKFORD_ALPHABET[value & 31])
+        value >>= 5
+    return ''.join(reversed(chars))
+
+
+def new_ulid():
+    """A monotonic ULID string (26 characters)"""
+    global _last_millis, _last_random
+
+    with _lock:
+        millis = time.time_ns() // 1_000_000
+        if millis <= _last_millis:
+            # Same millisecond (or clock stepped back): bump the random part
+            millis = _last_millis
+            random_part = _last_random + 1
+            if random_part >= 1 << 80:
+                millis += 1
+                random_part = int.from_bytes(os.urandom(10), 'big')
+        else:
+            random_part = int.from_bytes(os.urandom(10), 'big')
+
+        _last_millis, _last_random = millis, random_part
+
+    return _encode(millis, 10) + _encode(random_part, 16)
+
+
+def new_solution_id():
+    """Unique id for a new solution, e.g. solution_01J9ZQ3V5E8K7M2N4P6R8T0W2Y"""
+    return ID_PREFIX + new_ulid()
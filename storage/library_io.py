@@ -0,0 +1,285 @@
+"""
+Bulk export and import of the solution library
+
+Solutions are streamed out of the store in batches, serialized as JSON
+lines and gzip-compressed on a thread pool (zlib releases the GIL), with a
+bounded number of batches in flight so memory stays flat however large the
+library is. Two archive layouts are supported, chosen by file name:
+
+- `.zip`: `manifest.json` plus `solutions/part-NNNNN.jsonl.gz` members
+- `.jsonl.gz` / `.jsonl`: one solution per line (concatenated gzip members,
+  readable with zcat) or uncompressed
+
+Import reads either layout back, decompressing zip parts in parallel, and
+skips solutions whose id already exists or whose problem and code are
+identical to one already in the library or earlier in the archive.
+
+Usage:
+    python -m storage.library_io export <archive> [--ids ID ...] [--solutions-dir DIR]
+    python -m storage.library_io import <archive> [--replace] [--solutions-dir DIR]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from config.constant import SOLUTIONS_DIR
+
+ARCHIVE_FORMAT = 'algogenie-library'
+ARCHIVE_VERSION = 1
+EXPORT_BATCH_SIZE = 200
+COMPRESS_LEVEL = 6
+PART_NAME = "solutions/part-{:05d}.jsonl.gz"
+DOWNLOAD_PREFIX = ".download_"
+STALE_DOWNLOAD_SECONDS = 3600  # Prepared downloads nobody fetched are removed after this
+
+
+def _workers(workers):
+    return workers or min(8, os.cpu_count() or 1)
+
+
+def _encode_batch(batch, compress):
+    data = b''.join(
+        json.dumps(solution, ensure_ascii=False, default=str).encode('utf-8') + b'\n'
+        for solution in batch
+    )
+    return gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0) if compress else data
+
+
+def ordered_map(pool, fn, items, window):
+    """pool.map that keeps at most `window` items in flight"""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def solution_fingerprint(problem, code):
+    """Content identity used for import dedup"""
+    normalized = ' '.join((problem or '').split()) + '\0' + (code or '').strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def export_library(store, archive_path, ids=None, workers=None, progress=None):
+    """
+    Stream solutions (all, or only `ids`) into one archive.
+    The archive is written to a temporary file and renamed into place.
+    Returns the number of exported solutions.
+    """
+    archive_path = Path(archive_path)
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    total = len(set(ids)) if ids is not None else store.count()
+    as_zip = archive_path.suffix == '.zip'
+    compress = as_zip or archive_path.suffix == '.gz'
+    workers = _workers(workers)
+
+    batches = []
+
+    def counted(batch_iter):
+        for batch in batch_iter:
+            batches.append(len(batch))
+            yield batch
+
+    # Unique per call, so concurrent exports to the same place don't collide
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{archive_path.name}.", suffix='.tmp', dir=archive_path.parent)
+    tmp_path = Path(tmp_name)
+    exported = 0
+    try:
+        with os.fdopen(fd, 'wb') as f, ThreadPoolExecutor(max_workers=workers) as pool:
+            archive = zipfile.ZipFile(f, 'w', zipfile.ZIP_STORED) if as_zip else None
+            encoded = ordered_map(
+                pool, lambda batch: _encode_batch(batch, compress),
+                counted(store.iter_solutions(ids=ids, batch_size=EXPORT_BATCH_SIZE)),
+                window=workers * 2
+            )
+            for part, data in enumerate(encoded):
+                if archive is not None:
+                    # Parts are already gzip-compressed; storing avoids compressing twice
+                    archive.writestr(PART_NAME.format(part), data)
+                else:
+                    f.write(data)
+                exported += batches[part]
+                if progress:
+                    progress(exported, total)
+
+            if archive is not None:
+                archive.writestr('manifest.json', json.dumps({
+                    'format': ARCHIVE_FORMAT,
+                    'version': ARCHIVE_VERSION,
+                    'exported': datetime.now().isoformat(),
+                    'count': exported,
+                    'parts': len(batches),
+                }, indent=2))
+                archive.close()
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, archive_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    return exported
+
+
+def _remove_stale_downloads(exports_dir):
+    cutoff = time.time() - STALE_DOWNLOAD_SECONDS
+    for path in exports_dir.glob(f"{DOWNLOAD_PREFIX}*"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass  # Removed by another session meanwhile
+
+
+def export_library_download(store, ids=None, suffix='.zip', workers=None, progress=None):
+    """
+    Export into a new file of its own in the exports directory, for download
+    buttons. The caller deletes it once served; ones left behind (a session
+    that never downloaded) are removed by a later export after an hour.
+    """
+    exports_dir = Path(store.db_path).parent / "exports"
+    exports_dir.mkdir(parents=True, exist_ok=True)
+    _remove_stale_downloads(exports_dir)
+    fd, name = tempfile.mkstemp(prefix=DOWNLOAD_PREFIX, suffix=suffix, dir=exports_dir)
+    os.close(fd)
+    path = Path(name)
+    try:
+        export_library(store, path, ids=ids, workers=workers, progress=progress)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def _parse_lines(data):
+    return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+
+def _decode_part(data):
+    return _parse_lines(gzip.decompress(data))
+
+
+def iter_archive(archive_path, workers=None):
+    """Yield batches of solution dicts from any supported archive"""
+    archive_path = Path(archive_path)
+    with open(archive_path, 'rb') as f:
+        magic = f.read(2)
+
+    if magic == b'PK':
+        with zipfile.ZipFile(archive_path) as archive:
+            names = sorted(n for n in archive.namelist() if n.startswith('solutions/') and n.endswith('.jsonl.gz'))
+            if 'manifest.json' in archive.namelist():
+                manifest = json.loads(archive.read('manifest.json'))
+                if manifest.get('format') != ARCHIVE_FORMAT:
+                    raise ValueError(f"{archive_path.name} is not an AlgoGenie library archive")
+            workers = _workers(workers)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                yield from ordered_map(pool, _decode_part, (archive.read(n) for n in names), window=workers * 2)
+        return
+
+    opener = gzip.open if magic == b'\x1f\x8b' else open
+    with opener(archive_path, 'rb') as f:
+        batch = []
+        for line in f:
+            if line.strip():
+                batch.append(json.loads(line))
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def import_library(store, archive_path, replace=False, workers=None, progress=None):
+    """
+    Import an archive into the store.
+    Solutions whose id already exists are skipped (or overwritten with
+    `replace`), and so are solutions with the same problem and code as one
+    already imported. Each batch is committed in one transaction.
+    Returns counts: imported, existing, duplicates, invalid.
+    """
+    stats = {'imported': 0, 'existing': 0, 'duplicates': 0, 'invalid': 0}
+
+    fingerprints = {}
+    for rows in store.iter_problem_code():
+        for solution_id, problem, code in rows:
+            fingerprints[solution_fingerprint(problem, code)] = solution_id
+
+    processed = 0
+    for batch in iter_archive(archive_path, workers=workers):
+        to_save = []
+        for solution in batch:
+            if not isinstance(solution, dict) or not solution.get('id') or not solution.get('problem'):
+                stats['invalid'] += 1
+                continue
+            solution.setdefault('timestamp', datetime.now().isoformat())
+
+            fingerprint = solution_fingerprint(solution['problem'], solution.get('code'))
+            exists = store.get_summary(solution['id']) is not None
+            if exists and not replace:
+                stats['existing'] += 1
+                continue
+            if fingerprints.get(fingerprint, solution['id']) != solution['id']:
+                stats['duplicates'] += 1
+                continue
+
+            fingerprints[fingerprint] = solution['id']
+            to_save.append(solution)
+
+        store.save_many(to_save)
+        stats['imported'] += len(to_save)
+        processed += len(batch)
+        if progress:
+            progress(processed, None)
+
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or import the AlgoGenie solution library")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help="Write solutions to a .zip, .jsonl.gz or .jsonl archive")
+    export_parser.add_argument('archive')
+    export_parser.add_argument('--ids', nargs='+', help="Only these solution ids")
+
+    import_parser = subparsers.add_parser('import', help="Import solutions from an archive")
+    import_parser.add_argument('archive')
+    import_parser.add_argument('--replace', action='store_true', help="Overwrite solutions with the same id")
+
+    for sub in (export_parser, import_parser):
+        sub.add_argument('--solutions-dir', default=SOLUTIONS_DIR)
+        sub.add_argument('--workers', type=int, default=None, help="Compression threads")
+    args = parser.parse_args(argv)
+
+    from storage.solution_store import get_store
+    store = get_store(Path(args.solutions_dir))
+
+    def report(done, total):
+        print(f"\r📦 {done}/{total if total is not None else '?'} solutions", end='', flush=True)
+
+    if args.command == 'export':
+        count = export_library(store, args.archive, ids=args.ids, workers=args.workers, progress=report)
+        print(f"\n✅ Exported {count} solutions to {args.archive}")
+    else:
+        stats = import_library(store, args.archive, replace=args.replace, workers=args.workers, progress=report)
+        print(f"\n✅ Imported {stats['imported']} solutions "
+              f"({stats['existing']} already present, {stats['duplicates']} duplicates, {stats['invalid']} invalid)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
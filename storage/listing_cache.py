@@ -0,0 +1,69 @@
+"""
+Process-wide cache of solution listings
+
+Every Streamlit rerun asks for the same page, count, search results and
+analytics again, even when nothing changed. ListingCache keeps those query
+results (plain rows, never session-bound objects) for all sessions and
+drops them when the store's change token moves: the store bumps it on its
+own saves, edits and deletes, and it also includes the size and mtime of
+the database and WAL files, so commits from other processes (the CLI, the
+API server) are noticed with a stat() instead of a query.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+LISTING_CACHE_SIZE = 256
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, or None if it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ListingCache:
+    """LRU of query results, valid for one change token"""
+
+    def __init__(self, change_token, max_entries=LISTING_CACHE_SIZE):
+        self._change_token = change_token
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._token = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        """Cached result for key, computing (and caching) it on a miss"""
+        token = self._change_token()
+        with self._lock:
+            if token != self._token:
+                self._entries.clear()
+                self._token = token
+            elif key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            # Only keep it if nothing changed while it was being computed
+            if token == self._token:
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._token = None
+
+    def __len__(self):
+        return len(self._entries)
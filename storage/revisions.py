@@ -0,0 +1,225 @@
+"""
+Revision history of edited solutions
+
+Every save that changes a solution's problem, code, explanation or test
+cases appends a revision. A revision is either a snapshot of those fields
+or a delta against the previous revision: the difflib opcodes that turn the
+previous lines into the new ones, with only the inserted lines stored. Any
+revision is rebuilt from the nearest snapshot before it, and delta chains
+are cut by a new snapshot every MAX_REVISION_CHAIN revisions, so
+reconstruction stays cheap. compact() rewrites existing chains to a shorter
+limit and can drop old revisions.
+
+Solutions that were never edited have no rows here; their first edit
+records the original content as revision 1.
+"""
+
+import difflib
+import json
+
+from config.constant import MAX_REVISION_CHAIN
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solution_revisions (
+    solution_id TEXT NOT NULL REFERENCES solutions(id) ON DELETE CASCADE,
+    revision INTEGER NOT NULL,
+    created TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    added INTEGER NOT NULL DEFAULT 0,
+    removed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (solution_id, revision)
+);
+"""
+
+REVISION_FIELDS = ('problem', 'code', 'explanation', 'test_results')
+
+SNAPSHOT = 'snapshot'
+DELTA = 'delta'
+
+
+def content_of(solution):
+    """The versioned fields of a solution dict"""
+    return {
+        'problem': solution.get('problem') or '',
+        'code': solution.get('code') or '',
+        'explanation': solution.get('explanation') or '',
+        'test_results': list(solution.get('test_results') or []),
+    }
+
+
+def _lines(value):
+    return value.splitlines(keepends=True) if isinstance(value, str) else value
+
+
+def _join(lines, like):
+    return ''.join(lines) if isinstance(like, str) else list(lines)
+
+
+def make_delta(old, new):
+    """
+    Per-field edit scripts from old to new content.
+    Returns (delta, added_lines, removed_lines); unchanged fields are omitted.
+    """
+    delta, added, removed = {}, 0, 0
+    for field in REVISION_FIELDS:
+        a, b = old[field], new[field]
+        if a == b:
+            continue
+        a_lines, b_lines = _lines(a), _lines(b)
+        if not all(isinstance(line, str) for line in list(a_lines) + list(b_lines)):
+            # Not line-diffable (structured test results): store the new value
+            delta[field] = {'value': b}
+            continue
+        ops = []
+        matcher = difflib.SequenceMatcher(None, a_lines, b_lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag != 'equal':
+                ops.append([i1, i2, b_lines[j1:j2]])
+                added += j2 - j1
+                removed += i2 - i1
+        delta[field] = {'ops': ops}
+    return delta, added, removed
+
+
+def apply_delta(content, delta):
+    """Apply a make_delta() result to content"""
+    result = dict(content)
+    for field, change in delta.items():
+        if 'value' in change:
+            result[field] = change['value']
+            continue
+        old_lines = _lines(content[field])
+        new_lines, position = [], 0
+        for i1, i2, replacement in change['ops']:
+            new_lines.extend(old_lines[position:i1])
+            new_lines.extend(replacement)
+            position = i2
+        new_lines.extend(old_lines[position:])
+        result[field] = _join(new_lines, content[field])
+    return result
+
+
+def _latest(conn, solution_id):
+    """(latest revision, latest snapshot revision), zeros if there is no history"""
+    row = conn.execute(
+        """
+        SELECT MAX(revision),
+               MAX(CASE WHEN kind = 'snapshot' THEN revision END)
+        FROM solution_revisions WHERE solution_id = ?
+        """,
+        (solution_id,)
+    ).fetchone()
+    return row[0] or 0, row[1] or 0
+
+
+def _insert(conn, solution_id, revision, created, kind, payload, added=0, removed=0):
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO solution_revisions
+            (solution_id, revision, created, kind, payload, added, removed)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (solution_id, revision, created, kind, json.dumps(payload, ensure_ascii=False), added, removed)
+    )
+
+
+def record(conn, solution_id, old_solution, new_solution, created, max_chain=MAX_REVISION_CHAIN):
+    """
+    Append a revision for a save that changed old_solution into
+    new_solution. Returns the new revision number, or None if the
+    versioned fields didn't change.
+    """
+    old, new = content_of(old_solution), content_of(new_solution)
+    if old == new:
+        return None
+
+    latest, snapshot = _latest(conn, solution_id)
+    if latest == 0:
+        original_created = old_solution.get('last_modified') or old_solution.get('timestamp') or created
+        _insert(conn, solution_id, 1, original_created, SNAPSHOT, old)
+        latest = snapshot = 1
+
+    revision = latest + 1
+    delta, added, removed = make_delta(old, new)
+    if revision - snapshot >= max_chain:
+        _insert(conn, solution_id, revision, created, SNAPSHOT, new, added, removed)
+    else:
+        _insert(conn, solution_id, revision, created, DELTA, delta, added, removed)
+    return revision
+
+
+def list_revisions(conn, solution_id):
+    """Revision metadata, newest first"""
+    rows = conn.execute(
+        """
+        SELECT revision, created, kind, added, removed, LENGTH(payload) AS size
+        FROM solution_revisions WHERE solution_id = ?
+        ORDER BY revision DESC
+        """,
+        (solution_id,)
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def reconstruct(conn, solution_id, revision):
+    """Content of one revision, or None if it doesn't exist"""
+    rows = conn.execute(
+        """
+        SELECT revision, kind, payload FROM solution_revisions
+        WHERE solution_id = ? AND revision <= ? AND revision >= (
+            SELECT MAX(revision) FROM solution_revisions
+            WHERE solution_id = ? AND revision <= ? AND kind = 'snapshot'
+        )
+        ORDER BY revision
+        """,
+        (solution_id, revision, solution_id, revision)
+    ).fetchall()
+    if not rows or rows[-1][0] != revision:
+        return None
+
+    content = None
+    for _, kind, payload in rows:
+        payload = json.loads(payload)
+        content = payload if kind == SNAPSHOT else apply_delta(content, payload)
+    return content
+
+
+def compact(conn, solution_id, max_chain=MAX_REVISION_CHAIN, keep_last=None):
+    """
+    Rewrite a solution's history so no delta chain is longer than
+    max_chain, optionally keeping only the newest keep_last revisions.
+    Returns the number of rewritten or dropped revisions.
+    """
+    rows = conn.execute(
+        "SELECT revision, kind, payload FROM solution_revisions WHERE solution_id = ? ORDER BY revision",
+        (solution_id,)
+    ).fetchall()
+    if not rows:
+        return 0
+
+    first_kept = rows[-keep_last][0] if keep_last and len(rows) > keep_last else rows[0][0]
+    changes = 0
+    content, snapshot = None, None
+    for revision, kind, payload in rows:
+        payload = json.loads(payload)
+        content = payload if kind == SNAPSHOT else apply_delta(content, payload)
+
+        if revision < first_kept:
+            conn.execute(
+                "DELETE FROM solution_revisions WHERE solution_id = ? AND revision = ?",
+                (solution_id, revision)
+            )
+            changes += 1
+            continue
+
+        if kind == SNAPSHOT:
+            snapshot = revision
+        elif snapshot is None or revision - snapshot >= max_chain:
+            conn.execute(
+                "UPDATE solution_revisions SET kind = ?, payload = ? WHERE solution_id = ? AND revision = ?",
+                (SNAPSHOT, json.dumps(content, ensure_ascii=False), solution_id, revision)
+            )
+            snapshot = revision
+            changes += 1
+    return changes
@@ -0,0 +1,160 @@
+"""
+Compact in-memory representation of solutions
+
+Listings, analytics and session state only need a handful of small fields,
+so they work with SolutionSummary records. The large fields (code,
+explanation, test results, transcript) are loaded on first access through a
+loader - the store itself or a bounded per-session SolutionCache - so memory
+no longer grows with the size of the library.
+"""
+
+from collections import OrderedDict
+
+from config.constant import SESSION_CACHE_SIZE
+
+SUMMARY_FIELDS = (
+    'id', 'timestamp', 'last_modified', 'problem', 'category',
+    'code_lines', 'test_count', 'message_count'
+)
+LAZY_FIELDS = ('code', 'explanation', 'test_results', 'messages', 'metrics')
+
+
+class SolutionSummary:
+    """
+    Lightweight solution record with lazily loaded heavy fields.
+    Supports dict-style access (solution['code'], solution.get(...)) so it
+    can be passed wherever a solution dict is expected.
+    """
+
+    __slots__ = SUMMARY_FIELDS + ('rank', 'snippets', '_loader')
+
+    def __init__(self, id, timestamp, problem, last_modified=None, category='Other',
+                 code_lines=0, test_count=0, message_count=0, rank=None, snippets=None, loader=None):
+        self.id = id
+        self.timestamp = timestamp
+        self.last_modified = last_modified
+        self.problem = problem
+        self.category = category
+        self.code_lines = code_lines
+        self.test_count = test_count
+        self.message_count = message_count
+        self.rank = rank
+        self.snippets = snippets or {}
+        self._loader = loader
+
+    @classmethod
+    def from_row(cls, row, loader=None):
+        row = dict(row)
+        return cls(
+            row['id'], row['timestamp'], row['problem'],
+            last_modified=row.get('last_modified'),
+            category=row.get('category') or 'Other',
+            code_lines=row.get('code_lines', 0),
+            test_count=row.get('test_count', 0),
+            message_count=row.get('message_count', 0),
+            rank=row.get('rank'),
+            snippets=row.get('snippets'),
+            loader=loader
+        )
+
+    @property
+    def categories(self):
+        """Category labels, best match first"""
+        return [c for c in (self.category or 'Other').split(',') if c]
+
+    def load(self):
+        """The full solution dict, fetched through the loader"""
+        if self._loader is None:
+            raise LookupError(f"Solution {self.id} has no loader for its content")
+        solution = self._loader.get(self.id)
+        if solution is None:
+            raise LookupError(f"Solution {self.id} no longer exists")
+        return solution
+
+    @property
+    def code(self):
+        return self.load().get('code', '')
+
+    @property
+    def explanation(self):
+        return self.load().get('explanation', '')
+
+    @property
+    def test_results(self):
+        return self.load().get('test_results', [])
+
+    @property
+    def messages(self):
+        return self.load().get('messages', [])
+
+    @property
+    def metrics(self):
+        return self.load().get('metrics', {})
+
+    def __getitem__(self, key):
+        if key in SUMMARY_FIELDS or key in ('rank', 'snippets'):
+            return getattr(self, key)
+        if key in LAZY_FIELDS:
+            return getattr(self, key)
+        solution = self.load()
+        if key not in solution:
+            raise KeyError(key)
+        return solution[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except (KeyError, LookupError):
+            return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def to_dict(self):
+        """Summary fields only"""
+        return {field: getattr(self, field) for field in SUMMARY_FIELDS}
+
+    def __repr__(self):
+        return f"SolutionSummary(id={self.id!r}, problem={self.problem[:40]!r})"
+
+
+class SolutionCache:
+    """
+    Bounded LRU cache of full solutions for one session.
+    Any change to the store (a write in this process or a commit by another
+    one) moves its change token, which drops the cached entries so an edit
+    made elsewhere is never served stale.
+    """
+
+    def __init__(self, store, max_entries=SESSION_CACHE_SIZE):
+        self.store = store
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._token = store.change_token()
+
+    def get(self, solution_id):
+        token = self.store.change_token()
+        if self._token != token:
+            self._entries.clear()
+            self._token = token
+
+        solution = self._entries.get(solution_id)
+        if solution is not None:
+            self._entries.move_to_end(solution_id)
+            return solution
+
+        solution = self.store.get(solution_id)
+        if solution is not None:
+            self._entries[solution_id] = solution
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return solution
+
+    def invalidate(self, solution_id=None):
+        if solution_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(solution_id, None)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,868 @@
+"""
+SQLite-backed solution store
+
+Solutions used to live as one JSON file per solution in solutions/, and every
+listing globbed and parsed all of them. The store keeps the small, indexed
+columns (id, timestamp, problem, category, metrics) in the `solutions` table
+and the large fields (code, explanation, test results, message transcript)
+in `solution_content`, so listings and sorting are done by SQLite. Code and
+transcripts are deduplicated into compressed, content-addressed blobs (see
+storage/blobs.py). The content of old solutions can be moved out of the
+database into compressed archive segments (see storage/archive.py).
+An FTS5 index over problem, code and explanation (`solutions_fts`) is
+updated in the same transaction as every save and delete, and so are the
+analytics aggregates (see storage/aggregates.py). Edits append to the
+solution's revision history (see storage/revisions.py).
+
+Usage:
+    python -m storage.solution_store migrate [solutions_dir]
+    python -m storage.solution_store rebuild-stats [solutions_dir]
+    python -m storage.solution_store compact-history [solutions_dir]
+    python -m storage.solution_store gc [solutions_dir]
+    python -m storage.solution_store archive [solutions_dir] [days]
+"""
+
+import json
+import re
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from config.constant import SOLUTIONS_DIR, SOLUTIONS_DB_NAME, ARCHIVE_AFTER_DAYS
+from analysis.classifier import classify_solution
+from monitoring import metrics
+from storage import aggregates, archive, blobs, revisions
+from storage.listing_cache import ListingCache, file_signature
+from storage.solution_model import SolutionSummary
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    last_modified TEXT,
+    problem TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT 'Other',
+    code_lines INTEGER NOT NULL DEFAULT 0,
+    test_count INTEGER NOT NULL DEFAULT 0,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    metrics TEXT NOT NULL DEFAULT '{}'
+);
+DROP INDEX IF EXISTS idx_solutions_timestamp;
+DROP INDEX IF EXISTS idx_solutions_problem;
+CREATE INDEX IF NOT EXISTS idx_solutions_timestamp_id ON solutions(timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_solutions_problem_id ON solutions(problem, id);
+-- category holds every label comma-joined ('Trees,Searching'), which an index
+-- can't serve for one label; categories are counted in stats_categories instead
+DROP INDEX IF EXISTS idx_solutions_category;
+
+-- code_hash / messages_hash reference rows of `blobs`
+CREATE TABLE IF NOT EXISTS solution_content (
+    id TEXT PRIMARY KEY REFERENCES solutions(id) ON DELETE CASCADE,
+    code_hash TEXT,
+    explanation TEXT NOT NULL DEFAULT '',
+    test_results TEXT NOT NULL DEFAULT '[]',
+    messages_hash TEXT,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+
+-- Full-text index; rowid matches solutions.rowid
+CREATE VIRTUAL TABLE IF NOT EXISTS solutions_fts USING fts5(
+    problem, code, explanation,
+    tokenize = "porter unicode61 tokenchars '_'"
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Keys stored in their own columns; anything else round-trips through `extra`
+SUMMARY_FIELDS = ('id', 'timestamp', 'last_modified', 'problem', 'category', 'metrics')
+CONTENT_FIELDS = ('code', 'explanation', 'test_results', 'messages')
+
+# bm25 column weights: a hit in the problem matters more than one in the code
+SEARCH_WEIGHTS = (10.0, 1.0, 3.0)
+SNIPPET_TOKENS = 12
+
+ORDER_BY = {
+    'newest': "s.timestamp DESC, s.id DESC",
+    'oldest': "s.timestamp ASC, s.id ASC",
+    'problem': "s.problem ASC, s.id ASC",
+}
+
+# Keyset pagination: sort column and the comparison that moves past a cursor
+KEYSET = {
+    'newest': ('timestamp', '<'),
+    'oldest': ('timestamp', '>'),
+    'problem': ('problem', '>'),
+}
+
+STATS_COLUMNS = "timestamp, problem, category, code_lines, metrics"
+
+# Full solution rows; archived ones carry their segment location instead of content
+CONTENT_JOIN = blobs.CONTENT_JOIN + "\n    LEFT JOIN archived_content a ON a.id = s.id"
+CONTENT_COLUMNS = blobs.CONTENT_COLUMNS + ", c.id AS content_id, a.segment, a.position, a.length"
+ARCHIVE_COLUMNS = "c.id AS content_id, a.segment, a.position, a.length"
+
+SUMMARY_COLUMNS = "s.id, s.timestamp, s.last_modified, s.problem, s.category, s.code_lines, s.test_count, s.message_count"
+
+
+def build_match_query(query):
+    """Turn free text into an FTS5 query: every term required, prefix matched"""
+    terms = re.findall(r"\w+", query or '')
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+class SolutionStore:
+    """Indexed solution storage on top of a single SQLite database"""
+
+    def __init__(self, db_path=Path(SOLUTIONS_DIR) / SOLUTIONS_DB_NAME):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by every Streamlit session thread, guarded by a lock
+        self._lock = threading.RLock()
+        # Bumped on every write so session caches know to drop stale entries
+        self.generation = 0
+        self._depth = 0
+        # Several worker processes may share the database; wait for their locks
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self.archive = archive.SegmentArchive(self.db_path.parent / "archive")
+        # Pages, counts, searches and analytics shared by all sessions until the data changes
+        self.listings = ListingCache(self.change_token)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        blobs.register(self._conn)
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.executescript(blobs.SCHEMA)
+        with self._conn:
+            blobs.migrate_inline_content(self._conn)
+            self._conn.executescript(blobs.INDEXES)
+            self._conn.executescript(aggregates.SCHEMA)
+            self._conn.executescript(revisions.SCHEMA)
+            self._conn.executescript(archive.SCHEMA)
+        if self.get_meta('fts_indexed') is None:
+            self.rebuild_search_index()
+        if self.get_meta('aggregates_built') is None:
+            self.rebuild_aggregates()
+
+    @contextmanager
+    def transaction(self):
+        """
+        One SQLite transaction; nested uses join the outermost one.
+        Use it (or batch()) to group many saves into a single commit - one
+        WAL fsync instead of one per solution.
+        """
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self
+                finally:
+                    self._depth -= 1
+                return
+
+            self._depth = 1
+            try:
+                with self._conn:
+                    yield self
+            finally:
+                self._depth = 0
+
+    batch = transaction
+
+    def change_token(self):
+        """
+        Value that changes whenever the data may have changed: on this
+        store's own writes (generation) and on commits by other processes,
+        detected from the size and mtime of the database and its WAL file.
+        """
+        return (
+            self.generation,
+            file_signature(self.db_path),
+            file_signature(f"{self.db_path}-wal"),
+        )
+
+    def save_many(self, solutions):
+        """Save many solutions with a single commit"""
+        with self.transaction():
+            for solution_data in solutions:
+                self.save(solution_data)
+        return len(solutions)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @metrics.store_operation_seconds.time(operation='save')
+    def save(self, solution_data):
+        """Insert or replace a solution"""
+        with self.transaction():
+            self._write(solution_data)
+            self.generation += 1
+        return solution_data
+
+    def _write(self, solution_data):
+        code = solution_data.get('code', '') or ''
+        test_results = solution_data.get('test_results') or []
+        messages = solution_data.get('messages') or []
+        extra = {k: v for k, v in solution_data.items()
+                 if k not in SUMMARY_FIELDS and k not in CONTENT_FIELDS}
+        old_stats = self._stats_row(solution_data['id'])
+        old_blobs = ()
+        if old_stats is not None:
+            previous = self._content_row(solution_data['id'])
+            revisions.record(
+                self._conn, solution_data['id'], previous, solution_data,
+                solution_data.get('last_modified') or datetime.now().isoformat()
+            )
+            old_blobs = blobs.references(self._conn, solution_data['id'])
+
+        self._conn.execute(
+            """
+            INSERT INTO solutions (id, timestamp, last_modified, problem, category,
+                                   code_lines, test_count, message_count, metrics)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                timestamp = excluded.timestamp,
+                last_modified = excluded.last_modified,
+                problem = excluded.problem,
+                category = excluded.category,
+                code_lines = excluded.code_lines,
+                test_count = excluded.test_count,
+                message_count = excluded.message_count,
+                metrics = excluded.metrics
+            """,
+            (
+                solution_data['id'],
+                solution_data['timestamp'],
+                solution_data.get('last_modified'),
+                solution_data['problem'],
+                solution_data.get('category') or classify_solution(solution_data['problem'], code),
+                len(code.split('\n')),
+                len(test_results),
+                len(messages),
+                json.dumps(solution_data.get('metrics') or {}),
+            )
+        )
+        self._conn.execute(
+            """
+            INSERT INTO solution_content (id, code_hash, explanation, test_results, messages_hash, extra)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                code_hash = excluded.code_hash,
+                explanation = excluded.explanation,
+                test_results = excluded.test_results,
+                messages_hash = excluded.messages_hash,
+                extra = excluded.extra
+            """,
+            (
+                solution_data['id'],
+                blobs.put(self._conn, code),
+                solution_data.get('explanation', '') or '',
+                json.dumps(test_results, ensure_ascii=False),
+                blobs.put_messages(self._conn, messages),
+                json.dumps(extra, ensure_ascii=False, default=str),
+            )
+        )
+        blobs.release(self._conn, old_blobs)
+        # A rewritten solution is hot again; its archived record becomes garbage
+        self._conn.execute("DELETE FROM archived_content WHERE id = ?", (solution_data['id'],))
+        self._index(solution_data['id'], solution_data['problem'], code, solution_data.get('explanation', '') or '')
+        aggregates.update(self._conn, old_stats, self._stats_row(solution_data['id']))
+
+    def _content_row(self, solution_id):
+        row = self._conn.execute(
+            f"""
+            SELECT s.timestamp, s.last_modified, s.problem, {blobs.CODE_COLUMN}, c.explanation, c.test_results,
+                   {ARCHIVE_COLUMNS}
+            FROM {CONTENT_JOIN}
+            WHERE s.id = ?
+            """,
+            (solution_id,)
+        ).fetchone()
+        content = dict(row)
+        record = self._archived_record(row)
+        if record is not None:
+            content.update(code=record['code'], explanation=record['explanation'], test_results=record['test_results'])
+        else:
+            content['test_results'] = json.loads(content['test_results'] or '[]')
+        return content
+
+    def _archived_record(self, row):
+        """The archived content of a row selected with ARCHIVE_COLUMNS, or None if it is hot"""
+        if row['content_id'] is not None or row['segment'] is None:
+            return None
+        return self.archive.read(row['segment'], row['position'], row['length'])
+
+    def _stats_row(self, solution_id):
+        return self._conn.execute(
+            f"SELECT {STATS_COLUMNS} FROM solutions WHERE id = ?", (solution_id,)
+        ).fetchone()
+
+    def _index(self, solution_id, problem, code, explanation):
+        """Replace the full-text entry of one solution"""
+        rowid = self._conn.execute("SELECT rowid FROM solutions WHERE id = ?", (solution_id,)).fetchone()[0]
+        self._conn.execute("DELETE FROM solutions_fts WHERE rowid = ?", (rowid,))
+        self._conn.execute(
+            "INSERT INTO solutions_fts (rowid, problem, code, explanation) VALUES (?, ?, ?, ?)",
+            (rowid, problem, code, explanation)
+        )
+
+    @metrics.store_operation_seconds.time(operation='get')
+    def get(self, solution_id):
+        """Load one full solution, or None if it doesn't exist"""
+        with self._lock:
+            row = self._conn.execute(
+                f"""
+                SELECT s.*, {CONTENT_COLUMNS}
+                FROM {CONTENT_JOIN}
+                WHERE s.id = ?
+                """,
+                (solution_id,)
+            ).fetchone()
+        return self._row_to_solution(row) if row else None
+
+    def get_summary(self, solution_id, loader=None):
+        """Summary record of one solution, or None if it doesn't exist"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM solutions s WHERE s.id = ?", (solution_id,)
+            ).fetchone()
+        return SolutionSummary.from_row(row, loader if loader is not None else self) if row else None
+
+    @metrics.store_operation_seconds.time(operation='list_page')
+    def list_page(self, order='newest', limit=20, cursor=None, offset=0, loader=None):
+        """
+        One page of lightweight summary rows (no code, explanation or messages).
+
+        Pages are addressed either by `cursor` (keyset pagination: the value
+        returned as next_cursor by the previous page, stable under inserts and
+        cheap at any depth) or by `offset`. Returns (rows, next_cursor) where
+        next_cursor is None on the last page. Rows are SolutionSummary
+        records whose heavy fields load through `loader` (default: the store).
+        """
+        column, comparison = KEYSET[order]
+        where, params = '', []
+        if cursor is not None:
+            where = f"WHERE (s.{column}, s.id) {comparison} (?, ?)"
+            params = list(cursor)
+            offset = 0
+
+        def query():
+            with self._lock:
+                return [dict(row) for row in self._conn.execute(
+                    f"""
+                    SELECT {SUMMARY_COLUMNS}
+                    FROM solutions s
+                    {where}
+                    ORDER BY {ORDER_BY[order]}
+                    LIMIT ? OFFSET ?
+                    """,
+                    params + [limit + 1, offset]
+                )]
+
+        rows = self.listings.get(('page', order, limit, tuple(params), offset), query)
+        rows = [SolutionSummary.from_row(row, loader if loader is not None else self) for row in rows]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (getattr(rows[-1], column), rows[-1].id)
+        return rows, next_cursor
+
+    def list_summaries(self, order='newest', loader=None):
+        """Summary records of every solution, without the large fields"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM solutions s ORDER BY {ORDER_BY[order]}"
+            ).fetchall()
+        return [SolutionSummary.from_row(row, loader if loader is not None else self) for row in rows]
+
+    def count(self):
+        def query():
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+        return self.listings.get(('count',), query)
+
+    def iter_problem_code(self, batch_size=500):
+        """Yield (id, problem, code) rows in batches (reclassification, dedup)"""
+        last_id = ''
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"""
+                    SELECT s.id, s.problem, {blobs.CODE_COLUMN}, {ARCHIVE_COLUMNS}
+                    FROM {CONTENT_JOIN}
+                    WHERE s.id > ? ORDER BY s.id LIMIT ?
+                    """,
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1]['id']
+            batch = []
+            for row in rows:
+                record = self._archived_record(row)
+                batch.append((row['id'], row['problem'], record['code'] if record else row['code']))
+            yield batch
+
+    def iter_solutions(self, ids=None, batch_size=200):
+        """
+        Yield full solutions in batches, in id order, without loading the
+        whole library: every batch is a separate short query, so writers are
+        not blocked for the duration of a long export.
+        """
+        if ids is not None:
+            ids = sorted(set(ids))
+            for start in range(0, len(ids), batch_size):
+                chunk = ids[start:start + batch_size]
+                with self._lock:
+                    rows = self._conn.execute(
+                        f"""
+                        SELECT s.*, {CONTENT_COLUMNS}
+                        FROM {CONTENT_JOIN}
+                        WHERE s.id IN ({', '.join('?' * len(chunk))}) ORDER BY s.id
+                        """,
+                        chunk
+                    ).fetchall()
+                if rows:
+                    yield [self._row_to_solution(row) for row in rows]
+            return
+
+        last_id = ''
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"""
+                    SELECT s.*, {CONTENT_COLUMNS}
+                    FROM {CONTENT_JOIN}
+                    WHERE s.id > ? ORDER BY s.id LIMIT ?
+                    """,
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1]['id']
+            yield [self._row_to_solution(row) for row in rows]
+
+    def set_categories(self, categories):
+        """Update the category of several solutions ({id: category}); returns how many changed"""
+        changed = 0
+        with self.transaction():
+            for solution_id, category in categories.items():
+                old_stats = self._stats_row(solution_id)
+                if old_stats is None or old_stats['category'] == category:
+                    continue
+                self._conn.execute("UPDATE solutions SET category = ? WHERE id = ?", (category, solution_id))
+                aggregates.update(self._conn, old_stats, self._stats_row(solution_id))
+                changed += 1
+            if changed:
+                self.generation += 1
+        return changed
+
+    @metrics.store_operation_seconds.time(operation='delete')
+    def delete(self, solution_id):
+        """Delete a solution; returns True if it existed"""
+        with self.transaction():
+            aggregates.update(self._conn, self._stats_row(solution_id), None)
+            referenced = blobs.references(self._conn, solution_id)
+            self._conn.execute(
+                "DELETE FROM solutions_fts WHERE rowid = (SELECT rowid FROM solutions WHERE id = ?)",
+                (solution_id,)
+            )
+            cursor = self._conn.execute("DELETE FROM solutions WHERE id = ?", (solution_id,))
+            blobs.release(self._conn, referenced)
+            self.generation += 1
+        return cursor.rowcount > 0
+
+    def clear(self):
+        """Delete every solution"""
+        with self.transaction():
+            self._conn.execute("DELETE FROM solutions_fts")
+            self._conn.execute("DELETE FROM solutions")
+            self._conn.execute("DELETE FROM blobs")
+            aggregates.reset(self._conn)
+            self.generation += 1
+        self.archive.remove_all()
+
+    def archive_older_than(self, days=ARCHIVE_AFTER_DAYS, batch_size=200, progress=None):
+        """
+        Move the content of solutions older than `days` into archive
+        segments. Each batch is appended (and fsynced) to the segment files
+        before the database commit that points the index at it, so a crash
+        leaves at worst unreferenced bytes in a segment. Returns the number
+        of archived solutions.
+        """
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        archived = 0
+        while True:
+            with self.transaction():
+                rows = self._conn.execute(
+                    f"""
+                    SELECT s.*, {CONTENT_COLUMNS}
+                    FROM {CONTENT_JOIN}
+                    WHERE s.timestamp < ? AND c.id IS NOT NULL
+                    ORDER BY s.timestamp LIMIT ?
+                    """,
+                    (cutoff, batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+
+                records = []
+                for row in rows:
+                    solution = self._row_to_solution(row)
+                    records.append(archive.encode_record({
+                        'code': solution['code'],
+                        'explanation': solution['explanation'],
+                        'test_results': solution['test_results'],
+                        'messages': solution['messages'],
+                        'extra': json.loads(row['extra'] or '{}'),
+                    }))
+                locations = self.archive.append(records)
+
+                archived_at = datetime.now().isoformat()
+                for row, (segment, position, length) in zip(rows, locations):
+                    referenced = blobs.references(self._conn, row['id'])
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO archived_content (id, segment, position, length, archived) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (row['id'], segment, position, length, archived_at)
+                    )
+                    self._conn.execute("DELETE FROM solution_content WHERE id = ?", (row['id'],))
+                    blobs.release(self._conn, referenced)
+                self.generation += 1
+
+            archived += len(rows)
+            if progress:
+                progress(archived)
+
+        self.set_meta('archived_at', datetime.now().date().isoformat())
+        return archived
+
+    def compact_archive(self):
+        """
+        Rewrite the archive segments with live records only (dropping those
+        of solutions edited or deleted since). Returns the reclaimed bytes.
+        """
+        with self.transaction():
+            old_segments = self.archive.segments()
+            if not old_segments:
+                return 0
+            total = self.archive.total_bytes()
+            live = self._conn.execute(
+                "SELECT id, segment, position, length FROM archived_content ORDER BY segment, position"
+            ).fetchall()
+            if sum(row['length'] for row in live) == total:
+                return 0
+
+            locations = self.archive.append(
+                (self.archive.read_raw(row['segment'], row['position'], row['length']) for row in live),
+                start_segment=old_segments[-1] + 1
+            )
+            for row, (segment, position, length) in zip(live, locations):
+                self._conn.execute(
+                    "UPDATE archived_content SET segment = ?, position = ?, length = ? WHERE id = ?",
+                    (segment, position, length, row['id'])
+                )
+        # Only drop the old segments once the index points at the new ones
+        self.archive.remove(old_segments)
+        return total - self.archive.total_bytes()
+
+    def archive_stats(self):
+        """Archived solution count and segment sizes"""
+        with self._lock:
+            count, live = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM archived_content"
+            ).fetchone()
+        return {
+            'archived': count,
+            'segments': len(self.archive.segments()),
+            'live_bytes': live,
+            'segment_bytes': self.archive.total_bytes(),
+        }
+
+    def collect_garbage(self):
+        """Delete blobs no solution references any more; returns how many were removed"""
+        with self.transaction():
+            return blobs.collect_garbage(self._conn)
+
+    def storage_stats(self):
+        """Blob deduplication figures: blob count, original and stored bytes, references"""
+        with self._lock:
+            return blobs.stats(self._conn)
+
+    @metrics.store_operation_seconds.time(operation='search')
+    def search(self, query, limit=50, offset=0, loader=None):
+        """
+        Ranked full-text search over problem, code and explanation.
+        Every term must match (as a prefix); results are SolutionSummary
+        records ordered by bm25, carrying highlighted snippets per field.
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        rows = self.listings.get(('search', match, limit, offset), lambda: self._search_rows(match, limit, offset))
+        return [SolutionSummary.from_row(row, loader if loader is not None else self) for row in rows]
+
+    def _search_rows(self, match, limit, offset):
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT {SUMMARY_COLUMNS},
+                       bm25(solutions_fts, {', '.join(str(w) for w in SEARCH_WEIGHTS)}) AS rank,
+                       snippet(solutions_fts, 0, '**', '**', '…', {SNIPPET_TOKENS}) AS problem_snippet,
+                       snippet(solutions_fts, 1, '**', '**', '…', {SNIPPET_TOKENS}) AS code_snippet,
+                       snippet(solutions_fts, 2, '**', '**', '…', {SNIPPET_TOKENS}) AS explanation_snippet
+                FROM solutions_fts
+                JOIN solutions s ON s.rowid = solutions_fts.rowid
+                WHERE solutions_fts MATCH ?
+                ORDER BY rank
+                LIMIT ? OFFSET ?
+                """,
+                (match, limit, offset)
+            ).fetchall()
+
+        results = []
+        for row in rows:
+            result = dict(row)
+            # Only keep snippets of fields that actually matched
+            result['snippets'] = {
+                field: row[f'{field}_snippet']
+                for field in ('problem', 'code', 'explanation')
+                if '**' in (row[f'{field}_snippet'] or '')
+            }
+            results.append(result)
+        return results
+
+    def rebuild_search_index(self):
+        """Re-index every solution from scratch"""
+        with self.transaction():
+            self._conn.execute("DELETE FROM solutions_fts")
+            self._conn.execute(
+                f"""
+                INSERT INTO solutions_fts (rowid, problem, code, explanation)
+                SELECT s.rowid, s.problem, {blobs.CODE_COLUMN}, c.explanation
+                FROM {CONTENT_JOIN}
+                WHERE a.id IS NULL
+                """
+            )
+            archived = self._conn.execute(
+                f"SELECT s.rowid, s.problem, {ARCHIVE_COLUMNS} FROM {CONTENT_JOIN} WHERE a.id IS NOT NULL"
+            ).fetchall()
+            for row in archived:
+                record = self._archived_record(row)
+                self._conn.execute(
+                    "INSERT INTO solutions_fts (rowid, problem, code, explanation) VALUES (?, ?, ?, ?)",
+                    (row['rowid'], row['problem'], record['code'], record['explanation'])
+                )
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('fts_indexed', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (datetime.now().isoformat(),)
+            )
+
+    def list_revisions(self, solution_id):
+        """Revision history of a solution, newest first (empty if never edited)"""
+        with self._lock:
+            return revisions.list_revisions(self._conn, solution_id)
+
+    def get_revision(self, solution_id, revision):
+        """Problem, code, explanation and test cases as of one revision"""
+        with self._lock:
+            return revisions.reconstruct(self._conn, solution_id, revision)
+
+    def compact_revisions(self, solution_id=None, max_chain=None, keep_last=None):
+        """Cut long delta chains into snapshots (and optionally drop old revisions)"""
+        with self.transaction():
+            if solution_id is None:
+                ids = [row[0] for row in self._conn.execute("SELECT DISTINCT solution_id FROM solution_revisions")]
+            else:
+                ids = [solution_id]
+            return sum(
+                revisions.compact(self._conn, i, max_chain=max_chain or revisions.MAX_REVISION_CHAIN, keep_last=keep_last)
+                for i in ids
+            )
+
+    def rebuild_aggregates(self):
+        """Recompute the analytics aggregates from scratch"""
+        with self.transaction():
+            aggregates.rebuild(self._conn)
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('aggregates_built', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (datetime.now().isoformat(),)
+            )
+            self.generation += 1
+
+    def get_analytics(self, recent_days=7):
+        """
+        Library-wide analytics read from the incrementally maintained
+        aggregates: totals, recent count, average code lines, unique
+        problems, per-category and per-day counts, and latency/token
+        percentiles. Cost doesn't depend on the number of solutions.
+        The result is shared with other callers; treat it as read-only.
+        """
+        def query():
+            with self._lock:
+                return aggregates.read(self._conn, recent_days=recent_days)
+        # Keyed by date so 'this week' rolls over without a write
+        return self.listings.get(('analytics', recent_days, datetime.now().date()), query)
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else default
+
+    def set_meta(self, key, value):
+        with self.transaction():
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+
+    def _row_to_solution(self, row):
+        record = self._archived_record(row)
+        if record is None:
+            record = {
+                'code': row['code'],
+                'explanation': row['explanation'],
+                'test_results': json.loads(row['test_results'] or '[]'),
+                'messages': json.loads(row['messages'] or '[]'),
+                'extra': json.loads(row['extra'] or '{}'),
+            }
+        solution = dict(record['extra'])
+        solution.update({
+            'id': row['id'],
+            'timestamp': row['timestamp'],
+            'problem': row['problem'],
+            'category': row['category'],
+            'code': record['code'],
+            'explanation': record['explanation'],
+            'test_results': record['test_results'],
+            'messages': record['messages'],
+            'metrics': json.loads(row['metrics'] or '{}'),
+        })
+        if row['last_modified']:
+            solution['last_modified'] = row['last_modified']
+        return solution
+
+    def migrate_from_files(self, solutions_dir=SOLUTIONS_DIR):
+        """
+        One-shot import of the legacy solutions/*.json (+ .py) files.
+        Solutions already in the database are left untouched, so running it
+        again is harmless. Returns the number of imported solutions.
+        """
+        solutions_dir = Path(solutions_dir)
+        imported = 0
+
+        with self.transaction():
+            existing = {row[0] for row in self._conn.execute("SELECT id FROM solutions")}
+            for json_file in sorted(solutions_dir.glob("*.json")):
+                try:
+                    with open(json_file, 'r', encoding='utf-8') as f:
+                        solution_data = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️  Skipping {json_file.name}: {e}")
+                    continue
+
+                if not isinstance(solution_data, dict) or 'problem' not in solution_data:
+                    continue
+
+                solution_data.setdefault('id', json_file.stem)
+                solution_data.setdefault('timestamp', datetime.fromtimestamp(json_file.stat().st_mtime).isoformat())
+                if solution_data['id'] in existing:
+                    continue
+
+                # The .py file is the one users edit by hand, so it wins over the JSON copy
+                py_file = json_file.with_suffix('.py')
+                if py_file.exists():
+                    solution_data['code'] = py_file.read_text(encoding='utf-8')
+
+                self._write(solution_data)
+                existing.add(solution_data['id'])
+                imported += 1
+
+            self.generation += 1
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('json_migrated', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (datetime.now().isoformat(),)
+            )
+
+        return imported
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(solutions_dir=SOLUTIONS_DIR):
+    """
+    Process-wide store for a solutions directory, shared by all sessions.
+    The first time a database is opened, legacy JSON solutions in the
+    directory are migrated automatically, and once a day solutions older
+    than ARCHIVE_AFTER_DAYS are moved to the archive.
+    """
+    db_path = Path(solutions_dir) / SOLUTIONS_DB_NAME
+    key = str(db_path.absolute())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = SolutionStore(db_path)
+            if store.get_meta('json_migrated') is None:
+                store.migrate_from_files(solutions_dir)
+            if ARCHIVE_AFTER_DAYS and store.get_meta('archived_at') != datetime.now().date().isoformat():
+                store.archive_older_than(ARCHIVE_AFTER_DAYS)
+            _stores[key] = store
+    return store
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    commands = ('migrate', 'rebuild-stats', 'compact-history', 'gc', 'archive')
+    if not argv or argv[0] not in commands:
+        print(f"Usage: python -m storage.solution_store {'|'.join(commands)} [solutions_dir] [days]")
+        return 1
+
+    solutions_dir = Path(argv[1]) if len(argv) > 1 else Path(SOLUTIONS_DIR)
+    store = SolutionStore(solutions_dir / SOLUTIONS_DB_NAME)
+    if argv[0] == 'rebuild-stats':
+        store.rebuild_aggregates()
+        print(f"✅ Rebuilt analytics aggregates for {store.count()} solutions")
+        return 0
+    if argv[0] == 'compact-history':
+        changed = store.compact_revisions()
+        print(f"✅ Compacted revision history ({changed} revisions rewritten)")
+        return 0
+    if argv[0] == 'archive':
+        days = int(argv[2]) if len(argv) > 2 else ARCHIVE_AFTER_DAYS
+        archived = store.archive_older_than(days)
+        reclaimed = store.compact_archive()
+        stats = store.archive_stats()
+        print(f"✅ Archived {archived} solutions older than {days} days; "
+              f"{stats['archived']} archived in {stats['segments']} segments "
+              f"({stats['segment_bytes'] / 1024:.0f} KiB, {reclaimed / 1024:.0f} KiB reclaimed)")
+        return 0
+    if argv[0] == 'gc':
+        removed = store.collect_garbage()
+        stats = store.storage_stats()
+        print(f"✅ Removed {removed} unreferenced blobs; {stats['blobs']} blobs serve {stats['references']} references "
+              f"({stats['stored_bytes'] / 1024:.0f} KiB stored for {stats['original_bytes'] / 1024:.0f} KiB of content)")
+        return 0
+
+    imported = store.migrate_from_files(solutions_dir)
+    print(f"✅ Imported {imported} solutions into {store.db_path} ({store.count()} total)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+Process-wide background asyncio loop
+
+Streamlit runs each script rerun on its own thread, and asyncio.run() per
+solve created and closed an event loop every time: the model client's
+connection pool died with it and the script thread was blocked until the
+solve finished. Instead one daemon thread per server process runs a single
+long-lived loop; the apps submit coroutines to it and poll their results,
+so every solve shares the same HTTP connections and the UI stays live.
+"""
+
+import asyncio
+import threading
+
+_loop = None
+_lock = threading.Lock()
+
+
+def _run(loop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def get_background_loop():
+    """The process's background loop, started on first use"""
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=_run, args=(loop,), name="algogenie-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def submit(coro):
+    """Schedule a coroutine on the background loop; returns a concurrent.futures.Future"""
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+
+
+def call_soon(callback, *args):
+    """Run a plain callback on the loop thread (for objects that aren't thread-safe)"""
+    get_background_loop().call_soon_threadsafe(callback, *args)
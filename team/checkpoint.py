@@ -0,0 +1,120 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+from config.constant import CHECKPOINT_DIR
+from storage.atomic_io import atomic_write_text
+
+
+class SolveCheckpoint:
+    """
+    On-disk checkpoint of a single solve.
+    It is rewritten after every team message so an interrupted solve
+    (Streamlit rerun, crash, Ctrl+C) can continue where it stopped.
+    """
+
+    def __init__(self, problem, run_id=None, checkpoint_dir=CHECKPOINT_DIR):
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.run_id = run_id or datetime.now().strftime("run_%Y%m%d_%H%M%S_%f")
+        self.problem = problem
+        self.created = datetime.now().isoformat()
+        self.updated = self.created
+        self.team_state = None
+        self.transcript = []
+        self.solution_data = None
+
+    @property
+    def path(self):
+        return self.checkpoint_dir / f"{self.run_id}.json"
+
+    @classmethod
+    def load(cls, run_id, checkpoint_dir=CHECKPOINT_DIR):
+        """Load a checkpoint by run id, or None if it doesn't exist"""
+        path = Path(checkpoint_dir) / f"{run_id}.json"
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        checkpoint = cls(data['problem'], run_id=data['run_id'], checkpoint_dir=checkpoint_dir)
+        checkpoint.created = data.get('created', checkpoint.created)
+        checkpoint.updated = data.get('updated', checkpoint.updated)
+        checkpoint.team_state = data.get('team_state')
+        checkpoint.transcript = data.get('transcript', [])
+        checkpoint.solution_data = data.get('solution_data')
+        return checkpoint
+
+    def to_dict(self):
+        return {
+            'run_id': self.run_id,
+            'problem': self.problem,
+            'created': self.created,
+            'updated': self.updated,
+            'team_state': self.team_state,
+            'transcript': self.transcript,
+            'solution_data': self.solution_data
+        }
+
+    async def update(self, team, message=None, solution_data=None):
+        """Record the latest message and team state, then write the checkpoint"""
+        if message is not None and isinstance(getattr(message, 'content', None), str):
+            self.transcript.append({'source': message.source, 'content': message.content})
+        if solution_data is not None:
+            self.solution_data = solution_data
+
+        try:
+            self.team_state = await team.save_state()
+        except Exception:
+            # Some autogen versions refuse to save while the team is running;
+            # the transcript is enough to resume in that case
+            pass
+
+        self.updated = datetime.now().isoformat()
+        self.write()
+
+    def write(self):
+        """Write the checkpoint atomically so a crash never leaves a torn file"""
+        atomic_write_text(self.path, json.dumps(self.to_dict(), ensure_ascii=False, default=str))
+
+    async def restore(self, team):
+        """
+        Restore the team from this checkpoint.
+        Returns the task to pass to team.run_stream(): None when the saved
+        team state was loaded (the team simply continues), otherwise the
+        transcript replayed as messages.
+        """
+        if self.team_state:
+            await team.load_state(self.team_state)
+            return None
+
+        if self.transcript:
+            from autogen_agentchat.messages import TextMessage
+
+            # The replayed messages are streamed again and re-recorded by update()
+            messages = [TextMessage(source=m['source'], content=m['content']) for m in self.transcript]
+            self.transcript = []
+            return messages
+
+        return self.problem
+
+    def delete(self):
+        if self.path.exists():
+            self.path.unlink()
+
+
+def list_checkpoints(checkpoint_dir=CHECKPOINT_DIR):
+    """List resumable solves, most recently updated first"""
+    checkpoint_dir = Path(checkpoint_dir)
+    if not checkpoint_dir.exists():
+        return []
+
+    checkpoints = []
+    for path in checkpoint_dir.glob("*.json"):
+        try:
+            checkpoint = SolveCheckpoint.load(path.stem, checkpoint_dir=checkpoint_dir)
+            if checkpoint is not None:
+                checkpoints.append(checkpoint)
+        except (OSError, ValueError, KeyError):
+            continue
+
+    return sorted(checkpoints, key=lambda c: c.updated, reverse=True)
@@ -0,0 +1,293 @@
+"""
+Incremental extraction of code blocks from agent messages
+
+The problem solver sends markdown with one or more fenced blocks per
+message and the code executor answers with the output of running them.
+CodeExtractor consumes that conversation message by message (or, for
+streamed model output, chunk by chunk) with a line-based fence parser that
+never rescans text it has already seen. It records every block with its
+language, links the blocks of each solver message to the executor result
+that followed, and picks the last block that ran successfully as the
+solution.
+
+Fences follow CommonMark: ``` or ~~~ (three or more), indented by at most
+three spaces, closed by the same character at least as many times.
+"""
+
+import ast
+import re
+import textwrap
+
+PYTHON_LANGUAGES = ('python', 'py', 'python3', 'py3')
+SHELL_LANGUAGES = ('sh', 'bash', 'shell')
+
+SOLVER_AGENT = 'DSA_Problem_Solver_Agent'
+EXECUTOR_AGENT = 'CodeExecutorAgent'
+
+FENCE_REGEX = re.compile(r'^ {0,3}(`{3,}|~{3,})(.*)$')
+EXIT_CODE_REGEX = re.compile(r'exit code:?\s*(-?\d+)', re.IGNORECASE)
+FAILURE_MARKERS = ('Traceback (most recent call last)', 'No code blocks found')
+
+
+def is_python_block(language, code):
+    if language in PYTHON_LANGUAGES:
+        return True
+    if language or not code.strip():
+        return False
+    # Unlabeled fences count as python when they parse as python
+    try:
+        ast.parse(code)
+    except (SyntaxError, ValueError):
+        return False
+    return True
+
+
+class CodeBlock:
+    """One fenced block of a message"""
+
+    __slots__ = ('index', 'message_index', 'source', 'language', 'code', 'closed', 'is_python', 'result')
+
+    def __init__(self, index, message_index, source, language, code='', closed=False):
+        self.index = index
+        self.message_index = message_index
+        self.source = source
+        self.language = language
+        self.code = code
+        self.closed = closed
+        self.is_python = is_python_block(language, code)
+        self.result = None
+
+    @property
+    def passed(self):
+        return self.result is not None and self.result.passed
+
+    def to_dict(self):
+        return {
+            'index': self.index,
+            'message_index': self.message_index,
+            'language': self.language,
+            'code': self.code,
+            'passed': self.result.passed if self.result is not None else None,
+            'exit_code': self.result.exit_code if self.result is not None else None,
+        }
+
+
+class ExecutionResult:
+    """What the code executor reported for a message's blocks"""
+
+    __slots__ = ('message_index', 'output', 'exit_code')
+
+    def __init__(self, message_index, output):
+        self.message_index = message_index
+        self.output = output
+        match = EXIT_CODE_REGEX.search(output)
+        self.exit_code = int(match.group(1)) if match else None
+
+    @property
+    def passed(self):
+        if self.exit_code is not None:
+            return self.exit_code == 0
+        return not any(marker in self.output for marker in FAILURE_MARKERS)
+
+
+class FenceParser:
+    """
+    Line-based incremental parser of fenced code blocks.
+    feed() accepts arbitrary chunks; only complete lines are parsed and the
+    trailing partial line is kept for the next chunk. end() flushes it and
+    closes a block left open at the end of the message.
+    """
+
+    def __init__(self, on_block):
+        self.on_block = on_block
+        self._pending = ''
+        self._fence = None
+        self._language = None
+        self._lines = []
+
+    @property
+    def in_block(self):
+        return self._fence is not None
+
+    def feed(self, chunk):
+        text = self._pending + chunk
+        start = 0
+        while True:
+            end = text.find('\n', start)
+            if end < 0:
+                break
+            self._line(text[start:end])
+            start = end + 1
+        self._pending = text[start:]
+
+    def end(self):
+        if self._pending:
+            self._line(self._pending)
+            self._pending = ''
+        if self._fence is not None:
+            self._emit(closed=False)
+
+    def _line(self, line):
+        line = line.rstrip('\r')
+        match = FENCE_REGEX.match(line)
+        if self._fence is None:
+            if match is None:
+                return
+            fence, info = match.groups()
+            if fence[0] == '`' and '`' in info:
+                return  # Inline code span, not a fence
+            self._fence = fence
+            self._language = info.strip().split(' ')[0].lower() if info.strip() else ''
+            self._lines = []
+        elif (match is not None and not match.group(2).strip()
+              and match.group(1)[0] == self._fence[0] and len(match.group(1)) >= len(self._fence)):
+            self._emit(closed=True)
+        else:
+            self._lines.append(line)
+
+    def _emit(self, closed):
+        self.on_block(self._language, '\n'.join(self._lines), closed)
+        self._fence = None
+        self._language = None
+        self._lines = []
+
+
+def _opens_for_writing(node):
+    """Whether `node` is an open(path, 'w'/'a'/'x') call"""
+    if not (isinstance(node, ast.Call) and getattr(node.func, 'id', None) == 'open'):
+        return False
+    mode = node.args[1] if len(node.args) > 1 else next(
+        (keyword.value for keyword in node.keywords if keyword.arg == 'mode'), None
+    )
+    return isinstance(mode, ast.Constant) and isinstance(mode.value, str) and any(c in mode.value for c in 'wax')
+
+
+def _written_names(tree):
+    """Names passed to .write() of a file opened for writing"""
+    handles = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.With, ast.AsyncWith)):
+            handles.update(
+                item.optional_vars.id for item in node.items
+                if _opens_for_writing(item.context_expr) and isinstance(item.optional_vars, ast.Name)
+            )
+        elif isinstance(node, ast.Assign) and _opens_for_writing(node.value):
+            handles.update(target.id for target in node.targets if isinstance(target, ast.Name))
+
+    written = set()
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr == 'write' and len(node.args) == 1 and isinstance(node.args[0], ast.Name)):
+            continue
+        target = node.func.value
+        if isinstance(target, ast.Name) and target.id in handles or _opens_for_writing(target):
+            written.add(node.args[0].id)
+    return written
+
+
+def unwrap_saved_code(code):
+    """
+    The solver is told to finish by saving its code with a block like
+    `code = '''...'''` followed by `open('solution.py', 'w')`. For such a
+    block return the saved source instead of the wrapper: the string
+    assigned at top level to a variable that is then written to a file
+    opened for writing. Any other block is returned unchanged.
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return code
+
+    written = _written_names(tree)
+    if not written:
+        return code
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and node.targets[0].id in written
+                and isinstance(node.value, ast.Constant)
+                and isinstance(node.value.value, str) and node.value.value.strip()):
+            return textwrap.dedent(node.value.value).strip()
+    return code
+
+
+class CodeExtractor:
+    """
+    Tracks the code blocks of a solve and the execution results they
+    produced. Feed it complete messages with add_message(), or stream a
+    message with begin_message() / feed() / end_message().
+    """
+
+    def __init__(self, solver=SOLVER_AGENT, executor=EXECUTOR_AGENT):
+        self.solver = solver
+        self.executor = executor
+        self.blocks = []
+        self.results = []
+        self._message_index = -1
+        self._source = None
+        self._parser = None
+        self._executor_output = None
+        # Blocks of the latest solver message still waiting for the executor
+        self._awaiting = []
+
+    def begin_message(self, source):
+        self._message_index += 1
+        self._source = source or ''
+        if self.solver in self._source:
+            self._awaiting = []
+            self._parser = FenceParser(self._add_block)
+        elif self.executor in self._source:
+            self._executor_output = []
+
+    def feed(self, chunk):
+        if self._parser is not None:
+            self._parser.feed(chunk)
+        elif self._executor_output is not None:
+            self._executor_output.append(chunk)
+
+    def end_message(self):
+        if self._parser is not None:
+            self._parser.end()
+            self._parser = None
+        elif self._executor_output is not None:
+            self._link(''.join(self._executor_output))
+            self._executor_output = None
+
+    def add_message(self, source, content):
+        """Consume one complete message; returns the blocks it contained"""
+        count = len(self.blocks)
+        self.begin_message(source)
+        self.feed(content if isinstance(content, str) else str(content or ''))
+        self.end_message()
+        return self.blocks[count:]
+
+    def _add_block(self, language, code, closed):
+        block = CodeBlock(len(self.blocks), self._message_index, self._source, language, code, closed)
+        self.blocks.append(block)
+        if block.language in PYTHON_LANGUAGES + SHELL_LANGUAGES or block.is_python:
+            self._awaiting.append(block)
+
+    def _link(self, output):
+        result = ExecutionResult(self._message_index, output)
+        self.results.append(result)
+        # The executor runs every block of the previous solver message together
+        for block in self._awaiting:
+            block.result = result
+        self._awaiting = []
+
+    def python_blocks(self):
+        return [block for block in self.blocks if block.is_python]
+
+    def solution_block(self):
+        """
+        The last python block that ran successfully, or the last python
+        block at all when nothing has passed (yet).
+        """
+        python_blocks = self.python_blocks()
+        for block in reversed(python_blocks):
+            if block.passed:
+                return block
+        return python_blocks[-1] if python_blocks else None
+
+    def solution_code(self):
+        block = self.solution_block()
+        return unwrap_saved_code(block.code).strip() if block is not None else ''
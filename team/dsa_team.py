@@ -5,10 +5,10 @@ from autogen_agentchat.conditions import TextMentionTermination
 
 from config.constant import TEXT_MENTION,MAX_TURNS
 
-def get_dsa_team_and_docker():
+def get_dsa_team_and_docker(executor=None, model_client=None):
 
-    problem_solver_agent = get_problem_solver_agent()
-    code_executor_agent, docker = get_code_executor_agent()
+    problem_solver_agent = get_problem_solver_agent(model_client)
+    code_executor_agent, docker = get_code_executor_agent(executor)
 
     termination_condition = TextMentionTermination(TEXT_MENTION)
 
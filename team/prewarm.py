@@ -0,0 +1,222 @@
+"""
+Opt-in prewarming of the sandbox and the model connection
+
+The first solve after a server start pays, one after the other, for
+loading the agent stack, resolving (or pulling) the executor image,
+creating the sandbox container and the DNS/TLS handshake with the model
+provider. start_prewarm() does all of that ahead of time on the background
+loop, with the image/container chain and the model connection in parallel:
+
+- image: make sure DOCKER_IMAGE is present locally, pulling it if needed
+- containers: start WARM_CONTAINERS executors; solves take one
+  (take_warm_executor) and the pool is topped up in the background
+- model: create the shared model client, send a one-token health
+  completion and keep its HTTP connection open with light periodic requests
+  until the first solve uses it or PREWARM_KEEPALIVE_IDLE seconds pass, so
+  an idle server doesn't keep making paid requests
+
+It runs when PREWARM_ON_START is set, or from the sidebar button; status()
+feeds the sidebar readiness indicator. Warm containers nobody took are
+stopped when the process exits.
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+from collections import deque
+
+from config.constant import (
+    DOCKER_IMAGE, PREWARM_KEEPALIVE, PREWARM_KEEPALIVE_IDLE, PREWARM_SHUTDOWN_TIMEOUT, WARM_CONTAINERS
+)
+from team.background_loop import call_soon, submit
+
+PENDING = 'pending'
+READY = 'ready'
+FAILED = 'failed'
+
+STEPS = ('image', 'containers', 'model')
+
+_lock = threading.Lock()
+_started = False
+_steps = {}
+_warm = deque()
+_filling = 0
+_closing = False
+_keepalive_task = None
+
+
+def _set(step, state, detail=''):
+    with _lock:
+        _steps[step] = (state, detail)
+
+
+def status():
+    """Readiness of every step, as {step: (state, detail)} under 'steps'"""
+    with _lock:
+        steps = dict(_steps)
+        warm = len(_warm)
+    return {
+        'started': _started,
+        'ready': _started and all(steps.get(step, (PENDING,))[0] == READY for step in STEPS),
+        # Nothing left pending, whether it worked or not
+        'settled': _started and all(state != PENDING for state, _ in steps.values()),
+        'steps': steps,
+        'warm_containers': warm,
+    }
+
+
+def _ensure_image():
+    import docker
+    client = docker.from_env()
+    try:
+        client.images.get(DOCKER_IMAGE)
+        return "present"
+    except docker.errors.ImageNotFound:
+        client.images.pull(DOCKER_IMAGE)
+        return "pulled"
+
+
+async def _fill_pool():
+    """Start executors until WARM_CONTAINERS are ready (or being started)"""
+    global _filling
+    from config.docker_utils import start_docker_container
+    from config.docker_executor import get_docker_executor
+
+    while True:
+        with _lock:
+            if len(_warm) + _filling >= WARM_CONTAINERS:
+                return
+            _filling += 1
+        try:
+            executor = get_docker_executor()
+            await start_docker_container(executor)
+            with _lock:
+                closing = _closing
+                if not closing:
+                    _warm.append(executor)
+            if closing:
+                await executor.stop()
+                return
+        finally:
+            with _lock:
+                _filling -= 1
+
+
+def take_warm_executor():
+    """A started executor from the pool, or None; the pool refills in the background"""
+    with _lock:
+        executor = _warm.popleft() if _warm else None
+        closing = _closing
+    if executor is not None and not closing:
+        submit(_refill())
+    return executor
+
+
+async def _refill():
+    try:
+        await _fill_pool()
+    except Exception as e:
+        _set('containers', FAILED, str(e))
+
+
+async def _keepalive(client):
+    # The OpenAI SDK client inside autogen's model client; a models listing
+    # is the cheapest request that keeps the pooled connection in use
+    openai_client = getattr(client, '_client', None)
+    if openai_client is None or not PREWARM_KEEPALIVE:
+        return
+    deadline = time.monotonic() + (PREWARM_KEEPALIVE_IDLE or 0)
+    while time.monotonic() + PREWARM_KEEPALIVE <= deadline:
+        await asyncio.sleep(PREWARM_KEEPALIVE)
+        try:
+            await openai_client.models.list()
+        except Exception:
+            pass
+
+
+def _cancel_keepalive():
+    global _keepalive_task
+    if _keepalive_task is not None:
+        _keepalive_task.cancel()
+        _keepalive_task = None
+
+
+def stop_keepalive():
+    """Stop the keep-alive requests, e.g. because a solve now uses the connection"""
+    if _keepalive_task is not None:
+        call_soon(_cancel_keepalive)
+
+
+async def _warm_model():
+    from autogen_core.models import UserMessage
+    from agents.problem_solver import get_shared_model_client
+
+    client = get_shared_model_client()
+    await client.create(
+        [UserMessage(content="Reply with OK.", source="user")],
+        extra_create_args={'max_tokens': 1}
+    )
+    global _keepalive_task
+    _keepalive_task = asyncio.get_running_loop().create_task(_keepalive(client))
+
+
+async def _warm_sandbox():
+    started = time.perf_counter()
+    try:
+        result = await asyncio.to_thread(_ensure_image)
+        _set('image', READY, f"{DOCKER_IMAGE} {result}")
+    except Exception as e:
+        _set('image', FAILED, str(e))
+        _set('containers', FAILED, "image unavailable")
+        return
+    try:
+        await _fill_pool()
+        _set('containers', READY, f"{WARM_CONTAINERS} warm in {time.perf_counter() - started:.1f}s")
+    except Exception as e:
+        _set('containers', FAILED, str(e))
+
+
+async def _warm_model_step():
+    started = time.perf_counter()
+    try:
+        await _warm_model()
+        _set('model', READY, f"connected in {time.perf_counter() - started:.1f}s")
+    except Exception as e:
+        _set('model', FAILED, str(e))
+
+
+async def prewarm():
+    await asyncio.gather(_warm_sandbox(), _warm_model_step())
+
+
+async def _stop_executors(executors):
+    _cancel_keepalive()
+    await asyncio.gather(*(executor.stop() for executor in executors), return_exceptions=True)
+
+
+def shutdown():
+    """Stop the keep-alive and the warm containers nobody took (registered with atexit)"""
+    global _closing
+    with _lock:
+        _closing = True
+        executors = list(_warm)
+        _warm.clear()
+    try:
+        submit(_stop_executors(executors)).result(timeout=PREWARM_SHUTDOWN_TIMEOUT)
+    except Exception:
+        pass  # Exiting anyway; don't hold up the shutdown
+
+
+def start_prewarm():
+    """Start prewarming once per process; returns False if it already ran"""
+    global _started
+    with _lock:
+        if _started:
+            return False
+        _started = True
+        for step in STEPS:
+            _steps[step] = (PENDING, '')
+    atexit.register(shutdown)
+    submit(prewarm())
+    return True
@@ -0,0 +1,304 @@
+"""
+Solves running on the background event loop
+
+start_solve() builds the team, submits the solve to the process-wide loop
+(team/background_loop.py) and returns a SolveRun right away. The coroutine
+records every agent message, the extracted code and the metrics on the
+SolveRun; the Streamlit apps keep only its run id in session state and
+redraw it from a polling fragment, then collect the result when it's done.
+Runs live in a process-wide registry, so a rerun, a second tab or a
+navigation away never interrupts a solve; cancelling is explicit.
+
+The agent stack (autogen, the model client, the Docker executor) is only
+imported by start_solve(), so pages that never solve don't load it.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+from analysis.profiler import profile_in_sandbox
+from config.constant import FINISHED_RUNS_KEPT, MODEL, PROFILE_AFTER_SOLVE
+from config.docker_utils import start_docker_container, stop_docker_container
+from monitoring import metrics, tracing
+from team.background_loop import call_soon, submit
+from team.code_extractor import CodeExtractor, ExecutionResult, EXECUTOR_AGENT, SOLVER_AGENT
+
+TERMINAL_STATES = ("completed", "failed", "cancelled")
+
+AGENT_LABELS = ((SOLVER_AGENT, 'Problem Solver'), (EXECUTOR_AGENT, 'Code Executor'))
+
+_runs = {}
+_runs_lock = threading.Lock()
+
+
+def agent_label(source):
+    for name, label in AGENT_LABELS:
+        if name in source:
+            return label
+    return 'User' if 'user' in source.lower() else source
+
+
+class SolveRun:
+    """State of one solve, written by the loop thread and read by the UI"""
+
+    def __init__(self, problem, checkpoint=None, resume=False):
+        self.run_id = checkpoint.run_id if checkpoint is not None else f"solve_{time.time_ns()}"
+        self.problem = problem
+        self.checkpoint = checkpoint
+        self.resume = resume
+        self.status = "starting"
+        self.error = None
+        self.stop_reason = None
+        self.started = time.time()
+        self.finished = None
+        self.message_count = 0
+        self.resumed_messages = 0
+        # Set when the sandbox came from the prewarmed pool (already started)
+        self.warm = False
+        # Everything shown in the conversation, including user messages
+        self.transcript = []
+        self.solution_data = {
+            'problem': problem,
+            'code': '',
+            'explanation': '',
+            'test_results': [],
+            'messages': []
+        }
+        from autogen_core import CancellationToken
+        self.cancellation_token = CancellationToken()
+        self.future = None
+        # Set by run() on the loop thread; until then nothing is running to cancel
+        self._started = False
+        self._task = None
+        self._stopping = False
+        self._collected = False
+        # Root span of the solve's trace (the no-op span while tracing is off)
+        self.trace = tracing.start_span('solve', trace_id=self.run_id, model=MODEL, resume=resume)
+
+    @property
+    def done(self):
+        return self.status in TERMINAL_STATES
+
+    @property
+    def progress(self):
+        if self.done:
+            return 100
+        return min(40 + self.message_count * 3, 90) if self.status == "running" else 20
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.time()) - self.started
+
+    def cancel(self):
+        """
+        Abort the model request and sandbox run, then the coroutine itself.
+        The run only becomes "cancelled" once run() has stopped the container.
+        """
+        if self.done:
+            return
+        call_soon(self._cancel_on_loop)
+
+    def _cancel_on_loop(self):
+        self.cancellation_token.cancel()
+        # Interrupts the steps that don't watch the token (container start,
+        # checkpoint restore); a run that is already cleaning up is left alone
+        if self._task is not None and not self._stopping:
+            self._task.cancel()
+
+    def collect(self):
+        """
+        Hand the finished run to exactly one caller (the session that started
+        it) and forget it. Returns None if it isn't finished or was collected.
+        """
+        with _runs_lock:
+            if not self.done or self._collected:
+                return None
+            self._collected = True
+            _runs.pop(self.run_id, None)
+        return self
+
+    def _future_done(self, future):
+        # run() finishes every run it started; this only covers a coroutine
+        # that never got to run (e.g. the loop went away before scheduling it)
+        if self._started or self.done:
+            return
+        if future.cancelled() or future.exception() is not None:
+            self.status = "cancelled" if future.cancelled() else "failed"
+            self.finished = time.time()
+            self.trace.set(status=self.status)
+            self.trace.finish()
+
+    def _record(self, message):
+        source, content = message.source, message.content
+        label = agent_label(source)
+        entry = {'agent': label, 'content': content, 'timestamp': datetime.now().isoformat()}
+        self.transcript.append(entry)
+        if label in ('Problem Solver', 'Code Executor'):
+            self.solution_data['messages'].append(entry)
+
+    def _trace_message(self, message, since, usage):
+        """Span for the model call or sandbox run that produced this message"""
+        now = time.time()
+        if SOLVER_AGENT in message.source:
+            attributes = {'model': MODEL}
+            if usage is not None:
+                attributes.update(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+            tracing.record('model.call', since, now, **attributes)
+        elif EXECUTOR_AGENT in message.source:
+            tracing.record('sandbox.execute', since, now,
+                           exit_code=ExecutionResult(self.message_count, message.content).exit_code)
+
+    async def run(self, team, docker):
+        from autogen_agentchat.base import TaskResult
+        from autogen_agentchat.messages import TextMessage
+
+        self._started = True
+        self._task = asyncio.current_task()
+        extractor = CodeExtractor()
+        tokens = 0
+        completed = False
+        failure = None
+        # The terminal status is published last, once the container is stopped
+        # and the trace written, so a run that looks done has released everything
+        status = "failed"
+        metrics.solves_started.inc(entrypoint='app')
+        metrics.solves_running.inc(entrypoint='app')
+        with tracing.activate(self.trace):
+            try:
+                if self.cancellation_token.is_cancelled():
+                    # Cancelled before the loop got to it; still stop a prewarmed container
+                    raise asyncio.CancelledError
+                if not self.warm:
+                    with tracing.span('container.start'):
+                        await start_docker_container(docker)
+
+                task = self.problem
+                if self.resume:
+                    with tracing.span('checkpoint.restore'):
+                        task = await self.checkpoint.restore(team)
+                    self.solution_data = self.checkpoint.solution_data or self.solution_data
+                    if isinstance(task, list):
+                        # The transcript is replayed through the stream and recorded again
+                        self.solution_data['messages'] = []
+                    self.resumed_messages = len(self.solution_data['messages'])
+
+                self.status = "running"
+                last = time.time()
+                async for message in team.run_stream(task=task, cancellation_token=self.cancellation_token):
+                    self.message_count += 1
+                    usage = getattr(message, 'models_usage', None)
+                    metrics.record_usage(usage)
+                    if usage is not None:
+                        tokens += usage.prompt_tokens + usage.completion_tokens
+
+                    if isinstance(message, TextMessage):
+                        self._trace_message(message, last, usage)
+                        self._record(message)
+                        # Every fenced block is tracked; the solution is the last one that ran
+                        with tracing.span('code.extract'):
+                            extractor.add_message(message.source, message.content)
+                            self.solution_data['code'] = extractor.solution_code() or self.solution_data['code']
+                    elif isinstance(message, TaskResult):
+                        self.stop_reason = message.stop_reason
+                        entry = {
+                            'agent': 'System',
+                            'content': f"Task completed: {message.stop_reason}",
+                            'timestamp': datetime.now().isoformat()
+                        }
+                        self.transcript.append(entry)
+                        self.solution_data['messages'].append(entry)
+
+                    if self.checkpoint is not None:
+                        with tracing.span('checkpoint.update'):
+                            await self.checkpoint.update(team, message, self.solution_data)
+                    if isinstance(message, TextMessage):
+                        # Events in between belong to the turn that produces the next message
+                        last = time.time()
+
+                code = self.solution_data['code']
+                if PROFILE_AFTER_SOLVE and code and not self.cancellation_token.is_cancelled():
+                    # The container is still up, so the profile costs one more execution
+                    with tracing.span('solution.profile'):
+                        self.solution_data['profile'] = await profile_in_sandbox(code, executor=docker)
+
+                # Feeds the latency and token percentiles in Analytics
+                self.solution_data['metrics'] = {
+                    'duration_s': round(time.time() - self.started, 2),
+                    'turns': self.message_count,
+                    'tokens': tokens
+                }
+                completed = True
+                status = "cancelled" if self.cancellation_token.is_cancelled() else "completed"
+            except asyncio.CancelledError:
+                status = "cancelled"
+            except Exception as e:
+                status = "failed"
+                self.error = str(e)
+                failure = e
+            finally:
+                self._stopping = True
+                if not completed:
+                    self.cancellation_token.cancel()
+                try:
+                    with tracing.span('container.stop'):
+                        await stop_docker_container(docker)
+                except Exception:
+                    pass
+                self.finished = time.time()
+                metrics.solves_running.dec(entrypoint='app')
+                metrics.record_finished('app', status, self.elapsed, failure)
+                self.trace.set(status=status, turns=self.message_count, tokens=tokens)
+                self.trace.finish()
+                self.status = status
+
+
+def _prune_finished():
+    """Forget the oldest finished runs nobody collected (their session went away)"""
+    finished = [run_id for run_id, run in _runs.items() if run.done]
+    for run_id in finished[:max(0, len(finished) - FINISHED_RUNS_KEPT)]:
+        del _runs[run_id]
+
+
+def start_solve(problem, checkpoint=None, resume=False):
+    """
+    Start a solve on the background loop and return its SolveRun.
+    With a checkpoint, every message is checkpointed; with resume=True the
+    team is first restored from it.
+    """
+    from team.dsa_team import get_dsa_team_and_docker
+    from team.prewarm import stop_keepalive, take_warm_executor
+
+    run = SolveRun(problem, checkpoint=checkpoint, resume=resume)
+    # A container started by the prewarm phase, if one is waiting
+    warm_docker = take_warm_executor()
+    # The solve keeps the model connection busy from here on
+    stop_keepalive()
+    run.warm = warm_docker is not None
+    try:
+        with tracing.activate(run.trace), tracing.span('team.build', warm=run.warm):
+            team, docker = get_dsa_team_and_docker(executor=warm_docker)
+    except Exception:
+        # Nothing else will stop the prewarmed container or finish the trace
+        if warm_docker is not None:
+            submit(stop_docker_container(warm_docker))
+        run.trace.set(status="failed")
+        run.trace.finish()
+        raise
+    with _runs_lock:
+        _prune_finished()
+        _runs[run.run_id] = run
+    run.future = submit(run.run(team, docker))
+    run.future.add_done_callback(run._future_done)
+    return run
+
+
+def get_run(run_id):
+    with _runs_lock:
+        return _runs.get(run_id)
+
+
+def active_runs():
+    with _runs_lock:
+        return [run for run in _runs.values() if not run.done]
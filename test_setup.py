@@ -8,6 +8,49 @@ import os
 import subprocess
 import importlib
 
+# Modules the Browse/Edit/Analytics pages load before any solve starts
+BROWSE_MODULES = [
+    'file_browser', 'solution_editor', 'storage.solution_store', 'team.solve_runner',
+    'team.checkpoint', 'team.prewarm', 'agents.preflight', 'analysis.complexity'
+]
+# Entry scripts, imported on their own: none may load the agent stack before a solve
+ENTRY_SCRIPTS = ['main', 'app', 'app_dashboard', 'app_enhanced']
+# The agent stack, which must only be imported on the first solve
+HEAVY_MODULES = ['autogen_agentchat', 'autogen_ext', 'autogen_core', 'docker', 'openai']
+IMPORT_TIME_BUDGET = 0.5  # Seconds for BROWSE_MODULES on top of streamlit itself
+# (description, code, unwrapped code or None when it must stay unchanged) of the code extractor
+EXTRACTOR_CASES = [
+    ("saved solution",
+     "code = \'\'\'\ndef add(a, b):\n    return a + b\n\'\'\'\nwith open('solution.py', 'w') as f:\n    f.write(code)\n",
+     "def add(a, b):\n    return a + b"),
+    ("solution reading its input file",
+     "FILENAME = 'input.txt'\nwith open(FILENAME) as f:\n    print(sum(map(int, f.read().split())))\n", None),
+    ("solution writing other data to a file",
+     "SEP = ', '\nwith open('out.txt', 'w') as f:\n    f.write(SEP.join(['a', 'b']))\n", None),
+]
+# (description, code, whether the pre-flight check rejects it) for undefined names
+PREFLIGHT_CASES = [
+    ("top-level read of an undefined name", "print(undefined_name)\n", True),
+    ("undefined name in a branch that may not run", "import sys\nif len(sys.argv) > 5:\n    print(missing)\n", False),
+    ("name bound through exec", "exec('x = 1')\nprint(x)\n", False),
+]
+# (description, code, expected estimate) of the static complexity profiler
+COMPLEXITY_CASES = [
+    ("nested loops", "def f(a):\n    return [x * y for x in a for y in a]\n", "O(n^2)"),
+    ("binary search",
+     "def f(a, t):\n    lo, hi = 0, len(a)\n    while lo < hi:\n        mid = (lo + hi) // 2\n"
+     "        if a[mid] < t:\n            lo = mid + 1\n        else:\n            hi = mid\n    return lo\n",
+     "O(log n)"),
+    ("recursion inside a comprehension's second loop",
+     "def p(a):\n    if len(a) <= 1:\n        return [a]\n"
+     "    return [[a[i]] + r for i in range(len(a)) for r in p(a[:i] + a[i + 1:])]\n",
+     "O(2^n)"),
+    ("quicksort on filtered copies (worst case, not exponential)",
+     "def qs(a):\n    if len(a) <= 1:\n        return a\n    p = a[0]\n"
+     "    return qs([x for x in a[1:] if x < p]) + [p] + qs([x for x in a[1:] if x >= p])\n",
+     "O(n^2)"),
+]
+
 def test_imports():
     """Test if all required modules can be imported"""
     print("🔍 Testing imports...")
@@ -118,6 +161,105 @@ def test_config_imports():
     
     return True
 
+def _measure_imports(modules):
+    """Import `modules` in a fresh interpreter; returns the time taken and the heavy modules loaded"""
+    # A fresh interpreter, so nothing is cached from the checks above
+    script = (
+        "import sys, time, json\n"
+        "import streamlit\n"
+        "started = time.perf_counter()\n"
+        f"for name in {modules!r}: __import__(name)\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else result.returncode
+        raise ImportError(f"{', '.join(modules)}: {error}")
+    
+    import json
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_import_budget():
+    """Test that the browse path and the entry scripts start without the agent stack"""
+    print("\n🔍 Testing cold-start import time...")
+    
+    passed = True
+    try:
+        measured = _measure_imports(BROWSE_MODULES)
+    except ImportError as e:
+        print(f"  ❌ Import failed: {e}")
+        return False
+    if measured['heavy']:
+        print(f"  ❌ Loaded before the first solve: {', '.join(measured['heavy'])}")
+        passed = False
+    if measured['elapsed'] > IMPORT_TIME_BUDGET:
+        print(f"  ❌ {measured['elapsed']:.2f}s to import the browse path (budget {IMPORT_TIME_BUDGET}s)")
+        passed = False
+    if passed:
+        print(f"  ✅ Browse path imports in {measured['elapsed']:.2f}s without the agent stack")
+    
+    # Streamlit scripts run in bare mode here: the page renders, no button is clicked
+    for script in ENTRY_SCRIPTS:
+        try:
+            measured = _measure_imports([script])
+        except ImportError as e:
+            print(f"  ❌ Import failed: {e}")
+            passed = False
+            continue
+        if measured['heavy']:
+            print(f"  ❌ {script}.py loads {', '.join(measured['heavy'])} before a solve")
+            passed = False
+        else:
+            print(f"  ✅ {script}.py starts without the agent stack ({measured['elapsed']:.2f}s)")
+    return passed
+
+def test_code_extractor():
+    """Test that only a block saving its code to a file is unwrapped"""
+    print("\n🔍 Testing code extractor...")
+    
+    from team.code_extractor import unwrap_saved_code
+    passed = True
+    for description, code, expected in EXTRACTOR_CASES:
+        unwrapped = unwrap_saved_code(code)
+        if unwrapped == (code if expected is None else expected):
+            print(f"  ✅ {description}")
+        else:
+            print(f"  ❌ {description}: got {unwrapped!r}")
+            passed = False
+    return passed
+
+def test_preflight():
+    """Test that only names certain to be unbound are rejected before the sandbox"""
+    print("\n🔍 Testing pre-flight check...")
+    
+    from agents.preflight import check_code
+    passed = True
+    for description, code, rejected in PREFLIGHT_CASES:
+        result = check_code(code)
+        if result.ok != rejected:
+            print(f"  ✅ {description}")
+        else:
+            print(f"  ❌ {description}: errors {result.errors}, warnings {result.warnings}")
+            passed = False
+    return passed
+
+def test_complexity_profiler():
+    """Test the static complexity estimates on known solutions"""
+    print("\n🔍 Testing complexity profiler...")
+    
+    from analysis.complexity import analyze_code
+    passed = True
+    for description, code, expected in COMPLEXITY_CASES:
+        estimate = analyze_code(code).estimate
+        if estimate == expected:
+            print(f"  ✅ {description}: {estimate}")
+        else:
+            print(f"  ❌ {description}: {estimate}, expected {expected}")
+            passed = False
+    return passed
+
 def main():
     print("🧪 AlgoGenie Setup Test")
     print("=" * 40)
@@ -126,6 +268,10 @@ def main():
         ("Project Structure", test_project_structure),
         ("Python Imports", test_imports),
         ("Project Module Imports", test_config_imports),
+        ("Import Budget", test_import_budget),
+        ("Code Extractor", test_code_extractor),
+        ("Pre-flight Check", test_preflight),
+        ("Complexity Profiler", test_complexity_profiler),
         ("Environment File", test_env_file),
         ("Docker", test_docker)
     ]